@@ -1,4 +1,4 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, Collection
 from blueman.bluemantyping import ObjectPath
 
 from gi.repository import GLib
@@ -34,5 +34,5 @@ class Adapter(Base):
 
 
 class AnyAdapter(AnyBase):
-    def __init__(self) -> None:
-        super().__init__('org.bluez.Adapter1')
+    def __init__(self, properties: Optional[Collection[str]] = None) -> None:
+        super().__init__('org.bluez.Adapter1', properties)
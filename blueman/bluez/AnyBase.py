@@ -1,9 +1,86 @@
+import itertools
 import weakref
+from typing import Callable, Dict, Optional, Collection, Any, Tuple, List
 
 from gi.repository import GObject, GLib
 from gi.repository import Gio
 
-from blueman.bluemantyping import GSignals
+from blueman.bluemantyping import GSignals, ObjectPath
+
+PropertyListener = Callable[[str, Any, ObjectPath], None]
+
+
+class PropertiesChangedDispatcher:
+    """Single PropertiesChanged subscription per interface, fanned out to listeners by property name"""
+
+    def __init__(self) -> None:
+        self._bus = Gio.bus_get_sync(Gio.BusType.SYSTEM)
+        self._ids = itertools.count(1)
+        self._subscriptions: Dict[str, int] = {}
+        # interface name -> property name (None for any property) -> listener id -> listener
+        self._listeners: Dict[str, Dict[Optional[str], Dict[int, PropertyListener]]] = {}
+        self._registrations: Dict[int, Tuple[str, List[Optional[str]]]] = {}
+
+    def add_listener(self, interface_name: str, listener: PropertyListener,
+                     properties: Optional[Collection[str]] = None) -> int:
+        if interface_name not in self._subscriptions:
+            def on_signal(_connection: Gio.DBusConnection, _sender_name: str, object_path: str,
+                          _interface_name: str, _signal_name: str, param: GLib.Variant) -> None:
+                self._on_signal(object_path, param, interface_name)
+
+            # Let the bus filter on the interface name (arg0) so we only wake up for signals we want
+            self._subscriptions[interface_name] = self._bus.signal_subscribe(
+                "org.bluez",
+                "org.freedesktop.DBus.Properties",
+                "PropertiesChanged",
+                None,
+                interface_name,
+                Gio.DBusSignalFlags.NONE,
+                on_signal
+            )
+
+        listener_id = next(self._ids)
+        keys: List[Optional[str]] = [None] if properties is None else list(properties)
+        by_key = self._listeners.setdefault(interface_name, {})
+        for key in keys:
+            by_key.setdefault(key, {})[listener_id] = listener
+        self._registrations[listener_id] = (interface_name, keys)
+        return listener_id
+
+    def remove_listener(self, listener_id: int) -> None:
+        interface_name, keys = self._registrations.pop(listener_id)
+        by_key = self._listeners[interface_name]
+        for key in keys:
+            del by_key[key][listener_id]
+            if not by_key[key]:
+                del by_key[key]
+
+        if not by_key:
+            del self._listeners[interface_name]
+            self._bus.signal_unsubscribe(self._subscriptions.pop(interface_name))
+
+    def _on_signal(self, object_path: str, param: GLib.Variant, interface_name: str) -> None:
+        by_key = self._listeners.get(interface_name)
+        if not by_key:
+            return
+
+        changed = param.get_child_value(1)
+        invalidated: List[str] = param.get_child_value(2).unpack()
+        any_listeners = list(by_key.get(None, {}).values())
+
+        for i in range(changed.n_children()):
+            entry = changed.get_child_value(i)
+            key: str = entry.get_child_value(0).unpack()
+            listeners = any_listeners + list(by_key.get(key, {}).values())
+            if listeners:
+                # Only unpack values somebody is interested in
+                value = entry.get_child_value(1).unpack()
+                for listener in listeners:
+                    listener(key, value, ObjectPath(object_path))
+
+        for key in invalidated:
+            for listener in any_listeners + list(by_key.get(key, {}).values()):
+                listener(key, None, ObjectPath(object_path))
 
 
 class AnyBase(GObject.GObject):
@@ -14,36 +91,22 @@ class AnyBase(GObject.GObject):
     connect_signal = GObject.GObject.connect
     disconnect_signal = GObject.GObject.disconnect
 
-    def __init__(self, interface_name: str):
+    __dispatcher: Optional[PropertiesChangedDispatcher] = None
+
+    def __init__(self, interface_name: str, properties: Optional[Collection[str]] = None):
         super().__init__()
 
-        bus = Gio.bus_get_sync(Gio.BusType.SYSTEM)
+        if AnyBase.__dispatcher is None:
+            AnyBase.__dispatcher = PropertiesChangedDispatcher()
+        dispatcher = AnyBase.__dispatcher
 
         this = weakref.proxy(self)
 
-        def on_signal(
-            _connection: Gio.DBusConnection,
-            _sender_name: str,
-            object_path: str,
-            _interface_name: str,
-            _signal_name: str,
-            param: GLib.Variant,
-        ) -> None:
-            iface_name, changed, invalidated = param.unpack()
-            if iface_name == interface_name and this is not None:
-                for key in list(changed) + invalidated:
-                    this.emit('property-changed', key, changed.get(key, None), object_path)
+        def on_property_changed(key: str, value: Any, object_path: ObjectPath) -> None:
+            this.emit('property-changed', key, value, object_path)
 
         weakref.finalize(
             self,
-            bus.signal_unsubscribe,
-            bus.signal_subscribe(
-                "org.bluez",
-                "org.freedesktop.DBus.Properties",
-                "PropertiesChanged",
-                None,
-                None,
-                Gio.DBusSignalFlags.NONE,
-                on_signal
-            )
+            dispatcher.remove_listener,
+            dispatcher.add_listener(interface_name, on_property_changed, properties)
         )
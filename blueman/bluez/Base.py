@@ -1,26 +1,45 @@
-from typing import List, Callable, Optional, Any, Union, Dict
+import weakref
+from collections import Counter
+from typing import List, Callable, Optional, Any, Union, Dict, Mapping, Tuple
 from blueman.bluemantyping import GSignals, ObjectPath
 
 from gi.repository import Gio, GLib, GObject
 from gi.types import GObjectMeta
+from blueman.bluez import stats
 from blueman.bluez.errors import parse_dbus_error, BluezDBusException
 import logging
 
 
+def _reply_idle(reply_handler: Callable[..., None], *args: Any) -> None:
+    # Results that are already known get delivered from the main loop as well, like real replies
+    def reply() -> bool:
+        reply_handler(*args)
+        return False
+
+    GLib.idle_add(reply)
+
+
 class BaseMeta(GObjectMeta):
     def __call__(cls, *args: object, **kwargs: str) -> "Base":
         if not hasattr(cls, "__instances__"):
-            cls.__instances__: Dict[str, "Base"] = {}
+            # Proxies stay registered only as long as somebody uses them
+            cls.__instances__: "weakref.WeakValueDictionary[str, Base]" = weakref.WeakValueDictionary()
+            cls.__instance_counters__: "Counter[str]" = Counter()
 
         path = kwargs.get('obj_path')
         if path is None:
             path = getattr(cls, "_obj_path")
 
-        if path in cls.__instances__:
-            return cls.__instances__[path]
+        counters = cls.__instance_counters__
+        existing = cls.__instances__.get(path)
+        if existing is not None:
+            counters["reused"] += 1
+            return existing
 
         instance: "Base" = super().__call__(*args, **kwargs)
         cls.__instances__[path] = instance
+        counters["created"] += 1
+        weakref.finalize(instance, counters.update, ("collected",))
 
         return instance
 
@@ -33,7 +52,11 @@ class Base(GObject.Object, metaclass=BaseMeta):
     __gsignals__: GSignals = {
         'property-changed': (GObject.SignalFlags.NO_HOOKS, None, (str, object, str))
     }
-    __instances__: Dict[str, "Base"]
+    __instances__: "weakref.WeakValueDictionary[str, Base]"
+    __instance_counters__: "Counter[str]"
+    # Proxies created by create_async and properties passed to from_properties, picked up by __init__
+    __prepared_proxies: Dict[Tuple[str, str], Gio.DBusProxy] = {}
+    __prepared_properties: Dict[Tuple[str, str], Mapping[str, Any]] = {}
 
     _interface_name: str
 
@@ -43,22 +66,155 @@ class Base(GObject.Object, metaclass=BaseMeta):
     def __init__(self, *, obj_path: ObjectPath):
         super().__init__()
 
-        self.__proxy = Gio.DBusProxy.new_for_bus_sync(
-            self.__bus_type,
-            Gio.DBusProxyFlags.NONE,
-            None,
-            self.__name,
-            obj_path,
-            self._interface_name,
-            None
-        )
+        proxy = self.__prepared_proxies.pop((self._interface_name, obj_path), None)
+        properties = self.__prepared_properties.pop((self._interface_name, obj_path), None)
+        # Without loading properties Gio does not watch PropertiesChanged either, whoever passed the properties has to
+        # pass changes on through forward_properties_changed
+        self.__seeded = proxy is None and properties is not None
+        if proxy is None:
+            started = stats.start()
+            proxy = Gio.DBusProxy.new_for_bus_sync(
+                self.__bus_type,
+                Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES if self.__seeded else Gio.DBusProxyFlags.NONE,
+                None,
+                self.__name,
+                obj_path,
+                self._interface_name,
+                None
+            )
+            if properties is None:
+                # Construction fetches all properties
+                stats.record_call(self._interface_name, "GetAll", started, blocking=True)
+        self.__proxy = proxy
+
+        # Property values as last seen on the bus, kept up to date by PropertiesChanged. The proxy already fetched
+        # all properties on construction, so use those to seed the cache.
+        self.__cache: Dict[str, Any] = {}
+        self.__cache_complete = False
+        names = self.__proxy.get_cached_property_names() or []
+        cached = {name: self.__proxy.get_cached_property(name) for name in names}
+        if cached:
+            self.update_cache({name: value.unpack() for name, value in cached.items() if value is not None},
+                              complete=True)
+        if properties is not None:
+            self.update_cache(properties, complete=True)
 
-        self.__proxy.connect("g-properties-changed", self._properties_changed)
+        # Do not let the proxy keep us alive, the instance registry relies on it
+        handler = weakref.WeakMethod(self.__on_properties_changed)
+
+        def on_properties_changed(proxy: Gio.DBusProxy, changed_properties: GLib.Variant,
+                                  invalidated_properties: List[str]) -> None:
+            method = handler()
+            if method is not None:
+                method(proxy, changed_properties, invalidated_properties)
+
+        self.__proxy.connect("g-properties-changed", on_properties_changed)
 
         self.__fallback = {'Icon': 'blueman', 'Class': 0, 'Appearance': 0}
 
         self.__variant_map = {str: 's', int: 'u', bool: 'b'}
 
+    def __on_properties_changed(self, proxy: Gio.DBusProxy, changed_properties: GLib.Variant,
+                                invalidated_properties: List[str]) -> None:
+        self.__update_cache(changed_properties.unpack(), invalidated_properties)
+        self._properties_changed(proxy, changed_properties, invalidated_properties)
+
+    def __update_cache(self, changed: Mapping[str, Any], invalidated: List[str]) -> None:
+        self.__cache.update(changed)
+        if invalidated:
+            self.__cache_complete = False
+            for name in invalidated:
+                self.__cache.pop(name, None)
+
+    @classmethod
+    def create_async(
+        cls,
+        obj_path: ObjectPath,
+        reply_handler: Callable[["Base"], None],
+        error_handler: Optional[Callable[[BluezDBusException], None]] = None,
+        cancellable: Optional[Gio.Cancellable] = None,
+    ) -> None:
+        existing = getattr(cls, "__instances__", {}).get(obj_path)
+        if existing is not None:
+            _reply_idle(reply_handler, existing)
+            return
+
+        def callback(_source: Optional[GObject.Object], result: Gio.AsyncResult, _user_data: object) -> None:
+            try:
+                proxy = Gio.DBusProxy.new_for_bus_finish(result)
+            except GLib.Error as e:
+                if error_handler:
+                    error_handler(parse_dbus_error(e))
+                else:
+                    logging.error(f"Failed to create proxy for {cls._interface_name} {obj_path}", exc_info=True)
+                return
+
+            cls.__prepared_proxies[(cls._interface_name, obj_path)] = proxy
+            try:
+                instance = cls(obj_path=obj_path)
+            finally:
+                cls.__prepared_proxies.pop((cls._interface_name, obj_path), None)
+            reply_handler(instance)
+
+        Gio.DBusProxy.new_for_bus(cls.__bus_type, Gio.DBusProxyFlags.NONE, None, cls.__name, obj_path,
+                                  cls._interface_name, cancellable, callback, None)
+
+    @classmethod
+    def from_properties(cls, obj_path: ObjectPath, properties: Mapping[str, Any]) -> "Base":
+        """Get the proxy for an object whose properties are known already, e.g. from the object manager
+
+        The properties are not fetched from the bus again, an existing proxy is returned as is. Changes have to be
+        passed on with forward_properties_changed.
+        """
+        cls.__prepared_properties[(cls._interface_name, obj_path)] = properties
+        try:
+            return cls(obj_path=obj_path)
+        finally:
+            cls.__prepared_properties.pop((cls._interface_name, obj_path), None)
+
+    @classmethod
+    def forward_properties_changed(cls, obj_path: str, changed: Mapping[str, Any], invalidated: List[str]) -> None:
+        """Keep a proxy created by from_properties current with a PropertiesChanged seen elsewhere"""
+        instance = getattr(cls, "__instances__", {}).get(obj_path)
+        if instance is None or not instance.__seeded:
+            return
+
+        instance.__update_cache(changed, invalidated)
+        for key in list(changed) + invalidated:
+            instance.emit("property-changed", key, changed.get(key, None), obj_path)
+
+    @classmethod
+    def evict(cls, obj_path: str) -> None:
+        """Forget the proxy for an object that is gone from the bus"""
+        instance = getattr(cls, "__instances__", {}).pop(obj_path, None)
+        if instance is not None:
+            instance.invalidate_cache()
+            cls.__instance_counters__["evicted"] += 1
+
+    @classmethod
+    def instance_counters(cls) -> Dict[str, int]:
+        counters = {"created": 0, "reused": 0, "evicted": 0, "collected": 0}
+        if hasattr(cls, "__instances__"):
+            counters.update(cls.__instance_counters__)
+            counters["live"] = len(cls.__instances__)
+        else:
+            counters["live"] = 0
+        return counters
+
+    def update_cache(self, properties: Mapping[str, Any], complete: bool = False) -> None:
+        """Seed the cache, complete=True means properties holds every property of the interface"""
+        self.__cache.update(properties)
+        if complete:
+            self.__cache_complete = True
+
+    def invalidate_cache(self, name: Optional[str] = None) -> None:
+        """Drop one or all cached properties so the next read goes to the bus"""
+        self.__cache_complete = False
+        if name is None:
+            self.__cache.clear()
+        else:
+            self.__cache.pop(name, None)
+
     def _properties_changed(self, _proxy: Gio.DBusProxy, changed_properties: GLib.Variant,
                             invalidated_properties: List[str]) -> None:
         changed = changed_properties.unpack()
@@ -74,6 +230,8 @@ class Base(GObject.Object, metaclass=BaseMeta):
         param: Optional[GLib.Variant] = None,
         reply_handler: Optional[Callable[..., None]] = None,
         error_handler: Optional[Callable[[BluezDBusException], None]] = None,
+        cancellable: Optional[Gio.Cancellable] = None,
+        timeout: int = GLib.MAXINT,
     ) -> None:
         def callback(
             proxy: Gio.DBusProxy,
@@ -83,18 +241,94 @@ class Base(GObject.Object, metaclass=BaseMeta):
         ) -> None:
             try:
                 value = proxy.call_finish(result).unpack()
+                stats.record_call(self._interface_name, member, started)
                 if reply:
                     reply(*value)
             except GLib.Error as e:
+                stats.record_call(self._interface_name, member, started, error=True)
                 if error:
                     error(parse_dbus_error(e))
                 else:
                     logging.error(f"Unhandled error for {self.__proxy.get_interface_name()}.{method}", exc_info=True)
 
-        self.__proxy.call(method, param, Gio.DBusCallFlags.NONE, GLib.MAXINT, None,
+        member = stats.member_name(method, param) if stats.enabled() else method
+        started = stats.start()
+        self.__proxy.call(method, param, Gio.DBusCallFlags.NONE, timeout, cancellable,
                           callback, reply_handler, error_handler)
 
-    def get(self, name: str) -> Any:
+    def get_async(
+        self,
+        name: str,
+        reply_handler: Callable[[Any], None],
+        error_handler: Optional[Callable[[BluezDBusException], None]] = None,
+        cancellable: Optional[Gio.Cancellable] = None,
+        timeout: int = GLib.MAXINT,
+        cached: bool = True,
+    ) -> None:
+        if cached and name in self.__cache:
+            _reply_idle(reply_handler, self.__cache[name])
+            return
+
+        def on_reply(value: Any) -> None:
+            self.__cache[name] = value
+            reply_handler(value)
+
+        def on_error(error: BluezDBusException) -> None:
+            if name in self.__fallback:
+                reply_handler(self.__fallback[name])
+            elif error_handler:
+                error_handler(error)
+            else:
+                logging.error(f"Failed to get {self._interface_name}.{name}: {error}")
+
+        param = GLib.Variant('(ss)', (self._interface_name, name))
+        self._call('org.freedesktop.DBus.Properties.Get', param, on_reply, on_error, cancellable, timeout)
+
+    def set_async(
+        self,
+        name: str,
+        value: Union[str, int, bool],
+        reply_handler: Optional[Callable[[], None]] = None,
+        error_handler: Optional[Callable[[BluezDBusException], None]] = None,
+        cancellable: Optional[Gio.Cancellable] = None,
+        timeout: int = GLib.MAXINT,
+    ) -> None:
+        v = GLib.Variant(self.__variant_map[type(value)], value)
+        param = GLib.Variant('(ssv)', (self._interface_name, name, v))
+        self._call('org.freedesktop.DBus.Properties.Set', param, reply_handler, error_handler, cancellable, timeout)
+
+    def get_properties_async(
+        self,
+        reply_handler: Callable[[Dict[str, Any]], None],
+        error_handler: Optional[Callable[[BluezDBusException], None]] = None,
+        cancellable: Optional[Gio.Cancellable] = None,
+        timeout: int = GLib.MAXINT,
+        cached: bool = True,
+    ) -> None:
+        if cached and self.__cache_complete:
+            _reply_idle(reply_handler, self.__with_fallback(self.__cache))
+            return
+
+        def on_reply(props: Dict[str, Any]) -> None:
+            self.__cache = dict(props)
+            self.__cache_complete = True
+            reply_handler(self.__with_fallback(props))
+
+        param = GLib.Variant('(s)', (self._interface_name,))
+        self._call('org.freedesktop.DBus.Properties.GetAll', param, on_reply, error_handler, cancellable, timeout)
+
+    def __with_fallback(self, properties: Mapping[str, Any]) -> Dict[str, Any]:
+        props = dict(properties)
+        for k, v in self.__fallback.items():
+            if k not in props:
+                props[k] = v
+        return props
+
+    def get(self, name: str, cached: bool = True) -> Any:
+        if cached and name in self.__cache:
+            return self.__cache[name]
+
+        started = stats.start()
         try:
             prop = self.__proxy.call_sync(
                 'org.freedesktop.DBus.Properties.Get',
@@ -102,8 +336,12 @@ class Base(GObject.Object, metaclass=BaseMeta):
                 Gio.DBusCallFlags.NONE,
                 GLib.MAXINT,
                 None)
-            return prop.unpack()[0]
+            stats.record_call(self._interface_name, f"Get:{name}", started, blocking=True)
+            value = prop.unpack()[0]
+            self.__cache[name] = value
+            return value
         except GLib.Error as e:
+            stats.record_call(self._interface_name, f"Get:{name}", started, blocking=True, error=True)
             property = self.__proxy.get_cached_property(name)
             if property is not None:
                 return property.unpack()
@@ -113,35 +351,29 @@ class Base(GObject.Object, metaclass=BaseMeta):
                 raise parse_dbus_error(e)
 
     def set(self, name: str, value: Union[str, int, bool]) -> None:
-        v = GLib.Variant(self.__variant_map[type(value)], value)
-        param = GLib.Variant('(ssv)', (self._interface_name, name, v))
-        self.__proxy.call('org.freedesktop.DBus.Properties.Set',
-                          param,
-                          Gio.DBusCallFlags.NONE,
-                          GLib.MAXINT,
-                          None)
+        self.set_async(name, value)
 
     def get_object_path(self) -> ObjectPath:
         return ObjectPath(self.__proxy.get_object_path())
 
-    def get_properties(self) -> Dict[str, Any]:
-        param = GLib.Variant('(s)', (self._interface_name,))
-        res = self.__proxy.call_sync('org.freedesktop.DBus.Properties.GetAll',
-                                     param,
-                                     Gio.DBusCallFlags.NONE,
-                                     GLib.MAXINT,
-                                     None)
+    def get_properties(self, cached: bool = True) -> Dict[str, Any]:
+        if not cached or not self.__cache_complete:
+            param = GLib.Variant('(s)', (self._interface_name,))
+            started = stats.start()
+            res = self.__proxy.call_sync('org.freedesktop.DBus.Properties.GetAll',
+                                         param,
+                                         Gio.DBusCallFlags.NONE,
+                                         GLib.MAXINT,
+                                         None)
+            stats.record_call(self._interface_name, "GetAll", started, blocking=True)
 
-        props: Dict[str, Any] = res.unpack()[0]
-        for k, v in self.__fallback.items():
-            if k in props:
-                continue
-            else:
-                props[k] = v
+            self.__cache = dict(res.unpack()[0])
+            self.__cache_complete = True
 
-        return props
+        return self.__with_fallback(self.__cache)
 
     def destroy(self) -> None:
+        self.invalidate_cache()
         if self.__proxy:
             del self.__proxy
 
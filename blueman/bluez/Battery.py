@@ -1,3 +1,5 @@
+from typing import Optional, Collection
+
 from blueman.bluez.AnyBase import AnyBase
 
 from blueman.bluez.Base import Base
@@ -10,5 +12,5 @@ class Battery(Base):
 
 
 class AnyBattery(AnyBase):
-    def __init__(self) -> None:
-        super().__init__(_INTERFACE)
+    def __init__(self, properties: Optional[Collection[str]] = None) -> None:
+        super().__init__(_INTERFACE, properties)
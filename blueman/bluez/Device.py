@@ -1,4 +1,4 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, Collection
 from blueman.bluemantyping import ObjectPath
 
 from blueman.bluez.Base import Base
@@ -40,5 +40,5 @@ class Device(Base):
 
 
 class AnyDevice(AnyBase):
-    def __init__(self) -> None:
-        super().__init__('org.bluez.Device1')
+    def __init__(self, properties: Optional[Collection[str]] = None) -> None:
+        super().__init__('org.bluez.Device1', properties)
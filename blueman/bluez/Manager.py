@@ -1,14 +1,23 @@
 import logging
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Dict, Type, Any, Tuple, Set, TypeVar, cast
 
 from gi.repository import GObject, Gio
 
 from blueman.bluez.Adapter import Adapter
+from blueman.bluez.Base import Base
+from blueman.bluez.Battery import Battery
 from blueman.bluez.Device import Device
+from blueman.bluez.Network import Network
+from blueman.bluez.ObjectManager import ObjectManager, Interfaces
 from blueman.bluez.errors import DBusNoSuchAdapterError
 from blueman.gobject import SingletonGObjectMeta
 from blueman.bluemantyping import GSignals, BtAddress, ObjectPath
-from blueman.gui.gui_config import get_allowed_device
+from blueman.gui.gui_config import is_allowed_device
+
+
+_PROXY_CLASSES: Dict[str, Type[Base]] = {cls._interface_name: cls for cls in (Adapter, Device, Battery, Network)}
+
+_T = TypeVar("_T", bound=Base)
 
 
 class Manager(GObject.GObject, metaclass=SingletonGObjectMeta):
@@ -19,6 +28,8 @@ class Manager(GObject.GObject, metaclass=SingletonGObjectMeta):
         'device-removed': (GObject.SignalFlags.NO_HOOKS, None, (str,)),
         'battery-created': (GObject.SignalFlags.NO_HOOKS, None, (str,)),
         'battery-removed': (GObject.SignalFlags.NO_HOOKS, None, (str,)),
+        # all objects BlueZ had when the manager was created are announced
+        'ready': (GObject.SignalFlags.NO_HOOKS, None, ()),
     }
 
     connect_signal = GObject.GObject.connect
@@ -26,134 +37,210 @@ class Manager(GObject.GObject, metaclass=SingletonGObjectMeta):
 
     __bus_name = 'org.bluez'
 
-    def __init__(self) -> None:
+    def __init__(self, blocking: bool = True) -> None:
         super().__init__()
-        self._object_manager = Gio.DBusObjectManagerClient.new_for_bus_sync(
-            Gio.BusType.SYSTEM, Gio.DBusObjectManagerClientFlags.DO_NOT_AUTO_START,
-            self.__bus_name, '/', None, None, None)
-
-        self._object_manager.connect("object-added", self._on_object_added)
-        self._object_manager.connect("object-removed", self._on_object_removed)
-        self._object_manager.connect("interface-added", self._on_interface_added)
-        self._object_manager.connect("interface-removed", self._on_interface_removed)
-
-    def _on_object_added(self, _object_manager: Gio.DBusObjectManager, dbus_object: Gio.DBusObject) -> None:
-        device_proxy = dbus_object.get_interface('org.bluez.Device1')
-        adapter_proxy = dbus_object.get_interface('org.bluez.Adapter1')
-        battery_proxy = dbus_object.get_interface('org.bluez.Battery1')
-
-        if adapter_proxy:
-            assert isinstance(adapter_proxy, Gio.DBusProxy)
-            object_path = adapter_proxy.get_object_path()
+        # Only the interfaces we have proxy classes for, everything else (GATT and media objects) is never
+        # materialized
+        self._object_manager = ObjectManager(Gio.BusType.SYSTEM, self.__bus_name, _PROXY_CLASSES, load=blocking)
+        self._ready = blocking
+
+        # Lookup tables built from the properties the object manager already holds, so lookups need no bus traffic
+        self._adapters: Dict[ObjectPath, Optional[BtAddress]] = {}
+        self._devices: Dict[ObjectPath, Tuple[Optional[BtAddress], Optional[ObjectPath]]] = {}
+        # Dicts with None values act as insertion ordered sets
+        self._devices_by_address: Dict[Optional[BtAddress], Dict[ObjectPath, None]] = {}
+        self._devices_by_adapter: Dict[Optional[ObjectPath], Dict[ObjectPath, None]] = {}
+        # Devices announced with device-created, the filter is applied to the properties the object manager holds
+        self._allowed_devices: Set[ObjectPath] = set()
+        for object_path, interfaces in self._object_manager.get_objects().items():
+            self._index_object(object_path, interfaces)
+
+        self._object_manager.connect_signal("object-added", self._on_object_added)
+        self._object_manager.connect_signal("object-removed", self._on_object_removed)
+        self._object_manager.connect_signal("interface-added", self._on_interface_added)
+        self._object_manager.connect_signal("interface-removed", self._on_interface_removed)
+        self._object_manager.connect_signal("properties-changed", self._on_properties_changed)
+
+        if not blocking:
+            self._object_manager.load_async(self._on_ready)
+
+    @classmethod
+    def create_async(cls) -> "Manager":
+        """Get the manager without waiting for BlueZ
+
+        Objects are announced with the usual signals in chunks from idle callbacks, ready is emitted once they all
+        are. A manager that already exists is returned as is, check is_ready.
+        """
+        manager: Manager = cls(blocking=False)
+        return manager
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def _on_ready(self) -> None:
+        self._ready = True
+        logging.debug(f"{len(self._adapters)} adapters and {len(self._devices)} devices announced")
+        self.emit("ready")
+
+    def _index_object(self, object_path: ObjectPath, interfaces: Interfaces) -> None:
+        self._unindex_object(object_path)
+
+        adapter_properties = interfaces.get('org.bluez.Adapter1')
+        if adapter_properties is not None:
+            self._adapters[object_path] = adapter_properties.get("Address")
+
+        device_properties = interfaces.get('org.bluez.Device1')
+        if device_properties is not None:
+            address = device_properties.get("Address")
+            adapter_path = device_properties.get("Adapter")
+            self._devices[object_path] = (address, adapter_path)
+            self._devices_by_address.setdefault(address, {})[object_path] = None
+            self._devices_by_adapter.setdefault(adapter_path, {})[object_path] = None
+
+    def _unindex_object(self, object_path: ObjectPath) -> None:
+        self._adapters.pop(object_path, None)
+
+        if object_path in self._devices:
+            address, adapter_path = self._devices.pop(object_path)
+
+            by_address = self._devices_by_address[address]
+            del by_address[object_path]
+            if not by_address:
+                del self._devices_by_address[address]
+
+            by_adapter = self._devices_by_adapter[adapter_path]
+            del by_adapter[object_path]
+            if not by_adapter:
+                del self._devices_by_adapter[adapter_path]
+
+    def _on_properties_changed(self, _object_manager: ObjectManager, object_path: ObjectPath, interface_name: str,
+                               changed: Dict[str, Any], invalidated: List[str]) -> None:
+        _PROXY_CLASSES[interface_name].forward_properties_changed(object_path, changed, invalidated)
+
+        if interface_name not in ('org.bluez.Adapter1', 'org.bluez.Device1'):
+            return
+
+        keys = changed.keys() | set(invalidated)
+        interfaces = self._object_manager.get_objects()[object_path]
+        if {"Address", "Adapter"} & keys:
+            self._index_object(object_path, interfaces)
+
+        # Appearance usually shows up with service discovery, after the device got added
+        if interface_name == 'org.bluez.Device1' and {"Class", "Appearance"} & keys:
+            allowed = is_allowed_device(interfaces['org.bluez.Device1'])
+            if allowed and object_path not in self._allowed_devices:
+                self._allowed_devices.add(object_path)
+                logging.debug(f"Device1 allowed: {object_path}")
+                self.emit('device-created', object_path)
+            elif not allowed and object_path in self._allowed_devices:
+                self._allowed_devices.remove(object_path)
+                logging.debug(f"Device1 no longer allowed: {object_path}")
+                self.emit('device-removed', object_path)
+
+    def _on_object_added(self, _object_manager: ObjectManager, object_path: ObjectPath,
+                         interfaces: Interfaces) -> None:
+        self._index_object(object_path, interfaces)
+
+        if 'org.bluez.Adapter1' in interfaces:
             logging.debug(f"Adapter1: {object_path}")
             self.emit('adapter-added', object_path)
-        if device_proxy:
-            assert isinstance(device_proxy, Gio.DBusProxy)
-            object_path = device_proxy.get_object_path()
-
-            if not get_allowed_device(object_path):
+        if 'org.bluez.Device1' in interfaces:
+            if not is_allowed_device(interfaces['org.bluez.Device1']):
                 return
 
+            self._allowed_devices.add(object_path)
             logging.debug(f"Device1: {object_path}")
             self.emit('device-created', object_path)
-        if battery_proxy:
-            assert isinstance(device_proxy, Gio.DBusProxy)
-            object_path = device_proxy.get_object_path()
+        if 'org.bluez.Battery1' in interfaces:
             logging.debug(f"Battery1: {object_path}")
             self.emit('battery-created', object_path)
 
-    def _on_object_removed(self, _object_manager: Gio.DBusObjectManager, dbus_object: Gio.DBusObject) -> None:
-        device_proxy = dbus_object.get_interface('org.bluez.Device1')
-        adapter_proxy = dbus_object.get_interface('org.bluez.Adapter1')
-        battery_proxy = dbus_object.get_interface('org.bluez.Battery1')
+    def _on_object_removed(self, _object_manager: ObjectManager, object_path: ObjectPath,
+                           interfaces: Interfaces) -> None:
+        self._unindex_object(object_path)
+        for cls in _PROXY_CLASSES.values():
+            cls.evict(object_path)
 
-        if adapter_proxy:
-            assert isinstance(adapter_proxy, Gio.DBusProxy)
-            object_path = adapter_proxy.get_object_path()
+        if 'org.bluez.Adapter1' in interfaces:
             logging.debug(object_path)
             self.emit('adapter-removed', object_path)
-        if device_proxy:
-            assert isinstance(device_proxy, Gio.DBusProxy)
-            object_path = device_proxy.get_object_path()
-
-            if not get_allowed_device(object_path):
+        if 'org.bluez.Device1' in interfaces:
+            if object_path not in self._allowed_devices:
                 return
 
+            self._allowed_devices.remove(object_path)
             logging.debug(object_path)
             self.emit('device-removed', object_path)
-        if battery_proxy:
-            assert isinstance(device_proxy, Gio.DBusProxy)
-            object_path = device_proxy.get_object_path()
+        if 'org.bluez.Battery1' in interfaces:
             logging.debug(object_path)
             self.emit('battery-removed', object_path)
 
-    def _on_interface_added(self, _object_manager: Gio.DBusObjectManager, dbus_object: Gio.DBusObject,
-                            _dbus_interface: Gio.DBusInterface) -> None:
-        object_path = dbus_object.get_object_path()
-        battery = dbus_object.get_interface("org.bluez.Battery1")
-        if battery is not None:
+    def _on_interface_added(self, object_manager: ObjectManager, object_path: ObjectPath,
+                            interface_name: str) -> None:
+        self._index_object(object_path, object_manager.get_objects()[object_path])
+        if interface_name == "org.bluez.Battery1":
             logging.debug(f"Battery1 added to {object_path}")
             self.emit('battery-created', object_path)
 
-    def _on_interface_removed(self, _object_manager: Gio.DBusObjectManager, dbus_object: Gio.DBusObject,
-                              _dbus_interface: Gio.DBusInterface) -> None:
-        object_path = dbus_object.get_object_path()
-        battery = dbus_object.get_interface("org.bluez.Battery1")
-        if battery is not None:
+    def _on_interface_removed(self, object_manager: ObjectManager, object_path: ObjectPath,
+                              interface_name: str) -> None:
+        self._index_object(object_path, object_manager.get_objects()[object_path])
+        cls = _PROXY_CLASSES.get(interface_name)
+        if cls is not None:
+            cls.evict(object_path)
+
+        if interface_name == "org.bluez.Battery1":
             logging.debug(f"Battery1 removed from {object_path}")
             self.emit('battery-removed', object_path)
 
-    def get_adapters(self) -> List[Adapter]:
-        paths: List[ObjectPath] = []
-        for obj_proxy in self._object_manager.get_objects():
-            proxy = obj_proxy.get_interface('org.bluez.Adapter1')
-
-            if proxy:
-                assert isinstance(proxy, Gio.DBusProxy)
-                paths.append(ObjectPath(proxy.get_object_path()))
+    def _get_proxy(self, cls: Type[_T], object_path: ObjectPath) -> _T:
+        # Seed the proxy with the properties we hold so creating it does not fetch them again
+        properties = self._object_manager.get_objects().get(object_path, {}).get(cls._interface_name)
+        if properties is None:
+            return cls(obj_path=object_path)
+        return cast(_T, cls.from_properties(object_path, properties))
 
-        return [Adapter(obj_path=path) for path in paths]
+    def get_adapters(self) -> List[Adapter]:
+        return [self._get_proxy(Adapter, path) for path in sorted(self._adapters)]
 
     def get_adapter(self, pattern: Optional[str] = None) -> Adapter:
-        adapters = self.get_adapters()
+        paths = sorted(self._adapters)
         if pattern is None:
-            if len(adapters):
-                return adapters[0]
+            if len(paths):
+                return self._get_proxy(Adapter, paths[0])
             else:
                 raise DBusNoSuchAdapterError("No adapter(s) found")
         else:
-            for adapter in adapters:
-                path = adapter.get_object_path()
-                if path.endswith(pattern) or adapter['Address'] == pattern:
-                    return adapter
+            for path in paths:
+                if path.endswith(pattern) or self._adapters[path] == pattern:
+                    return self._get_proxy(Adapter, path)
             raise DBusNoSuchAdapterError(f"No adapters found with pattern: {pattern}")
 
     def get_devices(self, adapter_path: ObjectPath = ObjectPath("/")) -> List[Device]:
-        paths: List[ObjectPath] = []
-        for obj_proxy in self._object_manager.get_objects():
-            proxy = obj_proxy.get_interface('org.bluez.Device1')
+        if adapter_path == "/":
+            paths = list(self._devices)
+        elif adapter_path in self._devices_by_adapter:
+            paths = list(self._devices_by_adapter[adapter_path])
+        else:
+            paths = [path for path in self._devices if path.startswith(adapter_path)]
 
-            if proxy:
-                assert isinstance(proxy, Gio.DBusProxy)
-                object_path = ObjectPath(proxy.get_object_path())
-                if object_path.startswith(adapter_path):
-                    paths.append(object_path)
+        return [self._get_proxy(Device, path) for path in paths]
 
-        return [Device(obj_path=path) for path in paths]
+    def get_device(self, object_path: ObjectPath) -> Device:
+        return self._get_proxy(Device, object_path)
 
     def populate_devices(self, adapter_path: ObjectPath = ObjectPath("/")) -> None:
-        for obj_proxy in self._object_manager.get_objects():
+        for object_path, interfaces in list(self._object_manager.get_objects().items()):
             # We handle adapters differently so skip them.
-            if obj_proxy.get_interface("org.bluez.Adapter1") is not None:
+            if "org.bluez.Adapter1" in interfaces:
                 continue
-            object_path = obj_proxy.get_object_path()
             if object_path.startswith(adapter_path):
-                self._on_object_added(self._object_manager, obj_proxy)
+                self._on_object_added(self._object_manager, object_path, interfaces)
 
     def find_device(self, address: BtAddress, adapter_path: ObjectPath = ObjectPath("/")) -> Optional[Device]:
-        for device in self.get_devices(adapter_path):
-            if device['Address'] == address:
-                return device
+        for path in self._devices_by_address.get(address, {}):
+            if path.startswith(adapter_path):
+                return self._get_proxy(Device, path)
         return None
 
     @classmethod
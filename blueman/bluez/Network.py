@@ -1,4 +1,4 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, Collection
 from blueman.bluemantyping import ObjectPath
 
 from blueman.bluez.Base import Base
@@ -32,5 +32,5 @@ class Network(Base):
 
 
 class AnyNetwork(AnyBase):
-    def __init__(self) -> None:
-        super().__init__('org.bluez.Network1')
+    def __init__(self, properties: Optional[Collection[str]] = None) -> None:
+        super().__init__('org.bluez.Network1', properties)
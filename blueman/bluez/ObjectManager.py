@@ -0,0 +1,296 @@
+import logging
+from typing import Callable, Collection, Dict, Any, Optional, List, Tuple
+
+from gi.repository import GObject, Gio, GLib
+
+from blueman.bluemantyping import GSignals, ObjectPath
+from blueman.bluez import stats
+
+# interface name -> property name -> value
+Interfaces = Dict[str, Dict[str, Any]]
+
+
+class ObjectManager(GObject.GObject):
+    """org.freedesktop.DBus.ObjectManager client that only keeps track of the given interfaces
+
+    Unlike Gio.DBusObjectManagerClient it does not create a proxy per object and interface, objects are kept as
+    plain property dictionaries. Objects that have none of the interfaces, e.g. GATT attributes, are skipped
+    entirely and can still be accessed on demand through the proxy classes like blueman.bluez.Device.
+    """
+
+    __gsignals__: GSignals = {
+        # @param: object path, interfaces
+        'object-added': (GObject.SignalFlags.NO_HOOKS, None, (str, object)),
+        'object-removed': (GObject.SignalFlags.NO_HOOKS, None, (str, object)),
+        # @param: object path, interface name
+        'interface-added': (GObject.SignalFlags.NO_HOOKS, None, (str, str)),
+        'interface-removed': (GObject.SignalFlags.NO_HOOKS, None, (str, str)),
+        # @param: object path, interface name, changed properties, invalidated properties
+        'properties-changed': (GObject.SignalFlags.NO_HOOKS, None, (str, str, object, object)),
+    }
+
+    connect_signal = GObject.GObject.connect
+    disconnect_signal = GObject.GObject.disconnect
+
+    def __init__(self, bus_type: Gio.BusType, bus_name: str, interfaces: Collection[str],
+                 object_path: str = "/", load: bool = True) -> None:
+        """Objects get fetched synchronously unless load is False, in which case load_async has to be called"""
+        super().__init__()
+        self._bus = Gio.bus_get_sync(bus_type)
+        self._bus_name = bus_name
+        self._object_path = object_path
+        self._interfaces = frozenset(interfaces)
+        self._objects: Dict[ObjectPath, Interfaces] = {}
+        self._synced = False
+        self._loading = False
+        # Bumped when the bus name loses its owner, to abandon loads in progress
+        self._generation = 0
+        # Signals for objects whose GetManagedObjects entry was not handled yet, applied in order on top of it
+        self._deferred: Dict[ObjectPath, List[Tuple[str, Tuple[Any, ...]]]] = {}
+        self._ready_handlers: List[Callable[[], None]] = []
+
+        self._subscriptions = [
+            self._subscribe("org.freedesktop.DBus.ObjectManager", "InterfacesAdded", object_path, None,
+                            self._on_interfaces_added),
+            self._subscribe("org.freedesktop.DBus.ObjectManager", "InterfacesRemoved", object_path, None,
+                            self._on_interfaces_removed),
+        ]
+        # Let the bus drop property changes of interfaces we do not track
+        self._subscriptions += [
+            self._subscribe("org.freedesktop.DBus.Properties", "PropertiesChanged", None, interface_name,
+                            self._on_properties_changed)
+            for interface_name in self._interfaces
+        ]
+
+        if load:
+            self._load()
+
+        self._watch = Gio.bus_watch_name_on_connection(self._bus, bus_name, Gio.BusNameWatcherFlags.NONE,
+                                                       self._on_name_appeared, self._on_name_vanished)
+
+    def _subscribe(self, interface_name: str, member: str, object_path: Optional[str], arg0: Optional[str],
+                   handler: Callable[[str, GLib.Variant], None]) -> int:
+        def on_signal(_connection: Gio.DBusConnection, _sender: str, path: str, _interface_name: str,
+                      _signal_name: str, param: GLib.Variant) -> None:
+            handler(path, param)
+
+        return self._bus.signal_subscribe(self._bus_name, interface_name, member, object_path, arg0,
+                                          Gio.DBusSignalFlags.NONE, on_signal)
+
+    def _filter_interfaces(self, interfaces: GLib.Variant) -> Interfaces:
+        # Only unpack what we track, foreign interfaces can be large
+        result = {}
+        for interface_name in self._interfaces:
+            properties = interfaces.lookup_value(interface_name, None)
+            if properties is not None:
+                result[interface_name] = properties.unpack()
+        return result
+
+    def _load(self) -> None:
+        started = stats.start()
+        try:
+            reply = self._bus.call_sync(self._bus_name, self._object_path, "org.freedesktop.DBus.ObjectManager",
+                                        "GetManagedObjects", None, GLib.VariantType("(a{oa{sa{sv}}})"),
+                                        Gio.DBusCallFlags.NO_AUTO_START, -1, None)
+            stats.record_call("org.freedesktop.DBus.ObjectManager", "GetManagedObjects", started, blocking=True)
+        except GLib.Error as e:
+            stats.record_call("org.freedesktop.DBus.ObjectManager", "GetManagedObjects", started, blocking=True,
+                              error=True)
+            logging.info(f"Failed to get objects from {self._bus_name}: {e.message}")
+            return
+
+        managed_objects = reply.get_child_value(0)
+        for i in range(managed_objects.n_children()):
+            self._add_entry(managed_objects.get_child_value(i))
+        self._synced = True
+
+    def load_async(self, ready_handler: Optional[Callable[[], None]] = None, chunk_size: int = 32) -> None:
+        """Fetch the managed objects without blocking
+
+        object-added is emitted for chunk_size objects per idle callback so the main loop keeps drawing,
+        ready_handler is called once all objects are known, or the bus name has no owner.
+        """
+        if ready_handler is not None:
+            self._ready_handlers.append(ready_handler)
+
+        if self._loading:
+            return
+        self._loading = True
+        generation = self._generation
+
+        def load_chunk(managed_objects: GLib.Variant, position: int) -> bool:
+            if generation != self._generation:
+                return False
+
+            end = min(position + chunk_size, managed_objects.n_children())
+            for i in range(position, end):
+                self._add_entry(managed_objects.get_child_value(i))
+
+            if end < managed_objects.n_children():
+                GLib.idle_add(lambda: load_chunk(managed_objects, end))
+            else:
+                self._synced = True
+                self._finish_load()
+            return False
+
+        def on_reply(_bus: Optional[GObject.Object], result: Gio.AsyncResult, _user_data: object) -> None:
+            if generation != self._generation:
+                return
+
+            try:
+                reply = self._bus.call_finish(result)
+                stats.record_call("org.freedesktop.DBus.ObjectManager", "GetManagedObjects", started)
+            except GLib.Error as e:
+                stats.record_call("org.freedesktop.DBus.ObjectManager", "GetManagedObjects", started, error=True)
+                logging.info(f"Failed to get objects from {self._bus_name}: {e.message}")
+                self._finish_load()
+                return
+
+            managed_objects = reply.get_child_value(0)
+            GLib.idle_add(lambda: load_chunk(managed_objects, 0))
+
+        started = stats.start()
+        self._bus.call(self._bus_name, self._object_path, "org.freedesktop.DBus.ObjectManager", "GetManagedObjects",
+                       None, GLib.VariantType("(a{oa{sa{sv}}})"), Gio.DBusCallFlags.NO_AUTO_START, -1, None,
+                       on_reply, None)
+
+    def _finish_load(self) -> None:
+        self._loading = False
+        # Objects that were not in the reply
+        deferred, self._deferred = self._deferred, {}
+        for object_path, signals in deferred.items():
+            interfaces: Interfaces = {}
+            self._apply_deferred(interfaces, signals)
+            if interfaces and object_path not in self._objects:
+                self._objects[object_path] = interfaces
+                self.emit("object-added", object_path, interfaces)
+
+        self._run_ready_handlers()
+
+    def _run_ready_handlers(self) -> None:
+        handlers, self._ready_handlers = self._ready_handlers, []
+        for handler in handlers:
+            handler()
+
+    def _add_entry(self, entry: GLib.Variant) -> None:
+        object_path = ObjectPath(entry.get_child_value(0).unpack())
+        if object_path in self._objects:
+            return
+
+        interfaces = self._filter_interfaces(entry.get_child_value(1))
+        self._apply_deferred(interfaces, self._deferred.pop(object_path, []))
+        if interfaces:
+            self._objects[object_path] = interfaces
+            self.emit("object-added", object_path, interfaces)
+
+    def _defer(self, object_path: ObjectPath, kind: str, *args: Any) -> bool:
+        """Keep a signal for an object that may still be waiting in the GetManagedObjects reply"""
+        if not self._loading or object_path in self._objects:
+            return False
+        self._deferred.setdefault(object_path, []).append((kind, args))
+        return True
+
+    @staticmethod
+    def _apply_deferred(interfaces: Interfaces, signals: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+        # Replaying signals that are older than the reply as well ends in the latest state
+        for kind, args in signals:
+            if kind == "added":
+                interfaces.update(args[0])
+            elif kind == "removed":
+                for interface_name in args[0]:
+                    interfaces.pop(interface_name, None)
+            else:
+                interface_name, changed, invalidated = args
+                properties = interfaces.get(interface_name)
+                if properties is not None:
+                    properties.update(changed)
+                    for name in invalidated:
+                        properties.pop(name, None)
+
+    def _on_name_appeared(self, _connection: Gio.DBusConnection, _name: str, _owner: str) -> None:
+        if not self._synced:
+            self.load_async()
+
+    def _on_name_vanished(self, _connection: Gio.DBusConnection, _name: str) -> None:
+        # Abandon a load in progress, the next owner gets loaded from scratch
+        self._generation += 1
+        self._loading = False
+        self._deferred.clear()
+        self._synced = False
+        for object_path in list(self._objects):
+            self.emit("object-removed", object_path, self._objects.pop(object_path))
+        # The reply of an abandoned load gets ignored, nothing is left to wait for without an owner
+        self._run_ready_handlers()
+
+    def _on_interfaces_added(self, _path: str, param: GLib.Variant) -> None:
+        stats.record_signal("org.freedesktop.DBus.ObjectManager", "InterfacesAdded")
+        object_path = ObjectPath(param.get_child_value(0).unpack())
+        interfaces = self._filter_interfaces(param.get_child_value(1))
+        if not interfaces or self._defer(object_path, "added", interfaces):
+            return
+
+        if object_path not in self._objects:
+            self._objects[object_path] = interfaces
+            self.emit("object-added", object_path, interfaces)
+        else:
+            known = self._objects[object_path]
+            for interface_name, properties in interfaces.items():
+                added = interface_name not in known
+                known[interface_name] = properties
+                if added:
+                    self.emit("interface-added", object_path, interface_name)
+
+    def _on_interfaces_removed(self, _path: str, param: GLib.Variant) -> None:
+        stats.record_signal("org.freedesktop.DBus.ObjectManager", "InterfacesRemoved")
+        object_path, interface_names = param.unpack()
+        object_path = ObjectPath(object_path)
+        interface_names = [interface_name for interface_name in interface_names if interface_name in self._interfaces]
+        if not interface_names or self._defer(object_path, "removed", interface_names):
+            return
+
+        known = self._objects.get(object_path)
+        if known is None:
+            return
+
+        removed = [interface_name for interface_name in interface_names if interface_name in known]
+        if len(removed) == len(known):
+            self.emit("object-removed", object_path, self._objects.pop(object_path))
+            return
+
+        for interface_name in removed:
+            del known[interface_name]
+            self.emit("interface-removed", object_path, interface_name)
+
+    def _on_properties_changed(self, object_path: str, param: GLib.Variant) -> None:
+        interface_name, changed, invalidated = param.unpack()
+        stats.record_signal(interface_name, "PropertiesChanged", list(changed) + invalidated)
+        if self._defer(ObjectPath(object_path), "changed", interface_name, changed, invalidated):
+            return
+
+        properties = self._objects.get(ObjectPath(object_path), {}).get(interface_name)
+        if properties is None:
+            return
+
+        properties.update(changed)
+        for name in invalidated:
+            properties.pop(name, None)
+
+        self.emit("properties-changed", object_path, interface_name, changed, invalidated)
+
+    def is_synced(self) -> bool:
+        return self._synced
+
+    def get_objects(self) -> Dict[ObjectPath, Interfaces]:
+        return self._objects
+
+    def get_object(self, object_path: str) -> Optional[Interfaces]:
+        return self._objects.get(ObjectPath(object_path))
+
+    def get_properties(self, object_path: str, interface_name: str) -> Optional[Dict[str, Any]]:
+        return self._objects.get(ObjectPath(object_path), {}).get(interface_name)
+
+    def destroy(self) -> None:
+        Gio.bus_unwatch_name(self._watch)
+        for subscription in self._subscriptions:
+            self._bus.signal_unsubscribe(subscription)
+        self._subscriptions = []
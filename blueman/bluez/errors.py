@@ -1,4 +1,4 @@
-from gi.repository import GLib
+from gi.repository import Gio, GLib
 
 
 class BluezDBusException(Exception):
@@ -132,6 +132,10 @@ __DICT_ERROR__ = {'org.bluez.Error.Failed': DBusFailedError,
 def parse_dbus_error(exception: GLib.Error) -> BluezDBusException:
     global __DICT_ERROR__
 
+    if not Gio.DBusError.is_remote_error(exception):
+        # Local failures such as a cancelled call or a timeout
+        return BluezDBusException(exception.message)
+
     gerror, dbus_error, message = exception.message.split(':', 2)
     try:
         return __DICT_ERROR__[dbus_error](message)
@@ -0,0 +1,109 @@
+"""
+Accounting of D-Bus calls and signals, enabled by setting BLUEMAN_DBUS_STATS in the environment
+
+Calls are keyed by interface and member, property access by interface and Get:<property> etc. Latencies go into
+histograms with the upper bounds in BUCKETS (milliseconds), the last bucket takes everything slower.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Any
+
+from gi.repository import GLib
+
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_enabled = bool(os.environ.get("BLUEMAN_DBUS_STATS"))
+
+
+class CallStats:
+    def __init__(self) -> None:
+        self.count = 0
+        # Synchronous calls block the main loop for their whole duration
+        self.blocking = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+
+    def add(self, milliseconds: float, blocking: bool, error: bool) -> None:
+        self.count += 1
+        self.blocking += blocking
+        self.errors += error
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+        for i, bound in enumerate(BUCKETS):
+            if milliseconds <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+
+_calls: Dict[str, CallStats] = {}
+_signals: Dict[str, int] = {}
+_since = time.monotonic()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(value: bool = True) -> None:
+    global _enabled
+    _enabled = value
+
+
+def start() -> float:
+    """Timestamp to pass to record_call, cheap when accounting is off"""
+    return time.monotonic() if _enabled else 0.0
+
+
+def member_name(method: str, param: Optional[GLib.Variant]) -> str:
+    """Name properties calls after the property they access, e.g. Get:Powered"""
+    if method.startswith("org.freedesktop.DBus.Properties."):
+        method = method[len("org.freedesktop.DBus.Properties."):]
+        if method in ("Get", "Set") and param is not None:
+            method = f"{method}:{param.get_child_value(1).get_string()}"
+    return method
+
+
+def record_call(interface_name: str, member: str, started: float, blocking: bool = False,
+                error: bool = False) -> None:
+    if not _enabled:
+        return
+
+    key = f"{interface_name}.{member}"
+    stats = _calls.get(key)
+    if stats is None:
+        stats = _calls[key] = CallStats()
+    stats.add((time.monotonic() - started) * 1000, blocking, error)
+
+
+def record_signal(interface_name: str, member: str, properties: Optional[List[str]] = None) -> None:
+    if not _enabled:
+        return
+
+    keys = [f"{interface_name}.{member}"]
+    if properties:
+        keys += [f"{interface_name}.{member}:{name}" for name in properties]
+    for key in keys:
+        _signals[key] = _signals.get(key, 0) + 1
+
+
+def call_stats() -> Dict[str, Dict[str, Any]]:
+    return {key: {"count": stats.count, "blocking": stats.blocking, "errors": stats.errors,
+                  "total-ms": stats.total, "max-ms": stats.max, "histogram": list(stats.histogram)}
+            for key, stats in _calls.items()}
+
+
+def signal_stats() -> Dict[str, Dict[str, Any]]:
+    elapsed = max(time.monotonic() - _since, 1e-9)
+    return {key: {"count": count, "rate": count / elapsed} for key, count in _signals.items()}
+
+
+def reset() -> None:
+    global _since
+    _calls.clear()
+    _signals.clear()
+    _since = time.monotonic()
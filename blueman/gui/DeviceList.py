@@ -15,10 +15,11 @@ from gi.repository import GLib
 
 import gi
 
-from blueman.bluemantyping import GSignals, ObjectPath
+from blueman.bluemantyping import GSignals, ObjectPath, BtAddress
 
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk
+from gi.repository import Gdk
 
 
 class DeviceList(GenericList):
@@ -41,13 +42,20 @@ class DeviceList(GenericList):
         'adapter-removed': (GObject.SignalFlags.RUN_LAST, None, (str,)),
     }
 
+    # Device property changes are applied once per frame, or every update_interval milliseconds while the list is
+    # not shown or frame_updates is False
+    frame_updates = True
+    update_interval = 100
+
     def __init__(self, adapter_name: Optional[str] = None, tabledata: Optional[List[ListDataDict]] = None,
                  headers_visible: bool = True) -> None:
         if not tabledata:
             tabledata = []
 
-        # cache for fast lookup in the list
-        self.path_to_row: Dict[str, Gtk.TreeRowReference] = {}
+        # cache for fast lookup in the list, list store iters stay valid as long as their row exists
+        self.path_to_row: Dict[str, Gtk.TreeIter] = {}
+        self.address_to_row: Dict[BtAddress, Gtk.TreeIter] = {}
+        self._path_to_address: Dict[str, BtAddress] = {}
 
         self.manager = Manager()
         self._managerhandlers: List[int] = []
@@ -62,6 +70,10 @@ class DeviceList(GenericList):
 
         self.any_device = AnyDevice()
         self._anydevhandler = self.any_device.connect_signal("property-changed", self._on_device_property_changed)
+        # object path -> property name -> latest value
+        self._pending_changes: Dict[ObjectPath, Dict[str, object]] = {}
+        self._flush_tick: Optional[int] = None
+        self._flush_source: Optional[int] = None
 
         self.__discovery_time: float = 0
         self.__adapter_path: Optional[ObjectPath] = None
@@ -83,6 +95,8 @@ class DeviceList(GenericList):
         self._anyadapterhandler = self._any_adapter.connect_signal("property-changed", self._on_property_changed)
 
         self._selectionhandler = self.selection.connect('changed', self.on_selection_changed)
+        # The frame clock stops while unmapped
+        self.connect("unmap", self._reschedule_flush)
 
         self.icon_theme = Gtk.IconTheme.get_default()
         self.icon_theme.prepend_search_path(ICON_PATH)
@@ -93,6 +107,7 @@ class DeviceList(GenericList):
         self.any_device.disconnect(self._anydevhandler)
         self._any_adapter.disconnect(self._anyadapterhandler)
         self.selection.disconnect(self._selectionhandler)
+        self._cancel_flush()
         for handler in self._managerhandlers:
             self.manager.disconnect(handler)
         super().destroy()
@@ -135,13 +150,59 @@ class DeviceList(GenericList):
         self.emit("adapter-property-changed", self.Adapter, (key, value))
 
     def _on_device_property_changed(self, _device: AnyDevice, key: str, value: object, path: ObjectPath) -> None:
-        tree_iter = self.find_device_by_path(path)
+        if path not in self.path_to_row:
+            return
 
-        if tree_iter is not None:
-            dev = self.get(tree_iter, "device")["device"]
-            self.row_update_event(tree_iter, key, value)
+        # Discovering devices update RSSI and ManufacturerData several times a second, only the latest value of a
+        # property gets applied
+        self._pending_changes.setdefault(path, {})[key] = value
+        self._schedule_flush()
 
-            self.emit("device-property-changed", dev, tree_iter, (key, value))
+    def _schedule_flush(self) -> None:
+        if self._flush_tick is not None or self._flush_source is not None:
+            return
+
+        if self.frame_updates and self.get_mapped():
+            self._flush_tick = self.add_tick_callback(self._on_flush_tick)
+        else:
+            self._flush_source = GLib.timeout_add(self.update_interval, self._on_flush_timeout)
+
+    def _cancel_flush(self) -> None:
+        if self._flush_tick is not None:
+            self.remove_tick_callback(self._flush_tick)
+            self._flush_tick = None
+        if self._flush_source is not None:
+            GLib.source_remove(self._flush_source)
+            self._flush_source = None
+
+    def _reschedule_flush(self, _widget: Gtk.Widget) -> None:
+        if self._flush_tick is not None:
+            self._cancel_flush()
+            self._schedule_flush()
+
+    def _on_flush_tick(self, _widget: Gtk.Widget, _frame_clock: Gdk.FrameClock, _user_data: object = None) -> bool:
+        self._flush_tick = None
+        self.flush_changes()
+        return False
+
+    def _on_flush_timeout(self) -> bool:
+        self._flush_source = None
+        self.flush_changes()
+        return False
+
+    def flush_changes(self) -> None:
+        """Apply the buffered device property changes right away"""
+        self._cancel_flush()
+        pending, self._pending_changes = self._pending_changes, {}
+        for path, changes in pending.items():
+            tree_iter = self.find_device_by_path(path)
+            if tree_iter is None:
+                continue
+
+            dev = self.get(tree_iter, "device")["device"]
+            for key, value in changes.items():
+                self.row_update_event(tree_iter, key, value)
+                self.emit("device-property-changed", dev, tree_iter, (key, value))
 
     # Override when subclassing
     def on_icon_theme_changed(self, _icon_them: Gtk.IconTheme) -> None:
@@ -171,7 +232,7 @@ class DeviceList(GenericList):
             self.emit("device-selected", None, None)
 
         self.delete(tree_iter)
-        del self.path_to_row[object_path]
+        self._uncache(object_path)
 
     #########################
 
@@ -221,9 +282,10 @@ class DeviceList(GenericList):
         return True
 
     def add_device(self, object_path: ObjectPath) -> None:
-        device = Device(obj_path=object_path)
+        device = self.manager.get_device(object_path)
+        properties = device.get_properties()
         # device belongs to another adapter
-        if not self.Adapter or not device['Adapter'] == self.Adapter.get_object_path():
+        if not self.Adapter or not properties['Adapter'] == self.Adapter.get_object_path():
             return
 
         logging.info("adding new device")
@@ -232,18 +294,22 @@ class DeviceList(GenericList):
             "device": device,
             "dbus_path": object_path,
             "timestamp": float(datetime.strftime(datetime.now(), '%Y%m%d%H%M%S%f')),
-            "no_name": "Name" not in device
+            "no_name": "Name" not in properties
         }
 
         tree_iter = self.append(**colls)
         self.row_setup_event(tree_iter, device)
 
-        if self.get_selected_device() is None:
+        if not self.is_batching() and self.get_selected_device() is None:
             self.selection.select_path(Gtk.TreePath.new_first())
 
     def populate_devices(self) -> None:
-        self.clear()
-        self.manager.populate_devices()
+        with self.batch():
+            self.clear()
+            self.manager.populate_devices()
+
+        if self.get_selected_device() is None:
+            self.selection.select_path(Gtk.TreePath.new_first())
 
     def discover_devices(self, time: float = 60.0,
                          error_handler: Optional[Callable[[BluezDBusException], None]] = None) -> None:
@@ -272,42 +338,40 @@ class DeviceList(GenericList):
     def get_selected_device(self) -> Optional[Device]:
         selected = self.selected()
         if selected is not None:
-            row = self.get(selected, "device")
-            device: Device = row["device"]
+            device: Device = self.get_value(selected, "device")
             return device
         return None
 
     def clear(self) -> None:
         if len(self.liststore):
-            for i in self.liststore:
-                tree_iter = i.iter
-                dbus_path = self.get(tree_iter, "dbus_path")["dbus_path"]
-                self.device_remove_event(dbus_path)
+            # All rows go at once, without a removal animation for each of them
             self.liststore.clear()
             self.emit("device-selected", None, None)
 
         self.path_to_row = {}
+        self.address_to_row = {}
+        self._path_to_address = {}
 
     def find_device_by_path(self, object_path: ObjectPath) -> Optional[Gtk.TreeIter]:
-        row = self.path_to_row.get(object_path, None)
-        if row is None:
-            return row
-
-        if row.valid():
-            tree_path = row.get_path()
-            assert tree_path is not None
-            tree_iter = self.liststore.get_iter(tree_path)
-            return tree_iter
-        else:
-            del self.path_to_row[object_path]
-            return None
+        return self.path_to_row.get(object_path, None)
+
+    def find_device_by_address(self, address: BtAddress) -> Optional[Gtk.TreeIter]:
+        return self.address_to_row.get(address, None)
+
+    def _uncache(self, object_path: str) -> None:
+        del self.path_to_row[object_path]
+        address = self._path_to_address.pop(object_path, None)
+        if address is not None:
+            del self.address_to_row[address]
 
     def do_cache(self, tree_iter: Gtk.TreeIter, kwargs: Dict[str, Any]) -> None:
         object_path = None
+        address = None
 
         if "device" in kwargs:
             if kwargs["device"]:
                 object_path = kwargs['device'].get_object_path()
+                address = kwargs['device']['Address']
 
         elif "dbus_path" in kwargs:
             if kwargs["dbus_path"]:
@@ -315,12 +379,14 @@ class DeviceList(GenericList):
             else:
                 existing = self.get(tree_iter, "dbus_path")["dbus_path"]
                 if existing is not None:
-                    del self.path_to_row[existing]
+                    self._uncache(existing)
 
         if object_path:
             logging.info(f"Caching new device {object_path}")
-            self.path_to_row[object_path] = Gtk.TreeRowReference.new(self.liststore,
-                                                                     self.liststore.get_path(tree_iter))
+            self.path_to_row[object_path] = tree_iter
+            if address is not None:
+                self.address_to_row[address] = tree_iter
+                self._path_to_address[object_path] = address
 
     def append(self, **columns: object) -> Gtk.TreeIter:
         tree_iter = super().append(**columns)
@@ -32,9 +32,8 @@ class DeviceSelectorList(DeviceList):
         super().__init__(adapter_name, tabledata, headers_visible=False)
 
     def on_icon_theme_changed(self, _icon_them: Gtk.IconTheme) -> None:
-        for row in self.liststore:
-            device = self.get(row.iter, "device")["device"]
-            self.row_setup_event(row.iter, device)
+        for tree_iter, (device,) in list(self.iter_rows("device")):
+            self.row_setup_event(tree_iter, device)
 
     def row_setup_event(self, tree_iter: Gtk.TreeIter, device: Device) -> None:
         self.row_update_event(tree_iter, "Trusted", device['Trusted'])
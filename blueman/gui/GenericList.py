@@ -1,4 +1,5 @@
-from typing import Dict, Optional, TYPE_CHECKING, Iterable, Mapping, Callable, Tuple, Collection, Any
+from contextlib import contextmanager
+from typing import Dict, Optional, TYPE_CHECKING, Iterable, Iterator, Mapping, Callable, Tuple, Collection, Any
 
 import gi
 gi.require_version("Gtk", "3.0")
@@ -28,6 +29,7 @@ class GenericList(Gtk.TreeView):
         super().__init__(headers_visible=headers_visible, visible=visible)
         self.set_name("GenericList")
         self.selection = self.get_selection()
+        self._batch_depth = 0
         self._load(data)
 
     def _load(self, data: Iterable[ListDataDict]) -> None:
@@ -60,6 +62,50 @@ class GenericList(Gtk.TreeView):
             self.columns[row["id"]] = column
             self.append_column(column)
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Insert, update and remove many rows at once
+
+        The view is detached from the model and sorting is suspended for the duration, so the view does not get
+        laid out and the model does not get re-sorted for every single change. The selection is kept if its row
+        survives.
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            return
+
+        selected = self.selected()
+        selected_ref = None
+        if selected is not None:
+            selected_ref = Gtk.TreeRowReference.new(self.liststore, self.liststore.get_path(selected))
+
+        sort_column_id, sort_order = self.liststore.get_sort_column_id()
+        if sort_column_id is not None and sort_order is not None:
+            self.liststore.set_sort_column_id(Gtk.TREE_SORTABLE_UNSORTED_SORT_COLUMN_ID, Gtk.SortType.ASCENDING)
+        self.set_model(None)
+        self._batch_depth = 1
+        try:
+            yield
+        finally:
+            self._batch_depth = 0
+            if sort_column_id is not None and sort_order is not None:
+                self.liststore.set_sort_column_id(sort_column_id, sort_order)
+            self.set_model(self.filter)
+
+            # None if the row is gone
+            child_path = selected_ref.get_path() if selected_ref is not None else None
+            if child_path is not None:
+                path = self.filter.convert_child_path_to_path(child_path)
+                if path is not None:
+                    self.selection.select_path(path)
+
+    def is_batching(self) -> bool:
+        return self._batch_depth > 0
+
     def selected(self) -> Optional[Gtk.TreeIter]:
         model, tree_iter = self.selection.get_selected()
         if tree_iter is not None:
@@ -95,8 +141,8 @@ class GenericList(Gtk.TreeView):
         return self.liststore.prepend(vals)
 
     def set(self, tree_iter: Gtk.TreeIter, **cols: object) -> None:
-        for k, v in cols.items():
-            self.liststore.set(tree_iter, self.ids[k], v)
+        # One call, so the row changes once however many columns are set
+        self.liststore.set(tree_iter, {self.ids[k]: v for k, v in cols.items()})
 
     def get(self, tree_iter: Gtk.TreeIter, *items: str) -> Dict[str, Any]:
         row_data = {}
@@ -109,6 +155,20 @@ class GenericList(Gtk.TreeView):
             row_data[name] = self.liststore.get_value(tree_iter, colid)
         return row_data
 
+    def get_value(self, tree_iter: Gtk.TreeIter, name: str) -> Any:
+        return self.liststore.get_value(tree_iter, self.ids[name])
+
+    def get_values(self, tree_iter: Gtk.TreeIter, *names: str) -> Tuple[Any, ...]:
+        """Values of the given columns in the order given, read in one call without building a dict"""
+        values: Tuple[Any, ...] = self.liststore.get(tree_iter, *[self.ids[name] for name in names])
+        return values
+
+    def iter_rows(self, *names: str) -> Iterator[Tuple[Gtk.TreeIter, Tuple[Any, ...]]]:
+        """Every row of the model with the values of the given columns, like get_values"""
+        column_ids = [self.ids[name] for name in names]
+        for row in self.liststore:
+            yield row.iter, self.liststore.get(row.iter, *column_ids)
+
     def get_iter(self, path: Optional[Gtk.TreePath]) -> Optional[Gtk.TreeIter]:
         if path is None:
             return None
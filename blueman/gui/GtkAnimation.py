@@ -1,4 +1,5 @@
-from typing import List, Optional, Collection, Iterable, TYPE_CHECKING
+import weakref
+from typing import Dict, List, Optional, Collection, Iterable, Union, TYPE_CHECKING
 
 import cairo
 import gi
@@ -18,39 +19,121 @@ if TYPE_CHECKING:
     BaseContext = cairo.Context[cairo.Surface]
 
 
+class _TimeoutScheduler:
+    """Ticks animations without a mapped widget, all of them from a single timeout"""
+
+    fps = 24.0
+
+    def __init__(self) -> None:
+        self._animations: Dict["AnimBase", None] = {}
+        self._source: Optional[int] = None
+
+    def add(self, animation: "AnimBase") -> None:
+        self._animations[animation] = None
+        if self._source is None:
+            self._source = GLib.timeout_add(int(1000 / self.fps), self._on_timeout)
+
+    def remove(self, animation: "AnimBase") -> None:
+        self._animations.pop(animation, None)
+
+    def _on_timeout(self) -> bool:
+        _tick(self._animations, GLib.get_monotonic_time())
+        if self._animations:
+            return True
+        self._source = None
+        return False
+
+
+class FrameClockScheduler:
+    """Ticks all animations of a widget together from its frame clock
+
+    The tick callback only exists while something animates, when the widget gets unmapped running animations move to
+    the timeout scheduler so they still finish.
+    """
+
+    def __init__(self, widget: Gtk.Widget) -> None:
+        # The registry is keyed by the widget, do not keep it alive
+        self._widget = weakref.ref(widget)
+        self._animations: Dict["AnimBase", None] = {}
+        self._tick_id: Optional[int] = None
+        widget.connect("unmap", self._on_unmap)
+
+    @classmethod
+    def for_widget(cls, widget: Gtk.Widget) -> "FrameClockScheduler":
+        scheduler = _frame_schedulers.get(widget)
+        if scheduler is None:
+            scheduler = _frame_schedulers[widget] = cls(widget)
+        return scheduler
+
+    def add(self, animation: "AnimBase") -> None:
+        widget = self._widget()
+        if widget is None or not widget.get_mapped():
+            animation._scheduler = _timeout_scheduler
+            _timeout_scheduler.add(animation)
+            return
+
+        self._animations[animation] = None
+        if self._tick_id is None:
+            self._tick_id = widget.add_tick_callback(self._on_tick)
+
+    def remove(self, animation: "AnimBase") -> None:
+        self._animations.pop(animation, None)
+
+    def _on_tick(self, _widget: Gtk.Widget, frame_clock: Gdk.FrameClock, _user_data: object = None) -> bool:
+        _tick(self._animations, frame_clock.get_frame_time())
+        if self._animations:
+            return True
+        self._tick_id = None
+        return False
+
+    def _on_unmap(self, widget: Gtk.Widget) -> None:
+        if self._tick_id is not None:
+            widget.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+
+        for animation in self._animations:
+            animation._scheduler = _timeout_scheduler
+            _timeout_scheduler.add(animation)
+        self._animations.clear()
+
+
+def _tick(animations: Dict["AnimBase", None], now: int) -> None:
+    for animation in list(animations):
+        if not animation._advance(now / 1000):
+            animations.pop(animation, None)
+
+
+_timeout_scheduler = _TimeoutScheduler()
+_frame_schedulers: "weakref.WeakKeyDictionary[Gtk.Widget, FrameClockScheduler]" = weakref.WeakKeyDictionary()
+
+
 class AnimBase(GObject.GObject):
     __gsignals__: GSignals = {
         'animation-finished': (GObject.SignalFlags.RUN_LAST, None, ()),
     }
 
-    def __init__(self, state: float = 1.0) -> None:
+    def __init__(self, state: float = 1.0, widget: Optional[Gtk.Widget] = None) -> None:
         super().__init__()
-        self._source: Optional[int] = None
+        self._widget = widget
+        self._scheduler: Optional[Union[_TimeoutScheduler, FrameClockScheduler]] = None
         self._state = state
+        self._started: Optional[float] = None
         self.frozen = False
-        self.fps = 24.0
 
-    def _do_transition(self) -> bool:
-        if abs(self._end - self._start) < 0.000001:
-            return False
-
-        self._state += self._step_size
+    def _advance(self, now: float) -> bool:
+        """Move to the state for time now (milliseconds), False when finished"""
+        if self._started is None:
+            self._started = now
 
-        if self._end - self._start < 0:
-            if self._state <= self._end:
-                self._state = self._end
-                self._state_changed(self._state)
-                self._source = None
-                self.emit("animation-finished")
-                return False
-        else:
-            if self._state >= self._end:
-                self._state = self._end
-                self._state_changed(self._state)
-                self._source = None
-                self.emit("animation-finished")
-                return False
+        progress = (now - self._started) / self._duration
+        if progress >= 1.0 or abs(self._end - self._start) < 0.000001:
+            self._state = self._end
+            self._state_changed(self._state)
+            self._scheduler = None
+            self.emit("animation-finished")
+            return False
 
+        self._state = self._start + (self._end - self._start) * progress
         self._state_changed(self._state)
         return True
 
@@ -69,19 +152,22 @@ class AnimBase(GObject.GObject):
         self._start = start
         self._end = end
         self._duration = duration
+        self._started = None
 
-        if self._source:
-            GLib.source_remove(self._source)
+        if self._scheduler is not None:
+            self._scheduler.remove(self)
+            self._scheduler = None
 
-        try:
-            self._step_size = (end - start) / (self.fps * (duration / 1000.0))
-        except ZeroDivisionError:
+        if duration <= 0:
             self._state = end
-
             return
 
         self._state_changed(self._state)
-        self._source = GLib.timeout_add(int(1.0 / self.fps * 1000), self._do_transition)
+        if self._widget is None:
+            self._scheduler = _timeout_scheduler
+        else:
+            self._scheduler = FrameClockScheduler.for_widget(self._widget)
+        self._scheduler.add(self)
 
     def _state_changed(self, state: float) -> None:
         self.state_changed(state)
@@ -97,46 +183,113 @@ class AnimBase(GObject.GObject):
         self._state_changed(state)
 
     def is_animating(self) -> bool:
-        return self._source is not None
+        return self._scheduler is not None
 
 
-class TreeRowFade(AnimBase):
-    def __init__(self, tw: "ManagerDeviceList",
-                 path: Gtk.TreePath,
-                 columns: Optional[Collection[Gtk.TreeViewColumn]] = None) -> None:
-        super().__init__(1.0)
+class _FadePainter:
+    """Single draw handler per tree view painting the fades that currently show"""
+
+    def __init__(self, tw: "ManagerDeviceList") -> None:
+        self._fades: Dict["_RowFadeBase", None] = {}
+        tw.connect_after("draw", self._on_draw)
+
+    @classmethod
+    def for_view(cls, tw: "ManagerDeviceList") -> "_FadePainter":
+        painter = _painters.get(tw)
+        if painter is None:
+            painter = _painters[tw] = cls(tw)
+        return painter
+
+    def add(self, fade: "_RowFadeBase") -> None:
+        self._fades[fade] = None
+
+    def remove(self, fade: "_RowFadeBase") -> None:
+        self._fades.pop(fade, None)
+
+    def _on_draw(self, _widget: Gtk.Widget, cr: "BaseContext") -> bool:
+        _x1, clip_top, _x2, clip_bottom = cr.clip_extents()
+        for fade in list(self._fades):
+            # Fully faded in, nothing to paint
+            if fade.get_state() >= 1.0:
+                continue
+
+            path = fade.get_view_path()
+            if path is None:
+                continue
+
+            area = fade.tw.get_background_area(path, None)
+            if area.y + area.height < clip_top or area.y > clip_bottom:
+                continue
+
+            cr.save()
+            fade.paint(cr, path)
+            cr.restore()
+
+        return False
+
+
+_painters: "weakref.WeakKeyDictionary[Gtk.Widget, _FadePainter]" = weakref.WeakKeyDictionary()
+
+
+class _RowFadeBase(AnimBase):
+    def __init__(self, tw: "ManagerDeviceList", path: Gtk.TreePath) -> None:
+        super().__init__(1.0, tw)
         self.tw = tw
         assert self.tw.liststore is not None
 
-        self.sig: Optional[int] = self.tw.connect_after("draw", self.on_draw)
-
         self.row = Gtk.TreeRowReference.new(self.tw.liststore, path)
-        self.stylecontext = tw.get_style_context()
-        self.columns = columns
+        self._painter: Optional[_FadePainter] = _FadePainter.for_view(tw)
+        self._painter.add(self)
 
-    def unref(self) -> None:
-        if self.sig is not None:
-            self.tw.disconnect(self.sig)
-            self.sig = None
+    def thaw(self) -> None:
+        super().thaw()
+        if self._painter is not None:
+            self._painter.add(self)
 
-    def on_draw(self, widget: Gtk.Widget, cr: "BaseContext") -> bool:
-        if self.frozen:
-            return False
+    def freeze(self) -> None:
+        super().freeze()
+        if self._painter is not None:
+            self._painter.remove(self)
 
+    def unref(self) -> None:
+        if self._painter is not None:
+            self._painter.remove(self)
+            self._painter = None
+
+    def get_view_path(self) -> Optional[Gtk.TreePath]:
         if not self.row.valid():
-            if self.sig is not None:
-                self.tw.disconnect(self.sig)
-                self.sig = None
-            return False
+            self.unref()
+            return None
 
         path = self.row.get_path()
         if path is None:
-            return False
+            return None
+
+        return self.tw.filter.convert_child_path_to_path(path)
+
+    def paint(self, cr: "BaseContext", path: Gtk.TreePath) -> None:
+        pass
 
-        path = self.tw.filter.convert_child_path_to_path(path)
+    def state_changed(self, state: float) -> None:
+        # Only the row needs a redraw, GTK merges the areas of all animations into one frame
+        path = self.get_view_path()
         if path is None:
-            return False
+            return
+
+        area = self.tw.get_background_area(path, None)
+        _x, y = self.tw.convert_bin_window_to_widget_coords(area.x, area.y)
+        self.tw.queue_draw_area(0, y, self.tw.get_allocated_width(), area.height)
 
+
+class TreeRowFade(_RowFadeBase):
+    def __init__(self, tw: "ManagerDeviceList",
+                 path: Gtk.TreePath,
+                 columns: Optional[Collection[Gtk.TreeViewColumn]] = None) -> None:
+        super().__init__(tw, path)
+        self.stylecontext = tw.get_style_context()
+        self.columns = columns
+
+    def paint(self, cr: "BaseContext", path: Gtk.TreePath) -> None:
         color = self.stylecontext.get_background_color(Gtk.StateFlags.NORMAL)
 
         if not self.columns:
@@ -153,49 +306,16 @@ class TreeRowFade(AnimBase):
         cr.set_operator(cairo.OPERATOR_OVER)
         cr.paint()
 
-        return False
-
-    def state_changed(self, state: float) -> None:
-        self.tw.queue_draw()
-
 
-class CellFade(AnimBase):
+class CellFade(_RowFadeBase):
     def __init__(self, tw: "ManagerDeviceList", path: Gtk.TreePath, columns: Iterable[int]) -> None:
-        super().__init__(1.0)
-        self.tw = tw
-        assert self.tw.liststore is not None
-
-        self.frozen = False
-        self.sig: Optional[int] = tw.connect_after("draw", self.on_draw)
-        self.row = Gtk.TreeRowReference.new(self.tw.liststore, path)
+        super().__init__(tw, path)
         self.selection = tw.get_selection()
         self.columns: List[Optional[Gtk.TreeViewColumn]] = []
         for i in columns:
             self.columns.append(self.tw.get_column(i))
 
-    def unref(self) -> None:
-        if self.sig is not None:
-            self.tw.disconnect(self.sig)
-            self.sig = None
-
-    def on_draw(self, _widget: Gtk.Widget, cr: "BaseContext") -> bool:
-        if self.frozen:
-            return False
-
-        if not self.row.valid():
-            if self.sig is not None:
-                self.tw.disconnect(self.sig)
-                self.sig = None
-
-        assert self.tw.liststore is not None
-        path = self.row.get_path()
-        if path is None:
-            return False
-
-        path = self.tw.filter.convert_child_path_to_path(path)
-        if path is None:
-            return False
-
+    def paint(self, cr: "BaseContext", path: Gtk.TreePath) -> None:
         # FIXME Use Gtk.render_background to render background.
         # However it does not use the correct colors/gradient.
         for col in self.columns:
@@ -224,15 +344,10 @@ class CellFade(AnimBase):
         cr.set_source_rgb(bg_color.red, bg_color.green, bg_color.blue)
         cr.paint_with_alpha(1.0 - self.get_state())
 
-        return False
-
-    def state_changed(self, state: float) -> None:
-        self.tw.queue_draw()
-
 
 class WidgetFade(AnimBase):
     def __init__(self, widget: Gtk.Widget, color: Gdk.RGBA) -> None:
-        super().__init__(1.0)
+        super().__init__(1.0, widget)
 
         self.widget = widget
         self.color = color
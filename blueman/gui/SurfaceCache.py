@@ -0,0 +1,37 @@
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+_V = TypeVar("_V")
+
+
+class SurfaceCache(Generic[_V]):
+    """Bounded least recently used cache for rendered images
+
+    Keys should hold everything the image depends on, e.g. icon name and scale factor, call clear when something
+    outside the key changes like the icon theme.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._items: "OrderedDict[Hashable, _V]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, create: Callable[[], _V]) -> _V:
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            value = self._items[key] = create()
+            if len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        else:
+            self.hits += 1
+            self._items.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -3,7 +3,7 @@
 Filters GUI Elements
 """
 
-from blueman.bluez.Device import Device
+from typing import Any, Mapping
 
 
 allowed_classes = [
@@ -39,15 +39,12 @@ allowed_appearances = [
 ]
 
 
-def get_allowed_device(path: str) -> bool:
-    device = Device(obj_path=path)
-    klass = device["Class"] & 0xfff
-    appearance = device["Appearance"]
-
-    if klass in allowed_classes:
+def is_allowed_device(properties: Mapping[str, Any]) -> bool:
+    """Decide from org.bluez.Device1 properties, devices often lack Class or Appearance"""
+    if properties.get("Class", 0) & 0xfff in allowed_classes:
         return True
 
-    if appearance in allowed_appearances:
+    if properties.get("Appearance", 0) in allowed_appearances:
         return True
 
     return False
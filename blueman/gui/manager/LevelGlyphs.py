@@ -0,0 +1,40 @@
+import os
+from typing import Dict, Tuple
+
+import cairo
+
+from blueman.Constants import PIXMAP_PATH
+
+import gi
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gdk
+from gi.repository import GdkPixbuf
+
+LEVELS = ("battery", "rssi", "tpl")
+BUCKETS = tuple(range(10, 101, 10))
+WIDTH = 14
+HEIGHT = 48
+
+# (level, bucket, scale factor) -> glyph, shared by all device lists
+_surfaces: Dict[Tuple[str, int, int], cairo.ImageSurface] = {}
+
+
+def bucket(percentage: float) -> int:
+    """The glyph bucket for a battery, signal strength or link quality percentage"""
+    return min(max(int(round(percentage, -1)), BUCKETS[0]), BUCKETS[-1])
+
+
+def get_surface(level: str, value: int, scale: int) -> cairo.ImageSurface:
+    """Glyph for a bucket, the first lookup for a scale factor renders the glyphs for all buckets"""
+    key = (level, value, scale)
+    if key not in _surfaces:
+        _render(scale)
+    return _surfaces[key]
+
+
+def _render(scale: int) -> None:
+    for level in LEVELS:
+        for value in BUCKETS:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                os.path.join(PIXMAP_PATH, f"blueman-{level}-{value}.png"), WIDTH * scale, HEIGHT * scale, True)
+            _surfaces[(level, value, scale)] = Gdk.cairo_surface_create_from_pixbuf(pixbuf, scale, None)
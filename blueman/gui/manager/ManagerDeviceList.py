@@ -1,5 +1,5 @@
 from gettext import gettext as _
-from typing import Optional, TYPE_CHECKING, List, Any, cast, Callable, Set, Dict
+from typing import Optional, TYPE_CHECKING, List, Any, cast, Callable, Dict, Tuple, Mapping
 import html
 import logging
 import cairo
@@ -15,20 +15,20 @@ from blueman.gui.DeviceList import DeviceList
 from blueman.DeviceClass import get_minor_class, get_major_class, gatt_appearance_to_name
 from blueman.gui.GenericList import ListDataDict
 from blueman.gui.manager.ManagerDeviceMenu import ManagerDeviceMenu
-from blueman.Constants import PIXMAP_PATH
 from blueman.Functions import launch
 from blueman.Sdp import ServiceUUID, OBEX_OBJPUSH_SVCLASS_ID
 from blueman.gui.GtkAnimation import TreeRowFade, CellFade, AnimBase
-from _blueman import ConnInfoReadError, conn_info
+from blueman.gui.SurfaceCache import SurfaceCache
+from blueman.gui.manager import LevelGlyphs
+from blueman.main.ConnectionQualityPoller import ConnectionQualityPoller, Sample
+from blueman.main.SignalHistory import SignalHistory
 
 import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk
-from gi.repository import GLib
 from gi.repository import GObject
 from gi.repository import Gio
 from gi.repository import Gdk
-from gi.repository import GdkPixbuf
 from gi.repository import Pango
 
 if TYPE_CHECKING:
@@ -54,13 +54,13 @@ class ManagerDeviceList(DeviceList):
             # device caption
             {"id": "caption", "type": str, "renderer": cr,
              "render_attrs": {"markup": 1}, "view_props": {"expand": True}},
-            {"id": "battery_pb", "type": GdkPixbuf.Pixbuf, "renderer": Gtk.CellRendererPixbuf(),
+            {"id": "battery_level", "type": int, "renderer": Gtk.CellRendererPixbuf(),
              "render_attrs": {}, "view_props": {"spacing": 0},
              "celldata_func": (self._set_cell_data, "battery")},
-            {"id": "rssi_pb", "type": GdkPixbuf.Pixbuf, "renderer": Gtk.CellRendererPixbuf(),
+            {"id": "rssi_level", "type": int, "renderer": Gtk.CellRendererPixbuf(),
              "render_attrs": {}, "view_props": {"spacing": 0},
              "celldata_func": (self._set_cell_data, "rssi")},
-            {"id": "tpl_pb", "type": GdkPixbuf.Pixbuf, "renderer": Gtk.CellRendererPixbuf(),
+            {"id": "tpl_level", "type": int, "renderer": Gtk.CellRendererPixbuf(),
              "render_attrs": {}, "view_props": {"spacing": 0},
              "celldata_func": (self._set_cell_data, "tpl")},
             {"id": "alias", "type": str},  # used for quick access instead of device.GetProperties
@@ -74,7 +74,10 @@ class ManagerDeviceList(DeviceList):
             {"id": "cell_fader", "type": CellFade},
             {"id": "row_fader", "type": TreeRowFade},
             {"id": "initial_anim", "type": bool},
-            {"id": "blocked", "type": bool}
+            {"id": "blocked", "type": bool},
+            # derived from the properties when they change, so filtering and searching need neither
+            {"id": "search_key", "type": str},
+            {"id": "device_class", "type": str},
         ]
         super().__init__(adapter, tabledata)
         self.set_name("ManagerDeviceList")
@@ -82,14 +85,26 @@ class ManagerDeviceList(DeviceList):
         self.props.has_tooltip = True
         self.Blueman = inst
 
-        self._monitored_devices: Set[BtAddress] = set()
+        # Devices sampled by the connection quality poller of their adapter
+        self._monitored_devices: Dict[BtAddress, Tuple[ConnectionQualityPoller, Gtk.TreeRowReference]] = {}
+        self.connect("map", self._on_map_changed)
+        self.connect("unmap", self._on_map_changed)
 
         self.manager.connect_signal("battery-created", self.on_battery_created)
         self.manager.connect_signal("battery-removed", self.on_battery_removed)
         self._batteries: Dict[str, Battery] = {}
 
+        # Composed device icons shared between rows
+        self._icon_cache: SurfaceCache[SurfaceObject] = SurfaceCache(64)
+        self.connect("notify::scale-factor", self._on_scale_factor_changed)
+
+        # Unnamed devices of these classes are shown even if unnamed devices are hidden
+        self._unnamed_classes = {_("Keyboard"), _("Combo")}
+        self._search_key: Tuple[str, str] = ("", "")
+
         self.Config = Gio.Settings(schema_id="org.blueman.general")
         self.Config.connect('changed', self._on_settings_changed)
+        self._hide_unnamed: bool = self.Config["hide-unnamed"]
         # Set the correct sorting
         self._on_settings_changed(self.Config, "sort-by")
         self._on_settings_changed(self.Config, "sort-type")
@@ -129,10 +144,18 @@ class ManagerDeviceList(DeviceList):
             if column_id:
                 self.liststore.set_sort_column_id(column_id, sort_type)
 
+        elif key == "hide-unnamed":
+            self._hide_unnamed = settings[key]
+            self.filter.refilter()
+
     def on_icon_theme_changed(self, _icon_them: Gtk.IconTheme) -> None:
-        for row in self.liststore:
-            device = self.get(row.iter, "device")["device"]
-            self.row_setup_event(row.iter, device)
+        self._icon_cache.clear()
+        # Setting up a row can re-sort the model, so collect the rows first
+        for tree_iter, (device,) in list(self.iter_rows("device")):
+            self.row_setup_event(tree_iter, device)
+
+    def _on_scale_factor_changed(self, _widget: Gtk.Widget, _pspec: GObject.ParamSpec) -> None:
+        self.on_icon_theme_changed(self.icon_theme)
 
     def on_battery_created(self, _manager: Manager, obj_path: ObjectPath) -> None:
         if obj_path not in self._batteries:
@@ -145,24 +168,29 @@ class ManagerDeviceList(DeviceList):
             battery = self._batteries.pop(obj_path)
             battery.destroy()
 
+    @staticmethod
+    def make_search_key(display_name: str, description: str, address: BtAddress) -> str:
+        return f"{display_name}\n{description}\n{address}".casefold()
+
     def search_func(self, model: Gtk.TreeModel, column: int, key: str, tree_iter: Gtk.TreeIter) -> bool:
-        row = self.get(tree_iter, "caption")
-        if key.lower() in row["caption"].lower():
+        # The search entry calls us for every row with the same key
+        if self._search_key[0] != key:
+            self._search_key = (key, key.casefold())
+
+        if self._search_key[1] in model.get_value(tree_iter, self.ids["search_key"]):
             return False
-        logging.info(f"{model} {column} {key} {tree_iter}")
         return True
 
-    def filter_func(self, _model: Gtk.TreeModel, tree_iter: Gtk.TreeIter, _data: Any) -> bool:
-        row = self.get(tree_iter, "no_name", "device")
-        device = row["device"]
-        klass = get_minor_class(device["Class"]) if device is not None else None
+    def filter_func(self, model: Gtk.TreeModel, tree_iter: Gtk.TreeIter, _data: Any) -> bool:
+        if not self._hide_unnamed or not model.get_value(tree_iter, self.ids["no_name"]):
+            return True
 
-        if row["no_name"] and self.Config["hide-unnamed"] and klass not in (_("Keyboard"), _("Combo")):
-            logging.info("Hiding unnamed device")
-            return False
-        else:
+        if model.get_value(tree_iter, self.ids["device_class"]) in self._unnamed_classes:
             return True
 
+        logging.info("Hiding unnamed device")
+        return False
+
     def drag_recv(self, _widget: Gtk.Widget, context: Gdk.DragContext, x: int, y: int, selection: Gtk.SelectionData,
                   _info: int, time: int) -> None:
 
@@ -194,7 +222,7 @@ class ManagerDeviceList(DeviceList):
             if not self.selection.path_is_selected(path):
                 tree_iter = self.get_iter(path)
                 assert tree_iter is not None
-                has_obj_push = self._has_objpush(self.get(tree_iter, "device")["device"])
+                has_obj_push = self.get(tree_iter, "objpush")["objpush"]
                 if has_obj_push:
                     Gdk.drag_status(drag_context, Gdk.DragAction.COPY, timestamp)
                     self.set_cursor(path)
@@ -305,6 +333,14 @@ class ManagerDeviceList(DeviceList):
 
         return target
 
+    def _get_device_icon(self, icon_name: str, is_paired: bool, is_connected: bool, is_trusted: bool,
+                         is_blocked: bool) -> SurfaceObject:
+        # Only the connection emblem ends up in the image
+        emblem = "connected" if is_connected else "disconnected" if is_paired else None
+        key = (icon_name, self.get_scale_factor(), emblem)
+        return self._icon_cache.get(key, lambda: SurfaceObject(
+            self._make_device_icon(icon_name, is_paired, is_connected, is_trusted, is_blocked)))
+
     def device_remove_event(self, object_path: ObjectPath) -> None:
         tree_iter = self.find_device_by_path(object_path)
         
@@ -318,7 +354,15 @@ class ManagerDeviceList(DeviceList):
             row_fader.animate(start=row_fader.get_state(), end=0.0, duration=400)
 
     def __fader_finished(self, object_path: ObjectPath) -> None:
+        address = self._path_to_address.get(object_path)
         super().device_remove_event(object_path)
+        if address is not None:
+            SignalHistory.forget(address)
+
+    def clear(self) -> None:
+        for address in self.address_to_row:
+            SignalHistory.forget(address)
+        super().clear()
 
     @staticmethod
     def make_caption(name: str, klass: str, address: BtAddress) -> str:
@@ -340,6 +384,29 @@ class ManagerDeviceList(DeviceList):
         else:
             return get_major_class(device['Class'])
 
+    @staticmethod
+    def get_device_description(properties: Mapping[str, Any]) -> str:
+        klass = get_minor_class(properties['Class'])
+        # Bluetooth >= 4 devices use Appearance property
+        appearance = properties["Appearance"]
+        if klass != _("Uncategorized") and klass != _("Unknown"):
+            return klass
+        elif klass == _("Unknown") and appearance:
+            return gatt_appearance_to_name(appearance)
+        else:
+            return get_major_class(properties['Class'])
+
+    def _get_name_columns(self, properties: Mapping[str, Any]) -> Dict[str, Any]:
+        display_name = self.make_display_name(properties["Alias"].strip(), properties["Class"],
+                                              properties["Address"])
+        description = self.get_device_description(properties)
+        return {
+            "caption": self.make_caption(display_name, description, properties["Address"]),
+            "alias": display_name,
+            "search_key": self.make_search_key(display_name, description, properties["Address"]),
+            "device_class": get_minor_class(properties["Class"]),
+        }
+
     def row_setup_event(self, tree_iter: Gtk.TreeIter, device: Device) -> None:
         if not self.get(tree_iter, "initial_anim")["initial_anim"]:
             assert self.liststore is not None
@@ -355,48 +422,25 @@ class ManagerDeviceList(DeviceList):
                 cell_fader.freeze()
 
                 if result is not None:
-                    self._prepare_fader(row_fader).animate(start=0.0, end=1.0, duration=500)
+                    # Rows added in a batch simply show up, fading in thousands of rows is no use
+                    if not self.is_batching():
+                        self._prepare_fader(row_fader).animate(start=0.0, end=1.0, duration=500)
                     self.set(tree_iter, initial_anim=True)
                 else:
                     self.set(tree_iter, initial_anim=False)
 
-        has_objpush = self._has_objpush(device)
-        klass = get_minor_class(device['Class'])
-        # Bluetooth >= 4 devices use Appearance property
-        appearance = device["Appearance"]
-        if klass != _("Uncategorized") and klass != _("Unknown"):
-            description = klass
-        elif klass == _("Unknown") and appearance:
-            description = gatt_appearance_to_name(appearance)
-        else:
-            description = get_major_class(device['Class'])
-
-        surface = self._make_device_icon(device["Icon"], device["Paired"], device["Connected"], device["Trusted"],
-                                         device["Blocked"])
-        surface_object = SurfaceObject(surface)
-        display_name = self.make_display_name(device.display_name, device["Class"], device['Address'])
-        caption = self.make_caption(display_name, description, device['Address'])
-
-        self.set(tree_iter, caption=caption, alias=display_name, objpush=has_objpush, device_surface=surface_object)
-
-        try:
-            self.row_update_event(tree_iter, "Trusted", device['Trusted'])
-        except Exception as e:
-            logging.exception(e)
-        try:
-            self.row_update_event(tree_iter, "Paired", device['Paired'])
-        except Exception as e:
-            logging.exception(e)
-        try:
-            self.row_update_event(tree_iter, "Connected", device["Connected"])
-        except Exception as e:
-            logging.exception(e)
-        try:
-            self.row_update_event(tree_iter, "Blocked", device["Blocked"])
-        except Exception as e:
-            logging.exception(e)
+        # All columns from one snapshot of the cached properties
+        properties = device.get_properties()
+        surface_object = self._get_device_icon(properties["Icon"], properties["Paired"], properties["Connected"],
+                                               properties["Trusted"], properties["Blocked"])
+        self.set(tree_iter, objpush=self._has_objpush(properties), device_surface=surface_object,
+                 trusted=properties["Trusted"], paired=properties["Paired"], connected=properties["Connected"],
+                 blocked=properties["Blocked"], **self._get_name_columns(properties))
 
-        if device["Connected"]:
+        if properties.get("RSSI") is not None:
+            SignalHistory.for_device(properties["Address"]).discovery_rssi.append(properties["RSSI"])
+
+        if properties["Connected"]:
             self._monitor_power_levels(tree_iter, device)
 
     def _monitor_power_levels(self, tree_iter: Gtk.TreeIter, device: Device) -> None:
@@ -404,24 +448,23 @@ class ManagerDeviceList(DeviceList):
             return
 
         assert self.Adapter is not None
-        cinfo = conn_info(device["Address"], os.path.basename(self.Adapter.get_object_path()))
-        try:
-            cinfo.init()
-        except ConnInfoReadError:
-            logging.warning("Failed to get power levels, probably a LE device.")
+        poller = ConnectionQualityPoller.for_adapter(os.path.basename(self.Adapter.get_object_path()))
+        poller.set_visible(self.get_mapped())
 
         model = self.liststore
         assert isinstance(model, Gtk.TreeModel)
         r = Gtk.TreeRowReference.new(model, model.get_path(tree_iter))
-        self._update_power_levels(tree_iter, device, cinfo)
-        GLib.timeout_add(1000, self._check_power_levels, r, cinfo, device["Address"])
-        self._monitored_devices.add(device["Address"])
-
-    def _check_power_levels(self, row_ref: Gtk.TreeRowReference, cinfo: conn_info, address: BtAddress) -> bool:
+        self._monitored_devices[device["Address"]] = (poller, r)
+        sample = poller.subscribe(device["Address"], self._check_power_levels)
+        # Without a sample the bars stay as they are until the first poll
+        if sample is not None:
+            self._update_power_levels(tree_iter, device, sample)
+
+    def _check_power_levels(self, address: BtAddress, sample: Sample) -> bool:
+        _poller, row_ref = self._monitored_devices[address]
         if not row_ref.valid():
             logging.warning("stopping monitor (row does not exist)")
-            cinfo.deinit()
-            self._monitored_devices.remove(address)
+            del self._monitored_devices[address]
             return False
 
         tree_iter = self.get_iter(row_ref.get_path())
@@ -430,72 +473,69 @@ class ManagerDeviceList(DeviceList):
         device = self.get(tree_iter, "device")["device"]
 
         if device["Connected"]:
-            self._update_power_levels(tree_iter, device, cinfo)
+            self._update_power_levels(tree_iter, device, sample)
             return True
         else:
-            cinfo.deinit()
             self._disable_power_levels(tree_iter)
-            self._monitored_devices.remove(address)
+            del self._monitored_devices[address]
             return False
 
+    def _on_map_changed(self, _widget: Gtk.Widget) -> None:
+        for poller, _row_ref in self._monitored_devices.values():
+            poller.set_visible(self.get_mapped())
+
     def row_update_event(self, tree_iter: Gtk.TreeIter, key: str, value: Any) -> None:
         logging.info(f"{key} {value}")
 
-        device = self.get(tree_iter, "device")["device"]
+        row = self.get(tree_iter, "device", "device_surface")
+        device = row["device"]
+        properties = device.get_properties()
+        columns: Dict[str, Any] = {}
 
         if key in ("Blocked", "Connected", "Paired", "Trusted"):
-            surface = self._make_device_icon(device["Icon"], device["Paired"], device["Connected"], device["Trusted"],
-                                             device["Blocked"])
-            self.set(tree_iter, device_surface=SurfaceObject(surface))
+            surface_object = self._get_device_icon(properties["Icon"], properties["Paired"], properties["Connected"],
+                                                   properties["Trusted"], properties["Blocked"])
+            if row["device_surface"] is not surface_object:
+                columns["device_surface"] = surface_object
 
         if key == "Trusted":
-            if value:
-                self.set(tree_iter, trusted=True)
-            else:
-                self.set(tree_iter, trusted=False)
+            columns["trusted"] = bool(value)
 
         elif key == "Paired":
-            if value:
-                self.set(tree_iter, paired=True)
-            else:
-                self.set(tree_iter, paired=False)
-
-        elif key == "Alias":
-            klass = get_minor_class(device['Class'])
-            # Bluetooth >= 4 devices use Appearance property
-            appearance = device["Appearance"]
-            if klass != _("Uncategorized") and klass != _("Unknown"):
-                description = klass
-            elif klass == _("Unknown") and appearance:
-                description = gatt_appearance_to_name(appearance)
-            else:
-                description = get_major_class(device['Class'])
-                
-            c = self.make_caption(value, description, device['Address'])
-            name = self.make_display_name(device.display_name, device["Class"], device["Address"])
-            self.set(tree_iter, caption=c, alias=name)
+            columns["paired"] = bool(value)
+
+        elif key in ("Alias", "Class", "Appearance"):
+            columns.update(self._get_name_columns(properties))
 
         elif key == "UUIDs":
-            has_objpush = self._has_objpush(device)
-            self.set(tree_iter, objpush=has_objpush)
+            columns["objpush"] = self._has_objpush(properties)
 
         elif key == "Connected":
-            self.set(tree_iter, connected=value)
+            columns["connected"] = value
+
+        elif key == "Name":
+            columns["no_name"] = False
 
+        elif key == "Blocked":
+            columns["blocked"] = value
+
+        elif key == "RSSI" and value is not None:
+            SignalHistory.for_device(properties["Address"]).discovery_rssi.append(value)
+
+        if columns:
+            self.set(tree_iter, **columns)
+
+        if key == "Connected":
             if value:
                 self._monitor_power_levels(tree_iter, device)
             else:
                 self._disable_power_levels(tree_iter)
 
         elif key == "Name":
-            self.set(tree_iter, no_name=False)
             self.filter.refilter()
 
-        elif key == "Blocked":
-            self.set(tree_iter, blocked=value)
-
-    def _update_power_levels(self, tree_iter: Gtk.TreeIter, device: Device, cinfo: conn_info) -> None:
-        row = self.get(tree_iter, "cell_fader", "battery", "rssi", "lq", "tpl")
+    def _update_power_levels(self, tree_iter: Gtk.TreeIter, device: Device, sample: Sample) -> None:
+        row = self.get(tree_iter, "cell_fader", "battery", "rssi", "tpl", "battery_level", "rssi_level", "tpl_level")
 
         bars = {}
 
@@ -503,31 +543,21 @@ class ManagerDeviceList(DeviceList):
         if obj_path in self._batteries:
             bars["battery"] = self._batteries[obj_path]["Percentage"]
 
-        # cinfo init may fail for bluetooth devices version 4 and up
+        # The adapter may not list a connection for the device, e.g. while it is being set up
         # FIXME Workaround is horrible and we should show something better
-        if cinfo.failed:
+        if sample.failed:
             bars.update({"rssi": 100.0, "tpl": 100.0})
         else:
-            try:
-                bars["rssi"] = max(50 + float(cinfo.get_rssi()) / 127 * 50, 10)
-            except ConnInfoReadError:
-                bars["rssi"] = 50
-            try:
-                bars["tpl"] = max(50 + float(cinfo.get_tpl()) / 127 * 50, 10)
-            except ConnInfoReadError:
-                bars["tpl"] = 50
+            bars["rssi"] = 50 if sample.rssi is None else max(50 + float(sample.rssi) / 127 * 50, 10)
+            bars["tpl"] = 50 if sample.tpl is None else max(50 + float(sample.tpl) / 127 * 50, 10)
 
         if row["battery"] == row["rssi"] == row["tpl"] == 0:
             self._prepare_fader(row["cell_fader"]).animate(start=0.0, end=1.0, duration=400)
 
-        w = 14 * self.get_scale_factor()
-        h = 48 * self.get_scale_factor()
-
         for (name, perc) in bars.items():
-            if round(row[name], -1) != round(perc, -1):
-                icon_name = f"blueman-{name}-{int(round(perc, -1))}.png"
-                icon = GdkPixbuf.Pixbuf.new_from_file_at_scale(os.path.join(PIXMAP_PATH, icon_name), w, h, True)
-                self.set(tree_iter, **{name: perc, f"{name}_pb": icon})
+            level = LevelGlyphs.bucket(perc)
+            if row[f"{name}_level"] != level:
+                self.set(tree_iter, **{name: perc, f"{name}_level": level})
 
     def _disable_power_levels(self, tree_iter: Gtk.TreeIter) -> None:
         row = self.get(tree_iter, "cell_fader", "battery", "rssi", "tpl")
@@ -535,8 +565,8 @@ class ManagerDeviceList(DeviceList):
             return
 
         self.set(tree_iter, battery=0, rssi=0, tpl=0)
-        self._prepare_fader(row["cell_fader"], lambda: self.set(tree_iter, battery_pb=None, rssi_pb=None,
-                                                                tpl_pb=None)).animate(start=1.0, end=0.0, duration=400)
+        self._prepare_fader(row["cell_fader"], lambda: self.set(tree_iter, battery_level=0, rssi_level=0,
+                                                                tpl_level=0)).animate(start=1.0, end=0.0, duration=400)
 
     def _prepare_fader(self, fader: AnimBase, callback: Optional[Callable[[], None]] = None) -> AnimBase:
         def on_finished(finished_fader: AnimBase) -> None:
@@ -580,24 +610,22 @@ class ManagerDeviceList(DeviceList):
             self.tooltip_col = path[1]
             return True
 
-        elif path[1] == self.columns["battery_pb"] \
-                or path[1] == self.columns["tpl_pb"] \
-                or path[1] == self.columns["rssi_pb"]:
+        elif path[1] == self.columns["battery_level"] \
+                or path[1] == self.columns["tpl_level"] \
+                or path[1] == self.columns["rssi_level"]:
             tree_iter = self.get_iter(path[0])
             assert tree_iter is not None
 
-            dt = self.get(tree_iter, "connected")["connected"]
+            dt, battery, rssi, tpl, device = self.get_values(tree_iter, "connected", "battery", "rssi", "tpl", "device")
             if not dt:
                 return False
 
-            lines = [_("<b>Connected</b>")]
+            history = SignalHistory.get(device["Address"])
 
-            battery = self.get(tree_iter, "battery")["battery"]
-            rssi = self.get(tree_iter, "rssi")["rssi"]
-            tpl = self.get(tree_iter, "tpl")["tpl"]
+            lines = [_("<b>Connected</b>")]
 
             if battery != 0:
-                if path[1] == self.columns["battery_pb"]:
+                if path[1] == self.columns["battery_level"]:
                     lines.append(f"<b>Battery: {int(battery)}%</b>")
                 else:
                     lines.append(f"Battery: {int(battery)}%")
@@ -614,13 +642,17 @@ class ManagerDeviceList(DeviceList):
                 else:
                     rssi_state = _("Very Strong")
 
-                if path[1] == self.columns["rssi_pb"]:
+                if path[1] == self.columns["rssi_level"]:
                     lines.append(_("<b>Received Signal Strength: %(rssi)u%%</b> <i>(%(rssi_state)s)</i>") %
                                  {"rssi": rssi, "rssi_state": rssi_state})
                 else:
                     lines.append(_("Received Signal Strength: %(rssi)u%% <i>(%(rssi_state)s)</i>") %
                                  {"rssi": rssi, "rssi_state": rssi_state})
 
+                summary = None if history is None else history.rssi.summary()
+                if path[1] == self.columns["rssi_level"] and summary is not None:
+                    lines.append(f"<small>{html.escape(summary.describe('dB'))}</small>")
+
             if tpl != 0:
                 if tpl < 30:
                     tpl_state = _("Very Low")
@@ -633,24 +665,25 @@ class ManagerDeviceList(DeviceList):
                 else:
                     tpl_state = _("Very High")
 
-                if path[1] == self.columns["tpl_pb"]:
+                if path[1] == self.columns["tpl_level"]:
                     lines.append(_("<b>Transmit Power Level: %(tpl)u%%</b> <i>(%(tpl_state)s)</i>") %
                                  {"tpl": tpl, "tpl_state": tpl_state})
                 else:
                     lines.append(_("Transmit Power Level: %(tpl)u%% <i>(%(tpl_state)s)</i>") %
                                  {"tpl": tpl, "tpl_state": tpl_state})
 
+                summary = None if history is None else history.tpl.summary()
+                if path[1] == self.columns["tpl_level"] and summary is not None:
+                    lines.append(f"<small>{html.escape(summary.describe('dBm'))}</small>")
+
             tooltip.set_markup("\n".join(lines))
             self.tooltip_row = path[0]
             self.tooltip_col = path[1]
             return True
         return False
 
-    def _has_objpush(self, device: Device) -> bool:
-        if device is None:
-            return False
-
-        for uuid in device["UUIDs"]:
+    def _has_objpush(self, properties: Mapping[str, Any]) -> bool:
+        for uuid in properties.get("UUIDs", []):
             if ServiceUUID(uuid).short_uuid == OBEX_OBJPUSH_SVCLASS_ID:
                 return True
         return False
@@ -659,14 +692,10 @@ class ManagerDeviceList(DeviceList):
                        tree_iter: Gtk.TreeIter, data: Optional[str]) -> None:
         tree_iter = model.convert_iter_to_child_iter(tree_iter)
         if data is None:
-            row = self.get(tree_iter, "device_surface")
-            cell.set_property("surface", row["device_surface"].surface)
+            cell.set_property("surface", self.get_value(tree_iter, "device_surface").surface)
         else:
-            window = self.get_window()
-            scale = self.get_scale_factor()
-            pb = self.get(tree_iter, data + "_pb")[data + "_pb"]
-            if pb:
-                surface = Gdk.cairo_surface_create_from_pixbuf(pb, scale, window)
-                cell.set_property("surface", surface)
+            level = self.get_value(tree_iter, data + "_level")
+            if level:
+                cell.set_property("surface", LevelGlyphs.get_surface(data, level, self.get_scale_factor()))
             else:
                 cell.set_property("surface", None)
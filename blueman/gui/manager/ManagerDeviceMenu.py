@@ -76,10 +76,10 @@ class ManagerDeviceMenu(Gtk.Menu):
                                                                          self.on_device_property_changed)
         ManagerDeviceMenu.__instances__.append(self)
 
-        self._any_network = AnyNetwork()
+        self._any_network = AnyNetwork(properties=("Connected",))
         self._any_network.connect_signal('property-changed', self._on_service_property_changed)
 
-        self._any_device = AnyDevice()
+        self._any_device = AnyDevice(properties=("Connected",))
         self._any_device.connect_signal('property-changed', self._on_service_property_changed)
 
         try:
@@ -1,12 +1,17 @@
-from typing import TYPE_CHECKING, Optional
+import logging
+import time
+from typing import TYPE_CHECKING, List, Optional
 
-from _blueman import device_info
+from _blueman import HciCountersReadError, hci_counters
 from gi.repository import GLib
+from gi.repository import Gdk
 from gi.repository import Gtk
 
 from blueman.gui.Animation import Animation
 from blueman.gui.manager.ManagerDeviceList import ManagerDeviceList
-from blueman.main.SpeedCalc import SpeedCalc
+from blueman.main.DBusProxies import AppletService, DBusProxyFailed
+from blueman.main.RateEstimator import RateEstimator
+from blueman.main.TrafficHistory import Record
 from blueman.Functions import adapter_path_to_name
 from blueman.Functions import format_bytes
 
@@ -32,9 +37,12 @@ class ManagerStats:
         )
 
         self.time = None
+        self.timer: Optional[int] = None
+        self._counters: Optional[hci_counters] = None
+        self._iconified = False
 
-        self.up_speed = SpeedCalc()
-        self.down_speed = SpeedCalc()
+        self.up_speed = RateEstimator()
+        self.down_speed = RateEstimator()
 
         self.im_upload = blueman.builder.get_widget("im_upload", Gtk.Image)
         self.im_download = blueman.builder.get_widget("im_download", Gtk.Image)
@@ -48,17 +56,56 @@ class ManagerStats:
         self.up_blinker = Animation(self.im_upload, ["blueman-up-inactive", "blueman-up-active"])
         self.down_blinker = Animation(self.im_download, ["blueman-down-inactive", "blueman-down-active"])
 
-        self.start_update()
+        # Only poll the counters while they can be seen
+        self.hbox.connect("map", lambda _hbox: self._update_polling())
+        self.hbox.connect("unmap", lambda _hbox: self._update_polling())
+        if blueman.window is not None:
+            blueman.window.connect("window-state-event", self._on_window_state_event)
+
+        self._update_polling()
 
     def on_adapter_changed(self, _lst: ManagerDeviceList, adapter_path: Optional[str]) -> None:
         self.hci = adapter_path_to_name(adapter_path)
+        if self._counters is not None:
+            self._counters.close()
         if self.hci is None:
+            self._counters = None
             self.hbox.props.sensitive = False
         else:
+            self._counters = hci_counters(self.hci)
             self.hbox.props.sensitive = True
 
         self.up_speed.reset()
         self.down_speed.reset()
+        if adapter_path is not None:
+            self._load_history(adapter_path)
+
+    def _load_history(self, adapter_path: str) -> None:
+        # Start from the recent rates the applet recorded instead of zero
+        def on_history(_applet: AppletService, history: List[Record], _user_data: None) -> None:
+            if adapter_path_to_name(adapter_path) != self.hci:
+                return
+
+            # Replace what got sampled until the reply came, the next update continues from the history
+            self.up_speed.reset()
+            self.down_speed.reset()
+            # The estimators run on the monotonic clock
+            offset = time.monotonic() - time.time()
+            for timestamp, byte_rx, byte_tx in history:
+                self.up_speed.update(byte_tx, now=timestamp + offset)
+                self.down_speed.update(byte_rx, now=timestamp + offset)
+
+        def on_error(_applet: Optional[AppletService], error: GLib.Error, _user_data: None) -> None:
+            logging.debug(f"No traffic history for {adapter_path}: {error}")
+
+        try:
+            applet = AppletService()
+        except DBusProxyFailed:
+            return
+
+        now = time.time()
+        applet.GetTrafficHistory('(odd)', adapter_path, now - 60, now, result_handler=on_history,
+                                 error_handler=on_error)
 
     def set_blinker_by_speed(self, blinker: Animation, speed: float) -> None:
 
@@ -80,17 +127,29 @@ class ManagerStats:
         else:
             blinker.set_rate(1)
 
+    def _on_window_state_event(self, _window: Gtk.Window, event: Gdk.EventWindowState) -> bool:
+        self._iconified = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+        self._update_polling()
+        return False
+
+    def _update_polling(self) -> None:
+        if self.hbox.get_mapped() and not self._iconified:
+            self.start_update()
+        else:
+            self.stop_update()
+
     def _update(self) -> bool:
-        if self.hci is not None:
-            devinfo = device_info(self.hci)
-            _tx = devinfo["stat"]["byte_tx"]
-            _rx = devinfo["stat"]["byte_rx"]
+        if self._counters is not None:
+            try:
+                _rx, _tx, _rx_packets, _tx_packets = self._counters.read()
+            except HciCountersReadError:
+                return True
 
             tx, s_tx = format_bytes(_tx)
             rx, s_rx = format_bytes(_rx)
 
-            _u_speed = self.up_speed.calc(_tx)
-            _d_speed = self.down_speed.calc(_rx)
+            _u_speed = self.up_speed.update(_tx)
+            _d_speed = self.down_speed.update(_rx)
 
             self.set_blinker_by_speed(self.up_blinker, _u_speed)
             self.set_blinker_by_speed(self.down_blinker, _d_speed)
@@ -103,12 +162,15 @@ class ManagerStats:
         return True
 
     def start_update(self) -> None:
+        if self.timer is not None:
+            return
         self._update()
         self.timer = GLib.timeout_add(1000, self._update)
 
     def stop_update(self) -> None:
-        if self.timer:
+        if self.timer is not None:
             GLib.source_remove(self.timer)
+            self.timer = None
 
     def set_data(self, uploaded: float, u_name: str, downloaded: float, d_name: str, u_speed: float, us_name: str,
                  d_speed: float, ds_name: str) -> None:
@@ -19,7 +19,7 @@ class BatteryWatcher:
             )
         )
 
-        any_battery = AnyBattery()
+        any_battery = AnyBattery(properties=("Percentage",))
         weakref.finalize(
             self,
             any_battery.disconnect_signal,
@@ -0,0 +1,133 @@
+import logging
+from typing import Dict, List, Optional, Callable, NamedTuple
+
+from gi.repository import GLib
+
+from blueman.bluemantyping import BtAddress
+from blueman.main.SignalHistory import SignalHistory
+from _blueman import ConnInfoReadError, conn_quality
+
+
+class Sample(NamedTuple):
+    # None if reading the value failed
+    rssi: Optional[int]
+    tpl: Optional[int]
+    # The adapter has no connection to the device
+    failed: bool = False
+    link_quality: Optional[int] = None
+
+
+# Return False to unsubscribe
+SampleCallback = Callable[[BtAddress, Sample], bool]
+
+
+class ConnectionQualityPoller:
+    """Samples signal strength, transmit power level and link quality of the connected devices on one adapter
+
+    All subscribed devices are sampled from a single timer, with one read of all connections of the adapter. The
+    HCI socket stays open until the last subscriber is gone. The samples are also added to the SignalHistory of the
+    device.
+    """
+
+    VISIBLE_INTERVAL = 1000
+    HIDDEN_INTERVAL = 10000
+
+    _pollers: Dict[str, "ConnectionQualityPoller"] = {}
+
+    @classmethod
+    def for_adapter(cls, adapter_name: str) -> "ConnectionQualityPoller":
+        poller = cls._pollers.get(adapter_name)
+        if poller is None:
+            poller = cls._pollers[adapter_name] = cls(adapter_name)
+        return poller
+
+    def __init__(self, adapter_name: str) -> None:
+        self._adapter_name = adapter_name
+        self._devices: Dict[BtAddress, List[SampleCallback]] = {}
+        # The samples of the last poll
+        self._samples: Dict[BtAddress, Sample] = {}
+        self._reader: Optional[conn_quality] = None
+        self._visible = True
+        self._source: Optional[int] = None
+
+    def subscribe(self, address: BtAddress, callback: SampleCallback) -> Optional[Sample]:
+        """Get callback called with a sample every interval
+
+        The sample of the last poll is returned right away, None if the device has not been polled yet.
+        """
+        self._devices.setdefault(address, []).append(callback)
+        self._schedule()
+        return self._samples.get(address)
+
+    def unsubscribe(self, address: BtAddress, callback: SampleCallback) -> None:
+        if address not in self._devices:
+            return
+
+        callbacks = self._devices[address]
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            del self._devices[address]
+            self._samples.pop(address, None)
+        if not self._devices and self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def is_subscribed(self, address: BtAddress) -> bool:
+        return address in self._devices
+
+    def set_visible(self, visible: bool) -> None:
+        """Sample less often while nobody can see the values"""
+        if visible == self._visible:
+            return
+
+        self._visible = visible
+        if self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._source is None and self._devices:
+            interval = self.VISIBLE_INTERVAL if self._visible else self.HIDDEN_INTERVAL
+            self._source = GLib.timeout_add(interval, self._poll)
+
+    def _read(self) -> Dict[BtAddress, Sample]:
+        if self._reader is None:
+            self._reader = conn_quality(self._adapter_name)
+
+        try:
+            connections = self._reader.read()
+        except ConnInfoReadError:
+            logging.warning("Failed to read the connection quality", exc_info=True)
+            return {}
+
+        samples = {}
+        for address, _link_type, rssi, tpl, link_quality in connections:
+            bt_address = BtAddress(address)
+            if bt_address not in self._devices:
+                continue
+
+            samples[bt_address] = Sample(rssi, tpl, link_quality=link_quality)
+            history = SignalHistory.for_device(bt_address)
+            if rssi is not None:
+                history.rssi.append(rssi)
+            if tpl is not None:
+                history.tpl.append(tpl)
+            if link_quality is not None:
+                history.link_quality.append(link_quality)
+        return samples
+
+    def _poll(self) -> bool:
+        read = self._read()
+        self._samples = {address: read.get(address, Sample(None, None, failed=True)) for address in self._devices}
+        for address, callbacks in list(self._devices.items()):
+            sample = self._samples[address]
+            for callback in list(callbacks):
+                if not callback(address, sample):
+                    self.unsubscribe(address, callback)
+
+        if not self._devices:
+            self._source = None
+            return False
+        return True
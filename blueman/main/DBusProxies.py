@@ -1,8 +1,11 @@
 from gettext import gettext as _
 import logging
 
+from typing import Optional, Callable, Any
+
 from gi.repository import Gio, GLib
 
+from blueman.bluez import stats
 from blueman.gobject import SingletonGObjectMeta
 from blueman.gui.Notification import Notification
 
@@ -32,6 +35,33 @@ class ProxyBase(Gio.DBusProxy, metaclass=SingletonGObjectMeta):
         except GLib.Error as e:
             raise DBusProxyFailed(e.message)
 
+    def call_sync(self, method_name: str, parameters: Optional[GLib.Variant], flags: Gio.DBusCallFlags,
+                  timeout_msec: int, cancellable: Optional[Gio.Cancellable] = None) -> GLib.Variant:
+        # Also used by the method call shortcuts of PyGObject, e.g. proxy.GetBluetoothStatus()
+        started = stats.start()
+        try:
+            result = super().call_sync(method_name, parameters, flags, timeout_msec, cancellable)
+        except GLib.Error:
+            stats.record_call(self.get_interface_name(), method_name, started, blocking=True, error=True)
+            raise
+        stats.record_call(self.get_interface_name(), method_name, started, blocking=True)
+        return result
+
+    def call(self, method_name: str, parameters: Optional[GLib.Variant], flags: Gio.DBusCallFlags,
+             timeout_msec: int, cancellable: Optional[Gio.Cancellable] = None,
+             callback: Optional[Callable[..., None]] = None, *user_data: Any) -> None:
+        if callback is None or not stats.enabled():
+            super().call(method_name, parameters, flags, timeout_msec, cancellable, callback, *user_data)
+            return
+
+        started = stats.start()
+
+        def on_finished(proxy: ProxyBase, result: Gio.AsyncResult, *data: Any) -> None:
+            stats.record_call(self.get_interface_name(), method_name, started)
+            callback(proxy, result, *data)
+
+        super().call(method_name, parameters, flags, timeout_msec, cancellable, on_finished, *user_data)
+
     def call_method(self, name: str, params: GLib.Variant) -> None:
         def call_finish(proxy: ProxyBase, response: Gio.AsyncResult) -> None:
             try:
@@ -111,10 +111,23 @@ class Blueman(Gtk.Application):
                 # FIXME ui can handle BlueZ start/stop but we should inform user
                 self.quit()
 
+            def on_manager_ready(manager: Manager) -> None:
+                # Adapters are announced in the order BlueZ reports them, switch to the configured one
+                last_adapter = adapter_path_to_name(self.Config["last-adapter"])
+                if last_adapter is None or adapter_path_to_name(self.List.get_adapter_path()) == last_adapter:
+                    return
+
+                if any(adapter_path_to_name(adapter.get_object_path()) == last_adapter
+                       for adapter in manager.get_adapters()):
+                    self.List.set_adapter(last_adapter)
+
             def on_dbus_name_appeared(_connection: Gio.DBusConnection, name: str, owner: str) -> None:
                 logging.info(f"{name} {owner}")
                 setup_icon_path()
 
+                # Let the window draw while the devices BlueZ knows about stream in
+                manager = Manager.create_async()
+
                 try:
                     self.Applet = AppletService()
                     self.Applet.connect('g-signal', on_applet_signal)
@@ -138,6 +151,10 @@ class Blueman(Gtk.Application):
                     self.List.populate_devices()
 
                 self.List.connect("adapter-changed", self.on_adapter_changed)
+                if manager.is_ready():
+                    on_manager_ready(manager)
+                else:
+                    manager.connect_signal("ready", on_manager_ready)
 
                 self.Config.bind("show-toolbar", toolbar, "visible", Gio.SettingsBindFlags.DEFAULT)
                 self.Config.bind("show-statusbar", statusbar, "visible", Gio.SettingsBindFlags.DEFAULT)
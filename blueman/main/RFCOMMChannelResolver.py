@@ -0,0 +1,82 @@
+import logging
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from _blueman import get_rfcomm_channel
+from gi.repository import GLib
+
+from blueman.bluemantyping import BtAddress
+from blueman.bluez.Device import Device
+
+# None if there is no channel for the service
+ChannelCallback = Callable[[Optional[int]], None]
+
+
+class _Entry(NamedTuple):
+    channel: int
+    # The proxy the invalidation handler is connected to
+    device: Device
+    handler: int
+
+
+class RFCOMMChannelResolver:
+    """Looks up the RFCOMM channel of a service with SDP on a worker thread
+
+    Results are handed to the callback on the main loop and cached per device and service class until the UUIDs or
+    the connection state of the device change, so connecting again to a known device needs no SDP query.
+    """
+
+    _cache: Dict[Tuple[BtAddress, int], _Entry] = {}
+    # Callbacks waiting for a running query
+    _pending: Dict[Tuple[BtAddress, int], List[ChannelCallback]] = {}
+
+    @classmethod
+    def resolve(cls, device: Device, service_class: int, callback: ChannelCallback) -> None:
+        address = device["Address"]
+        key = (address, service_class)
+
+        entry = cls._cache.get(key)
+        if entry is not None and entry.device is device:
+            callback(entry.channel)
+            return
+        if entry is not None:
+            # The proxy got replaced, the device went away in the meantime
+            cls.invalidate(address)
+
+        if key in cls._pending:
+            cls._pending[key].append(callback)
+            return
+        cls._pending[key] = [callback]
+
+        def query() -> None:
+            channel = None
+            try:
+                channel = get_rfcomm_channel(service_class, address)
+            finally:
+                # Waiting callbacks get None if the query failed
+                GLib.idle_add(lambda: cls._on_resolved(device, key, channel))
+
+        threading.Thread(target=query, name=f"sdp-{address}", daemon=True).start()
+
+    @classmethod
+    def _on_resolved(cls, device: Device, key: Tuple[BtAddress, int], channel: Optional[int]) -> bool:
+        if channel:
+            handler = device.connect_signal("property-changed", cls._on_property_changed)
+            cls._cache[key] = _Entry(channel, device, handler)
+        else:
+            logging.info(f"No RFCOMM channel for 0x{key[1]:04x} on {key[0]}")
+
+        for callback in cls._pending.pop(key, []):
+            callback(channel or None)
+        return False
+
+    @classmethod
+    def _on_property_changed(cls, device: Device, key: str, _value: object, _path: str) -> None:
+        if key in ("UUIDs", "Connected"):
+            cls.invalidate(device["Address"])
+
+    @classmethod
+    def invalidate(cls, address: BtAddress) -> None:
+        for key in [key for key in cls._cache if key[0] == address]:
+            entry = cls._cache.pop(key)
+            entry.device.disconnect_signal(entry.handler)
@@ -0,0 +1,64 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+
+class RateEstimator:
+    """Rate of a growing counter like bytes transferred, over a sliding time window
+
+    Samples older than window seconds are dropped from a bounded ring buffer, so an update costs constant time. The
+    rate over the window is smoothed with an exponentially weighted moving average, smoothing being the weight of
+    the previous value, to keep the rate and ETAs from jumping around with bursty updates. A counter that stays put
+    for the whole window has a rate of exactly zero.
+    """
+
+    def __init__(self, window: float = 3.0, smoothing: float = 0.5, max_samples: int = 64,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if not 0 <= smoothing < 1:
+            raise ValueError("smoothing has to be in [0, 1)")
+
+        self.window = window
+        self.smoothing = smoothing
+        self._clock = clock
+        # (timestamp, counter value)
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._rate = 0.0
+
+    def update(self, total: float, now: Optional[float] = None) -> float:
+        """Add the current counter value and get the smoothed rate in units per second"""
+        if now is None:
+            now = self._clock()
+
+        # The counter got reset, e.g. by a new transfer
+        if self._samples and total < self._samples[-1][1]:
+            self.reset()
+
+        self._samples.append((now, total))
+        # Keep one sample at or before the start of the window to measure from
+        while len(self._samples) > 2 and self._samples[1][0] <= now - self.window:
+            self._samples.popleft()
+
+        first_time, first_total = self._samples[0]
+        if now <= first_time:
+            return self._rate
+
+        rate = (total - first_total) / (now - first_time)
+        if rate == 0 or self._rate == 0:
+            self._rate = rate
+        else:
+            self._rate = self.smoothing * self._rate + (1 - self.smoothing) * rate
+        return self._rate
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def eta(self, remaining: float) -> Optional[float]:
+        """Seconds until remaining more units are done at the current rate, None while nothing moves"""
+        if self._rate <= 0:
+            return None
+        return remaining / self._rate
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._rate = 0.0
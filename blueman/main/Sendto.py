@@ -14,7 +14,7 @@ from blueman.bluez.obex.Manager import Manager
 from blueman.bluez.obex.Client import Client
 from blueman.bluez.obex.Transfer import Transfer
 from blueman.Functions import format_bytes, log_system_info
-from blueman.main.SpeedCalc import SpeedCalc
+from blueman.main.RateEstimator import RateEstimator
 from blueman.gui.CommonUi import ErrorDialog
 
 import gi
@@ -79,7 +79,7 @@ class Sender(Gtk.Dialog):
         # bytes transferred on a current transfer
         self.transferred = 0
 
-        self.speed = SpeedCalc(6)
+        self.speed = RateEstimator(window=6)
 
         for file_name in files:
             parsed_file = Gio.File.parse_name(file_name)
@@ -183,17 +183,18 @@ class Sender(Gtk.Dialog):
 
         tm = time.time()
         if tm - self._last_update > 0.5:
-            spd = self.speed.calc(self.total_transferred)
+            spd = self.speed.update(self.total_transferred)
             (size, units) = format_bytes(spd)
-            try:
-                x = ((self.total_bytes - self.total_transferred) / spd) + 1
+            remaining = self.speed.eta(self.total_bytes - self.total_transferred)
+            if remaining is None:
+                eta = None
+            else:
+                x = remaining + 1
                 if x > 60:
                     x /= 60
                     eta = ngettext("%(minutes)d Minute", "%(minutes)d Minutes", round(x)) % {"minutes": round(x)}
                 else:
                     eta = ngettext("%(seconds)d Second", "%(seconds)d Seconds", round(x)) % {"seconds": round(x)}
-            except ZeroDivisionError:
-                eta = None
 
             self._update_pb_text(size, units, eta)
             self._last_update = tm
@@ -0,0 +1,102 @@
+from gettext import gettext as _
+import math
+from typing import Dict, List, NamedTuple, Optional
+
+from blueman.bluemantyping import BtAddress
+
+
+class Summary(NamedTuple):
+    samples: int
+    minimum: int
+    maximum: int
+    mean: float
+    p10: float
+    median: float
+    p90: float
+
+    def describe(self, unit: str) -> str:
+        return _("%(minimum)d to %(maximum)d %(unit)s, mean %(mean).1f, median %(median).1f, "
+                 "80%% between %(p10).1f and %(p90).1f (%(samples)d samples)") % {**self._asdict(), "unit": unit}
+
+
+class SampleBuffer:
+    """The last capacity samples of a value, adding one costs constant time"""
+
+    def __init__(self, capacity: int = 300) -> None:
+        self.capacity = capacity
+        self._samples: List[int] = []
+        self._next = 0
+        self._sum = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def append(self, value: int) -> None:
+        if len(self._samples) < self.capacity:
+            self._samples.append(value)
+        else:
+            self._sum -= self._samples[self._next]
+            self._samples[self._next] = value
+            self._next = (self._next + 1) % self.capacity
+        self._sum += value
+
+    def values(self) -> List[int]:
+        """The samples, oldest first"""
+        return self._samples[self._next:] + self._samples[:self._next]
+
+    @staticmethod
+    def _percentile(ordered: List[int], percent: float) -> float:
+        # Linear interpolation between the closest ranks
+        rank = (len(ordered) - 1) * percent / 100
+        lower = math.floor(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        return self._percentile(sorted(self._samples), percent)
+
+    def summary(self) -> Optional[Summary]:
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        return Summary(len(ordered), ordered[0], ordered[-1], self._sum / len(ordered),
+                       self._percentile(ordered, 10), self._percentile(ordered, 50), self._percentile(ordered, 90))
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._next = 0
+        self._sum = 0
+
+
+class SignalHistory:
+    """Signal strength and transmit power level samples of a device
+
+    rssi, tpl and link_quality are sampled from the connection, discovery_rssi is what BlueZ reports while
+    discovering.
+    """
+
+    _histories: Dict[BtAddress, "SignalHistory"] = {}
+
+    @classmethod
+    def for_device(cls, address: BtAddress) -> "SignalHistory":
+        history = cls._histories.get(address)
+        if history is None:
+            history = cls._histories[address] = cls()
+        return history
+
+    @classmethod
+    def get(cls, address: BtAddress) -> Optional["SignalHistory"]:
+        return cls._histories.get(address)
+
+    @classmethod
+    def forget(cls, address: BtAddress) -> None:
+        cls._histories.pop(address, None)
+
+    def __init__(self, capacity: int = 300) -> None:
+        self.rssi = SampleBuffer(capacity)
+        self.tpl = SampleBuffer(capacity)
+        self.link_quality = SampleBuffer(capacity)
+        self.discovery_rssi = SampleBuffer(capacity)
@@ -0,0 +1,79 @@
+import mmap
+import os
+import struct
+from typing import List, Tuple
+
+from gi.repository import GLib
+
+# (timestamp, byte_rx, byte_tx)
+Record = Tuple[float, int, int]
+
+
+class TrafficHistory:
+    """Byte counters of an adapter over time, kept in a fixed size ring buffer file
+
+    The file is memory mapped, so appending a record costs the same no matter how long the history is, and the
+    history survives restarts. The counters are stored as read, they start from zero when the adapter gets reset.
+    """
+
+    MAGIC = b"BMTH"
+    # magic, capacity, next record to write, number of records
+    _HEADER = struct.Struct("<4sIII")
+    _RECORD = struct.Struct("<dQQ")
+
+    def __init__(self, path: str, capacity: int = 8640) -> None:
+        self.path = path
+        self.capacity = capacity
+        size = self._HEADER.size + capacity * self._RECORD.size
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o600)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        magic, stored_capacity, next_record, count = self._HEADER.unpack_from(self._map)
+        self._next: int = next_record
+        self._count: int = count
+        if magic != self.MAGIC or stored_capacity != capacity or self._next >= capacity or self._count > capacity:
+            self._next = self._count = 0
+            self._write_header()
+
+    @classmethod
+    def for_adapter(cls, address: str) -> "TrafficHistory":
+        return cls(os.path.join(GLib.get_user_cache_dir(), "blueman", f"traffic-{address.replace(':', '')}"))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _write_header(self) -> None:
+        self._HEADER.pack_into(self._map, 0, self.MAGIC, self.capacity, self._next, self._count)
+
+    def append(self, timestamp: float, byte_rx: int, byte_tx: int) -> None:
+        self._RECORD.pack_into(self._map, self._HEADER.size + self._next * self._RECORD.size,
+                               timestamp, byte_rx, byte_tx)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._write_header()
+
+    def query(self, start: float = 0, end: float = float("inf")) -> List[Record]:
+        """Records with start <= timestamp <= end, oldest first"""
+        records = self._HEADER.size + self.capacity * self._RECORD.size
+        first = self._HEADER.size + (self._next - self._count) % self.capacity * self._RECORD.size
+        last = self._HEADER.size + self._next * self._RECORD.size
+        if self._count == 0:
+            chunks: List[bytes] = []
+        elif first < last:
+            chunks = [self._map[first:last]]
+        else:
+            chunks = [self._map[first:records], self._map[self._HEADER.size:last]]
+
+        return [record for chunk in chunks for record in self._RECORD.iter_unpack(chunk)
+                if start <= record[0] <= end]
+
+    def close(self) -> None:
+        self._map.close()
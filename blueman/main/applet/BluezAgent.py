@@ -50,7 +50,7 @@ class BluezAgent(DbusService):
 
         self.dialog: Optional[Gtk.Dialog] = None
         self._db: Optional[ElementTree.ElementTree] = None
-        self._devhandlerids: Dict[str, int] = {}
+        self._devhandlerids: Dict[str, Tuple[Device, int]] = {}
         self._notification: Optional[Union[_NotificationBubble, _NotificationDialog]] = None
         self._service_notifications: List[Union[_NotificationBubble, _NotificationDialog]] = []
 
@@ -159,7 +159,7 @@ class BluezAgent(DbusService):
     # Workaround BlueZ not calling the Cancel method, see #164
     def _on_device_property_changed(self, device: Device, key: str, value: Any, path: str) -> None:
         if (key == "Paired" and value) or (key == "Connected" and not value):
-            handlerid = self._devhandlerids.pop(path)
+            _device, handlerid = self._devhandlerids.pop(path)
             device.disconnect_signal(handlerid)
             self._on_cancel()
 
@@ -199,7 +199,8 @@ class BluezAgent(DbusService):
     def _on_display_passkey(self, object_path: ObjectPath, passkey: int, entered: int) -> None:
         logging.info(f"DisplayPasskey ({object_path}, {passkey:d} {entered:d})")
         dev = Device(obj_path=object_path)
-        self._devhandlerids[object_path] = dev.connect_signal("property-changed", self._on_device_property_changed)
+        self._devhandlerids[object_path] = (
+            dev, dev.connect_signal("property-changed", self._on_device_property_changed))
 
         key = f"{passkey:06}"
         notify_message = _("Pairing passkey for") + f" {self.get_device_string(object_path)}: " \
@@ -211,7 +212,8 @@ class BluezAgent(DbusService):
     def _on_display_pin_code(self, object_path: ObjectPath, pin_code: str) -> None:
         logging.info(f'DisplayPinCode ({object_path}, {pin_code})')
         dev = Device(obj_path=object_path)
-        self._devhandlerids[object_path] = dev.connect_signal("property-changed", self._on_device_property_changed)
+        self._devhandlerids[object_path] = (
+            dev, dev.connect_signal("property-changed", self._on_device_property_changed))
 
         notify_message = _("Pairing PIN code for") + f" {self.get_device_string(object_path)}: {pin_code}"
         self._notification = Notification("Bluetooth", notify_message, 0, icon_name="blueman")
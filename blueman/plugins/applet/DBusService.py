@@ -1,11 +1,12 @@
 from gettext import gettext as _
-from typing import Callable, Union, TYPE_CHECKING
+from typing import Callable, Union, TYPE_CHECKING, Dict
 from blueman.bluemantyping import ObjectPath
 
 from _blueman import RFCOMMError
 from gi.repository import GLib
 
 from blueman.Service import Service
+from blueman.bluez import stats
 from blueman.bluez.errors import BluezDBusException
 if TYPE_CHECKING:
     from blueman.main.NetworkManager import NMConnectionError
@@ -54,6 +55,11 @@ class DBusService(AppletPlugin):
         self._add_dbus_method("ConnectService", ("o", "s"), "", self.connect_service, is_async=True)
         self._add_dbus_method("DisconnectService", ("o", "s", "d"), "", self._disconnect_service, is_async=True)
 
+        # D-Bus accounting, only collected with BLUEMAN_DBUS_STATS set
+        self._add_dbus_method("GetDBusCallStats", (), "a{sa{sv}}", self._get_dbus_call_stats)
+        self._add_dbus_method("GetDBusSignalStats", (), "a{sa{sv}}", self._get_dbus_signal_stats)
+        self._add_dbus_method("ResetDBusStats", (), "", stats.reset)
+
         self._add_dbus_signal("PluginsChanged", "")
         self.parent.Plugins.connect("plugin-loaded", lambda *args: self._plugins_changed())
         self.parent.Plugins.connect("plugin-unloaded", lambda *args: self._plugins_changed())
@@ -61,6 +67,17 @@ class DBusService(AppletPlugin):
     def _plugins_changed(self) -> None:
         self._emit_dbus_signal("PluginsChanged")
 
+    @staticmethod
+    def _get_dbus_call_stats() -> Dict[str, Dict[str, GLib.Variant]]:
+        signatures = {"count": "u", "blocking": "u", "errors": "u", "total-ms": "d", "max-ms": "d", "histogram": "au"}
+        return {key: {name: GLib.Variant(signatures[name], value) for name, value in values.items()}
+                for key, values in stats.call_stats().items()}
+
+    @staticmethod
+    def _get_dbus_signal_stats() -> Dict[str, Dict[str, GLib.Variant]]:
+        return {key: {"count": GLib.Variant("u", values["count"]), "rate": GLib.Variant("d", values["rate"])}
+                for key, values in stats.signal_stats().items()}
+
     def connect_service(self, object_path: ObjectPath, uuid: str, ok: Callable[[], None],
                         err: Callable[[Union[BluezDBusException, "NMConnectionError",
                                              RFCOMMError, GLib.Error, str]], None]) -> None:
@@ -0,0 +1,87 @@
+from gettext import gettext as _
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from _blueman import HciCountersReadError, hci_counters
+from gi.repository import GLib
+
+from blueman.bluemantyping import ObjectPath
+from blueman.bluez.Adapter import Adapter
+from blueman.Functions import adapter_path_to_name
+from blueman.main.TrafficHistory import Record, TrafficHistory
+from blueman.plugins.AppletPlugin import AppletPlugin
+
+
+class TrafficMonitor(AppletPlugin):
+    __description__ = _("Keeps a history of the traffic of the adapters, the manager shows it when it gets opened")
+    __icon__ = "network-transmit-receive-symbolic"
+
+    SAMPLE_INTERVAL = 10
+
+    def on_load(self) -> None:
+        self._adapters: Dict[ObjectPath, Tuple[hci_counters, TrafficHistory]] = {}
+        self._source: Optional[int] = None
+
+        self._add_dbus_method("GetTrafficHistory", ("o", "d", "d"), "a(dtt)", self._get_traffic_history)
+
+    def on_unload(self) -> None:
+        for path in list(self._adapters):
+            self._remove_adapter(path)
+
+    def on_manager_state_changed(self, state: bool) -> None:
+        if state:
+            for adapter in self.parent.Manager.get_adapters():
+                self._add_adapter(adapter.get_object_path())
+        else:
+            for path in list(self._adapters):
+                self._remove_adapter(path)
+
+    def on_adapter_added(self, path: ObjectPath) -> None:
+        self._add_adapter(path)
+
+    def on_adapter_removed(self, path: ObjectPath) -> None:
+        self._remove_adapter(path)
+
+    def _add_adapter(self, path: ObjectPath) -> None:
+        name = adapter_path_to_name(path)
+        if path in self._adapters or name is None:
+            return
+
+        history = TrafficHistory.for_adapter(Adapter(obj_path=path)["Address"])
+        self._adapters[path] = (hci_counters(name), history)
+        self._sample_adapter(path)
+
+        if self._source is None:
+            self._source = GLib.timeout_add_seconds(self.SAMPLE_INTERVAL, self._sample)
+
+    def _remove_adapter(self, path: ObjectPath) -> None:
+        if path not in self._adapters:
+            return
+
+        counters, history = self._adapters.pop(path)
+        counters.close()
+        history.close()
+
+        if not self._adapters and self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+
+    def _sample_adapter(self, path: ObjectPath) -> None:
+        counters, history = self._adapters[path]
+        try:
+            byte_rx, byte_tx, _pkt_rx, _pkt_tx = counters.read()
+        except HciCountersReadError:
+            logging.debug(f"Could not read the counters of {path}", exc_info=True)
+            return
+        history.append(time.time(), byte_rx, byte_tx)
+
+    def _sample(self) -> bool:
+        for path in self._adapters:
+            self._sample_adapter(path)
+        return True
+
+    def _get_traffic_history(self, path: ObjectPath, start: float, end: float) -> List[Record]:
+        if path not in self._adapters:
+            return []
+        return self._adapters[path][1].query(start, end)
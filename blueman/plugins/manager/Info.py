@@ -12,6 +12,7 @@ from blueman.Sdp import ServiceUUID
 from blueman.bluez.Device import Device
 from blueman.bluez.errors import BluezDBusException
 from blueman.gui.manager.ManagerDeviceMenu import MenuItemsProvider, ManagerDeviceMenu, DeviceMenuItem
+from blueman.main.SignalHistory import SignalHistory
 
 from blueman.plugins.ManagerPlugin import ManagerPlugin
 
@@ -111,6 +112,16 @@ def show_info(device: Device, parent: Gtk.Window) -> None:
             logging.info(f"Could not add property {name}")
             pass
 
+    history = SignalHistory.get(device["Address"])
+    if history is not None:
+        for name, samples, unit in (('RSSI history', history.discovery_rssi, 'dBm'),
+                                    ('Connection RSSI history', history.rssi, 'dB'),
+                                    ('Transmit power level history', history.tpl, 'dBm'),
+                                    ('Link quality history', history.link_quality, '/ 255')):
+            summary = samples.summary()
+            if summary is not None:
+                store.append((name, summary.describe(unit)))
+
     dialog.run()
     dialog.destroy()
 
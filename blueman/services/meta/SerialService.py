@@ -7,10 +7,11 @@ from typing import Callable, Dict, Optional, List
 from gi.repository import Gio, GLib
 
 from blueman.bluez.Adapter import Adapter
-from _blueman import create_rfcomm_device, get_rfcomm_channel, RFCOMMError, rfcomm_list
+from _blueman import create_rfcomm_device, RFCOMMError, rfcomm_list
 from blueman.Service import Service, Instance
 from blueman.bluez.Device import Device
 from blueman.main.DBusProxies import Mechanism
+from blueman.main.RFCOMMChannelResolver import RFCOMMChannelResolver
 from blueman.Constants import RFCOMM_WATCHER_PATH
 
 
@@ -87,14 +88,24 @@ class SerialService(Service):
         # We expect this service to have a reserved UUID
         uuid = self.short_uuid
         assert uuid
-        channel = get_rfcomm_channel(uuid, self.device['Address'])
-        if channel is None or channel == 0:
+        RFCOMMChannelResolver.resolve(self.device, uuid,
+                                      lambda channel: self._connect_channel(channel, reply_handler, error_handler))
+        return True
+
+    def _connect_channel(
+        self,
+        channel: Optional[int],
+        reply_handler: Optional[Callable[[int], None]],
+        error_handler: Optional[Callable[[RFCOMMError], None]]
+    ) -> None:
+        # Called from the main loop once the channel is known, nobody is there to catch what we raise
+        if channel is None:
             error = RFCOMMError("Failed to get rfcomm channel")
             if error_handler:
                 error_handler(error)
-                return True
             else:
-                raise error
+                logging.error(f"Failed to connect {self.device['Address']}: {error}")
+            return
 
         try:
             port_id = create_rfcomm_device(Adapter(obj_path=self.device["Adapter"])['Address'], self.device["Address"],
@@ -112,8 +123,7 @@ class SerialService(Service):
             if error_handler:
                 error_handler(e)
             else:
-                raise e
-        return True
+                logging.error(f"Failed to connect {self.device['Address']}: {e}")
 
     def disconnect(
         self,
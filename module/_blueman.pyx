@@ -2,6 +2,10 @@
 # coding=utf-8
 #cython: language_level=3
 
+# Every call into C that can block (sockets, ioctls, SDP) runs without the GIL so other Python threads keep running,
+# state shared between calls is guarded by a lock per object.
+import threading
+
 cdef extern from "malloc.h":
     cdef void free(void *ptr)
 
@@ -52,7 +56,7 @@ cdef extern from "bluetooth/hci.h":
 
 
 
-cdef extern from "bluetooth/hci_lib.h":
+cdef extern from "bluetooth/hci_lib.h" nogil:
     cdef int hci_devinfo(int dev_id, hci_dev_info *di)
 
 
@@ -71,16 +75,36 @@ cdef extern from "bluetooth/rfcomm.h":
         rfcomm_dev_info dev_info[0]
 
 
-cdef extern from "libblueman.h":
+cdef extern from "libblueman.h" nogil:
     cdef struct conn_info_handles:
         unsigned int handle
         int dd
 
+    cdef struct connection_quality:
+        bdaddr_t bdaddr
+        unsigned short handle
+        unsigned char type
+        signed char rssi
+        signed char tpl
+        unsigned char link_quality
+        unsigned char valid
+
+    enum:
+        CONN_QUALITY_RSSI
+        CONN_QUALITY_TPL
+        CONN_QUALITY_LINK_QUALITY
+
 
     cdef int connection_init(int dev_id, char *addr, conn_info_handles *ci)
     cdef int connection_get_rssi(conn_info_handles *ci, signed char *ret_rssi)
     cdef int connection_get_tpl(conn_info_handles *ci, signed char *ret_tpl, unsigned char type)
     cdef int connection_close(conn_info_handles *ci)
+    cdef int hci_counters_open()
+    cdef int hci_counters_read(int ctl, int dev_id, hci_dev_stats *stat)
+    cdef void hci_counters_close(int ctl)
+    cdef int connection_quality_open(int dev_id)
+    cdef int connection_quality_read(int dd, int dev_id, connection_quality **result)
+    cdef void connection_quality_close(int dd)
     cdef int c_get_rfcomm_channel "get_rfcomm_channel" (unsigned short service_class, char* btd_addr)
     cdef int get_rfcomm_list(rfcomm_dev_list_req **ret)
     cdef int c_create_rfcomm_device "create_rfcomm_device" (char *local_address, char *remote_address, int channel)
@@ -99,6 +123,7 @@ ERR = {
     -4:"Get connection info failed",
     -5:"Read RSSI failed",
     -6:"Read transmit power level request failed",
+    -7:"Reading HCI counters failed",
     -8:"Getting rfcomm list failed",
     -9:"ERR_SOCKET_FAILED",
     -12: "Can't bind RFCOMM socket",
@@ -124,22 +149,30 @@ RFCOMM_RELEASE_ONHUP =    1
 RFCOMM_HANGUP_NOW =    2
 RFCOMM_TTY_ATTACHED =    3
 
+ACL_LINK = 0x01
+LE_LINK = 0x80
+
 def get_rfcomm_channel(uuid, py_bdaddr):
     if py_bdaddr is None:
         return
 
     py_bytes = py_bdaddr.encode('UTF-8')
     cdef char* bdaddr = py_bytes
-    return c_get_rfcomm_channel(uuid, bdaddr)
+    cdef unsigned short service_class = uuid
+    cdef int channel
+    with nogil:
+        channel = c_get_rfcomm_channel(service_class, bdaddr)
+    return channel
 
 def rfcomm_list():
     cdef rfcomm_dev_list_req *dl
 
     cdef char src[18]
     cdef char dst[18]
+    cdef int res
 
-
-    res = get_rfcomm_list(&dl)
+    with nogil:
+        res = get_rfcomm_list(&dl)
     if res < 0:
         raise RFCOMMError(ERR[res])
 
@@ -167,14 +200,20 @@ def create_rfcomm_device(py_local_address, py_remote_address, channel):
     py_bytes_remote_address = py_remote_address.encode('UTF-8')
     cdef char* local_address = py_bytes_local_address
     cdef char* remote_address = py_bytes_remote_address
-    ret = c_create_rfcomm_device(local_address, remote_address, channel)
+    cdef int c_channel = channel
+    cdef int ret
+    with nogil:
+        ret = c_create_rfcomm_device(local_address, remote_address, c_channel)
     if ret < 0:
         raise RFCOMMError(ERR[ret])
     return ret
 
 
 def release_rfcomm_device(id):
-    ret = c_release_rfcomm_device(id)
+    cdef int dev_id = id
+    cdef int ret
+    with nogil:
+        ret = c_release_rfcomm_device(dev_id)
     if ret < 0:
         raise RFCOMMError(ERR[ret])
     return ret
@@ -192,16 +231,20 @@ class BridgeException(Exception):
 def create_bridge(py_name="pan1"):
     py_bytes_name = py_name.encode("UTF-8")
     cdef char* name = py_bytes_name
+    cdef int err
 
-    err = _create_bridge(name)
+    with nogil:
+        err = _create_bridge(name)
     if err < 0:
         raise BridgeException(-err)
 
 def destroy_bridge(py_name="pan1"):
     py_bytes_name = py_name.encode("UTF-8")
     cdef char* name = py_bytes_name
+    cdef int err
 
-    err = _destroy_bridge(name)
+    with nogil:
+        err = _destroy_bridge(name)
     if err < 0:
         raise BridgeException(-err)
 
@@ -212,35 +255,46 @@ class ConnInfoReadError(Exception):
 cdef class conn_info:
     cdef conn_info_handles ci
     cdef int hci
-    cdef char* addr
+    # Keeps the buffer that is passed to C alive
+    cdef bytes addr
+    cdef bint opened
+    cdef object lock
     cdef public bint failed
 
     def __init__(self, py_addr, py_hci_name="hci0"):
         self.failed = False
-        py_bytes_addr = py_addr.encode("UTF-8")
-        cdef char* addr = py_bytes_addr
-
-        py_bytes_hci_name = py_hci_name.encode("UTF-8")
-        cdef char* hci_name = py_bytes_hci_name
-
-
-        self.hci = int(hci_name[3:])
-        self.addr = addr
+        self.opened = False
+        self.lock = threading.Lock()
+        self.addr = py_addr.encode("UTF-8")
+        self.hci = int(py_hci_name[3:])
 
     def init(self):
-        res = connection_init(self.hci, self.addr, & self.ci)
-        if res < 0:
-            self.failed = True
-            raise ConnInfoReadError(ERR[res])
+        cdef char* addr = self.addr
+        cdef int res
+        with self.lock:
+            with nogil:
+                res = connection_init(self.hci, addr, &self.ci)
+            if res < 0:
+                self.failed = True
+                raise ConnInfoReadError(ERR[res])
+            self.opened = True
 
     def deinit(self):
-        if self.failed:
-            return
-        connection_close(&self.ci)
+        with self.lock:
+            if not self.opened:
+                return
+            with nogil:
+                connection_close(&self.ci)
+            self.opened = False
 
     def get_rssi(self):
         cdef signed char rssi
-        res = connection_get_rssi(&self.ci, &rssi)
+        cdef int res
+        with self.lock:
+            if not self.opened:
+                raise ConnInfoReadError(ERR[-3])
+            with nogil:
+                res = connection_get_rssi(&self.ci, &rssi)
         if res < 0:
             raise ConnInfoReadError(ERR[res])
 
@@ -248,22 +302,135 @@ cdef class conn_info:
 
     def get_tpl(self, tp=0):
         cdef signed char tpl
-        res = connection_get_tpl(&self.ci, &tpl, tp)
+        cdef unsigned char tpl_type = tp
+        cdef int res
+        with self.lock:
+            if not self.opened:
+                raise ConnInfoReadError(ERR[-3])
+            with nogil:
+                res = connection_get_tpl(&self.ci, &tpl, tpl_type)
         if res < 0:
             raise ConnInfoReadError(ERR[res])
 
         return tpl
 
+cdef class conn_quality:
+    """Signal strength, transmit power level and link quality of all ACL and LE connections of an adapter
+
+    Everything is read through one HCI socket that stays open, with one connection list request per read.
+    """
+    cdef int dd
+    cdef int dev_id
+    cdef object lock
+
+    def __cinit__(self):
+        self.dd = -1
+
+    def __init__(self, py_hci_name="hci0"):
+        self.dev_id = int(py_hci_name[3:])
+        self.lock = threading.Lock()
+
+    def read(self):
+        """Returns a (address, link type, rssi, tpl, link quality) tuple per connection, values that could not be
+        read are None"""
+        cdef connection_quality *results = NULL
+        cdef char addr[18]
+        cdef int res
+
+        with self.lock:
+            if self.dd < 0:
+                with nogil:
+                    res = connection_quality_open(self.dev_id)
+                if res < 0:
+                    raise ConnInfoReadError(ERR[res])
+                self.dd = res
+
+            with nogil:
+                res = connection_quality_read(self.dd, self.dev_id, &results)
+        if res < 0:
+            raise ConnInfoReadError(ERR[res])
+
+        connections = []
+        for 0 <= i < res:
+            ba2str(&results[i].bdaddr, addr)
+            connections.append((
+                addr.decode("UTF-8"),
+                results[i].type,
+                results[i].rssi if results[i].valid & CONN_QUALITY_RSSI else None,
+                results[i].tpl if results[i].valid & CONN_QUALITY_TPL else None,
+                results[i].link_quality if results[i].valid & CONN_QUALITY_LINK_QUALITY else None,
+            ))
+        free(results)
+        return connections
+
+    def close(self):
+        with self.lock:
+            if self.dd >= 0:
+                with nogil:
+                    connection_quality_close(self.dd)
+                self.dd = -1
+
+    def __dealloc__(self):
+        if self.dd >= 0:
+            connection_quality_close(self.dd)
+
+class HciCountersReadError(Exception):
+    pass
+
+cdef class hci_counters:
+    """Byte and packet counters of an adapter, read through a control socket that stays open"""
+    cdef int ctl
+    cdef int dev_id
+    cdef object lock
+
+    def __cinit__(self):
+        self.ctl = -1
+
+    def __init__(self, py_hci_name="hci0"):
+        self.dev_id = int(py_hci_name[3:])
+        self.lock = threading.Lock()
+
+    def read(self):
+        """Returns (byte_rx, byte_tx, pkt_rx, pkt_tx), the packets being ACL and SCO data packets"""
+        cdef hci_dev_stats stat
+        cdef int res
+
+        with self.lock:
+            if self.ctl < 0:
+                with nogil:
+                    res = hci_counters_open()
+                if res < 0:
+                    raise HciCountersReadError(ERR[res])
+                self.ctl = res
+
+            with nogil:
+                res = hci_counters_read(self.ctl, self.dev_id, &stat)
+        if res < 0:
+            raise HciCountersReadError(ERR[res])
+
+        return stat.byte_rx, stat.byte_tx, stat.acl_rx + stat.sco_rx, stat.acl_tx + stat.sco_tx
+
+    def close(self):
+        with self.lock:
+            if self.ctl >= 0:
+                with nogil:
+                    hci_counters_close(self.ctl)
+                self.ctl = -1
+
+    def __dealloc__(self):
+        if self.ctl >= 0:
+            hci_counters_close(self.ctl)
+
 def device_info(py_hci_name="hci0"):
     py_bytes_hci_name = py_hci_name.encode("UTF-8")
     cdef char* hci_name = py_bytes_hci_name
 
     cdef hci_dev_info di
-    cdef int ret
-
-    dev_id = int(hci_name[3:])
+    cdef int res
+    cdef int dev_id = int(hci_name[3:])
 
-    res = hci_devinfo(dev_id, &di)
+    with nogil:
+        res = hci_devinfo(dev_id, &di)
 
     cdef char addr[32]
     ba2str(&di.bdaddr, addr)
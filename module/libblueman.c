@@ -236,6 +236,116 @@ int connection_close(struct conn_info_handles *ci)
 	return 1;
 }
 
+/* A raw HCI socket that is not bound to a device is enough for HCIGETDEVINFO, keep one open to read the counters
+ * instead of opening one for every hci_devinfo call */
+int hci_counters_open(void)
+{
+	int ctl = socket(AF_BLUETOOTH, SOCK_RAW | SOCK_CLOEXEC, BTPROTO_HCI);
+	if (ctl < 0)
+		return ERR_SOCKET_FAILED;
+
+	return ctl;
+}
+
+int hci_counters_read(int ctl, int dev_id, struct hci_dev_stats *stat)
+{
+	struct hci_dev_info di;
+
+	memset(&di, 0, sizeof(di));
+	di.dev_id = dev_id;
+	if (ioctl(ctl, HCIGETDEVINFO, (void *) &di) < 0)
+		return ERR_READ_COUNTERS_FAILED;
+
+	*stat = di.stat;
+	return 1;
+}
+
+void hci_counters_close(int ctl)
+{
+	close(ctl);
+}
+
+int connection_quality_open(int dev_id)
+{
+	int dd = hci_open_dev(dev_id);
+	if (dd < 0)
+		return ERR_HCI_DEV_OPEN_FAILED;
+
+	return dd;
+}
+
+/* First size of the connection list request, SCO links take entries too */
+#define CONN_LIST_INITIAL 20
+/* The kernel refuses requests of more than two pages, which are at least 4 KiB */
+#define CONN_LIST_LIMIT (int) (2 * 4096 / sizeof(struct hci_conn_info))
+
+/* Reads the quality of all ACL and LE connections of the adapter with one connection list ioctl on dd, the list
+ * is requested again with more room while the adapter fills it. *result is allocated for the caller to free,
+ * returns the number of connections written to it */
+int connection_quality_read(int dd, int dev_id, struct connection_quality **result)
+{
+	struct hci_conn_list_req *cl = NULL;
+	struct hci_conn_list_req *grown;
+	struct hci_conn_info *ci;
+	struct connection_quality *q;
+	int size = CONN_LIST_INITIAL;
+	int i;
+	int count = 0;
+
+	while (1) {
+		grown = realloc(cl, sizeof(*cl) + size * sizeof(*ci));
+		if (!grown) {
+			free(cl);
+			return ERR_CANNOT_ALLOCATE;
+		}
+		cl = grown;
+
+		cl->dev_id = dev_id;
+		cl->conn_num = size;
+		if (ioctl(dd, HCIGETCONNLIST, (void *) cl) < 0) {
+			free(cl);
+			return ERR_GET_CONN_INFO_FAILED;
+		}
+
+		if (cl->conn_num < size || size == CONN_LIST_LIMIT)
+			break;
+		size = size * 2 < CONN_LIST_LIMIT ? size * 2 : CONN_LIST_LIMIT;
+	}
+
+	/* One entry at least, malloc(0) may return NULL */
+	*result = malloc((cl->conn_num ? cl->conn_num : 1) * sizeof(**result));
+	if (!*result) {
+		free(cl);
+		return ERR_CANNOT_ALLOCATE;
+	}
+
+	for (i = 0, ci = cl->conn_info; i < cl->conn_num; i++, ci++) {
+		if (ci->type != ACL_LINK && ci->type != LE_LINK)
+			continue;
+
+		q = &(*result)[count++];
+		memset(q, 0, sizeof(*q));
+		bacpy(&q->bdaddr, &ci->bdaddr);
+		q->handle = ci->handle;
+		q->type = ci->type;
+
+		if (hci_read_rssi(dd, htobs(ci->handle), &q->rssi, 1000) == 0)
+			q->valid |= CONN_QUALITY_RSSI;
+		if (hci_read_transmit_power_level(dd, htobs(ci->handle), 0, &q->tpl, 1000) == 0)
+			q->valid |= CONN_QUALITY_TPL;
+		if (hci_read_link_quality(dd, htobs(ci->handle), &q->link_quality, 1000) == 0)
+			q->valid |= CONN_QUALITY_LINK_QUALITY;
+	}
+
+	free(cl);
+	return count;
+}
+
+void connection_quality_close(int dd)
+{
+	hci_close_dev(dd);
+}
+
 int
 get_rfcomm_channel(uint16_t service_class, char* btd_addr) {
     bdaddr_t target;
@@ -1,10 +1,14 @@
 #pragma once
+#include <stdint.h>
+#include <bluetooth/bluetooth.h>
+
 #define ERR_CANNOT_ALLOCATE -1
 #define ERR_HCI_DEV_OPEN_FAILED -2
 #define ERR_NOT_CONNECTED -3
 #define ERR_GET_CONN_INFO_FAILED -4
 #define ERR_READ_RSSI_FAILED -5
 #define ERR_READ_TPL_FAILED -6
+#define ERR_READ_COUNTERS_FAILED -7
 #define ERR_GET_RFCOMM_LIST_FAILED -8
 #define ERR_SOCKET_FAILED -9
 #define ERR_BIND_FAILED -12
@@ -17,10 +21,31 @@ struct conn_info_handles {
 	int dd;
 };
 
+/* Bits of connection_quality.valid */
+#define CONN_QUALITY_RSSI 1
+#define CONN_QUALITY_TPL 2
+#define CONN_QUALITY_LINK_QUALITY 4
+
+struct connection_quality {
+	bdaddr_t bdaddr;
+	uint16_t handle;
+	uint8_t type;
+	int8_t rssi;
+	int8_t tpl;
+	uint8_t link_quality;
+	uint8_t valid;
+};
+
 int connection_init(int dev_id, char *addr, struct conn_info_handles *ci);
 int connection_get_rssi(struct conn_info_handles *ci, int8_t *ret_rssi);
 int connection_get_tpl(struct conn_info_handles *ci, int8_t *ret_tpl, uint8_t type);
 int connection_close(struct conn_info_handles *ci);
+int hci_counters_open(void);
+int hci_counters_read(int ctl, int dev_id, struct hci_dev_stats *stat);
+void hci_counters_close(int ctl);
+int connection_quality_open(int dev_id);
+int connection_quality_read(int dd, int dev_id, struct connection_quality **result);
+void connection_quality_close(int dd);
 int get_rfcomm_channel(uint16_t uuid, char* btd_addr);
 int get_rfcomm_list(struct rfcomm_dev_list_req **result);
 int create_rfcomm_device(char *local_address, char *remote_address, int channel);
@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from typing_extensions import TypedDict
 
 ERR: Dict[int, str]
@@ -7,6 +7,8 @@ RFCOMM_RELEASE_ONHUP: int
 RFCOMM_REUSE_DLC: int
 RFCOMM_STATES: List[str]
 RFCOMM_TTY_ATTACHED: int
+ACL_LINK: int
+LE_LINK: int
 
 class _RfcommDev(TypedDict):
     id: int
@@ -37,6 +39,8 @@ class BridgeException(Exception):
 
 class ConnInfoReadError(Exception): ...
 
+class HciCountersReadError(Exception): ...
+
 class RFCOMMError(Exception): ...
 
 class conn_info:
@@ -47,6 +51,16 @@ class conn_info:
     def get_tpl(self) -> int: ...
     def init(self) -> None: ...
 
+class conn_quality:
+    def __init__(self, hci_name: str = "hci0") -> None: ...
+    def read(self) -> List[Tuple[str, int, Optional[int], Optional[int], Optional[int]]]: ...
+    def close(self) -> None: ...
+
+class hci_counters:
+    def __init__(self, hci_name: str = "hci0") -> None: ...
+    def read(self) -> Tuple[int, int, int, int]: ...
+    def close(self) -> None: ...
+
 def create_bridge(name: str = "pan1") -> None: ...
 def create_rfcomm_device(local_address: str, remote_address: str, channel: int) -> int: ...
 def destroy_bridge(name: str = "pan1") -> None: ...
@@ -2534,7 +2534,7 @@ class TreeSelection(GObject.Object):
 
 class TreeSortable(GObject.GInterface):
 
-    def get_sort_column_id(self) -> typing.Tuple[builtins.bool, builtins.int, SortType]: ...
+    def get_sort_column_id(self) -> typing.Tuple[typing.Optional[builtins.int], typing.Optional[SortType]]: ...
 
     def has_default_sort_func(self) -> builtins.bool: ...
 
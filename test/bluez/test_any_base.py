@@ -0,0 +1,49 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from gi.repository import GLib
+
+from blueman.bluez.AnyBase import PropertiesChangedDispatcher
+
+
+def _signal(interface_name, changed, invalidated=()):
+    return GLib.Variant("(sa{sv}as)", (interface_name, changed, list(invalidated)))
+
+
+@patch("blueman.bluez.AnyBase.Gio.bus_get_sync")
+class TestPropertiesChangedDispatcher(TestCase):
+    def _emit(self, dispatcher, bus, param):
+        callback = bus.signal_subscribe.call_args[0][6]
+        callback(bus, ":1.1", "/org/bluez/hci0/dev_00_00_5E_00_53_00", "org.freedesktop.DBus.Properties",
+                 "PropertiesChanged", param)
+
+    def test_single_subscription(self, bus_get_sync: Mock):
+        bus = bus_get_sync.return_value
+        dispatcher = PropertiesChangedDispatcher()
+        first = dispatcher.add_listener("org.bluez.Device1", Mock())
+        second = dispatcher.add_listener("org.bluez.Device1", Mock(), ("Connected",))
+
+        bus.signal_subscribe.assert_called_once()
+        self.assertEqual(bus.signal_subscribe.call_args[0][4], "org.bluez.Device1")
+
+        dispatcher.remove_listener(first)
+        bus.signal_unsubscribe.assert_not_called()
+        dispatcher.remove_listener(second)
+        bus.signal_unsubscribe.assert_called_once_with(bus.signal_subscribe.return_value)
+
+    def test_fan_out(self, bus_get_sync: Mock):
+        bus = bus_get_sync.return_value
+        dispatcher = PropertiesChangedDispatcher()
+        any_listener, connected_listener, rssi_listener = Mock(), Mock(), Mock()
+        dispatcher.add_listener("org.bluez.Device1", any_listener)
+        dispatcher.add_listener("org.bluez.Device1", connected_listener, ("Connected",))
+        dispatcher.add_listener("org.bluez.Device1", rssi_listener, ("RSSI",))
+
+        self._emit(dispatcher, bus, _signal("org.bluez.Device1", {"RSSI": GLib.Variant("n", -60)}))
+        any_listener.assert_called_once_with("RSSI", -60, "/org/bluez/hci0/dev_00_00_5E_00_53_00")
+        rssi_listener.assert_called_once_with("RSSI", -60, "/org/bluez/hci0/dev_00_00_5E_00_53_00")
+        connected_listener.assert_not_called()
+
+        self._emit(dispatcher, bus, _signal("org.bluez.Device1", {}, ["RSSI"]))
+        rssi_listener.assert_called_with("RSSI", None, "/org/bluez/hci0/dev_00_00_5E_00_53_00")
+        connected_listener.assert_not_called()
@@ -0,0 +1,146 @@
+import gc
+from unittest.mock import patch, Mock
+
+from dbusmock import DBusTestCase
+from gi.repository import GLib, Gio
+
+from blueman.bluez.Device import Device
+from test.testhelpers.DBusMock import DBusMock
+
+
+PATH = "/org/bluez/hci0/dev_00_00_5E_00_53_00"
+
+
+def _new_proxy(bus_type, flags, info, name, object_path, interface_name, cancellable):
+    connection = Gio.DBusConnection.new_for_address_sync(
+        Gio.dbus_address_get_for_bus_sync(bus_type),
+        Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION | Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT,
+    )
+    return Gio.DBusProxy.new_sync(connection, flags, info, name, object_path, interface_name, cancellable)
+
+
+class TestBase(DBusTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.start_system_bus()
+
+    def setUp(self) -> None:
+        patcher = patch("blueman.bluez.Base.Gio.DBusProxy.new_for_bus_sync", _new_proxy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock = DBusMock("org.bluez", PATH, Gio.BusType.SYSTEM)
+        self.mock.add_property("org.bluez.Device1", "Alias", GLib.Variant("s", "Speaker"))
+        self.mock.add_property("org.bluez.Device1", "Connected", GLib.Variant("b", False))
+        self.device = Device(obj_path=PATH)
+
+    def tearDown(self) -> None:
+        Device.evict(PATH)
+        self.mock.__exit__(None, None, None)
+
+    def _spy(self) -> Mock:
+        return patch.object(self.device, "_Base__proxy", Mock(wraps=self.device._Base__proxy))
+
+    @staticmethod
+    def _iterate() -> None:
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration()
+
+    def test_steady_state(self):
+        with self._spy() as spy:
+            for _ in range(10):
+                self.assertEqual(self.device["Alias"], "Speaker")
+                self.assertFalse(self.device["Connected"])
+                self.assertIn("Alias", self.device)
+            spy.call_sync.assert_not_called()
+
+    def test_properties_changed(self):
+        self.mock.set_property("org.bluez.Device1", "Connected", GLib.Variant("b", True))
+        self._iterate()
+
+        with self._spy() as spy:
+            self.assertTrue(self.device["Connected"])
+            spy.call_sync.assert_not_called()
+
+    def test_from_properties(self):
+        path = "/org/bluez/hci0/dev_00_00_5E_00_53_01"
+        device = Device.from_properties(path, {"Alias": "Headset", "Connected": True})
+        self.addCleanup(Device.evict, path)
+        self.assertIsNot(device, self.device)
+        # Nothing got fetched from the bus
+        self.assertEqual(device._Base__proxy.get_cached_property_names(), [])
+
+        with patch.object(device, "_Base__proxy", Mock(wraps=device._Base__proxy)) as spy:
+            self.assertEqual(device["Alias"], "Headset")
+            self.assertTrue(device.get_properties()["Connected"])
+            spy.call_sync.assert_not_called()
+
+        self.assertIs(Device.from_properties(PATH, {}), self.device)
+
+    def test_uncached(self):
+        with self._spy() as spy:
+            self.assertEqual(self.device.get("Alias", cached=False), "Speaker")
+            self.device.get_properties(cached=False)
+            self.assertEqual(spy.call_sync.call_count, 2)
+
+    def test_invalidate(self):
+        self.device.invalidate_cache("Alias")
+
+        with self._spy() as spy:
+            self.assertEqual(self.device["Alias"], "Speaker")
+            self.assertEqual(self.device["Alias"], "Speaker")
+            self.assertEqual(spy.call_sync.call_count, 1)
+
+            self.assertIn("Connected", self.device.get_properties())
+            self.device.get_properties()
+            self.assertEqual(spy.call_sync.call_count, 2)
+
+    def test_get_async(self):
+        reply, error = Mock(), Mock()
+        self.device.get_async("Alias", reply, error, cached=False)
+        self._iterate()
+        reply.assert_called_once_with("Speaker")
+        error.assert_not_called()
+
+    def test_set_async(self):
+        reply, error = Mock(), Mock()
+        self.device.set_async("Alias", "Headset", reply, error, timeout=1000)
+        self._iterate()
+        reply.assert_called_once_with()
+        error.assert_not_called()
+        self.assertEqual(self.device.get("Alias", cached=False), "Headset")
+
+    def test_get_properties_async(self):
+        reply = Mock()
+        self.device.get_properties_async(reply)
+        self._iterate()
+        self.assertEqual(reply.call_args[0][0]["Alias"], "Speaker")
+
+    def test_cancel(self):
+        reply, error = Mock(), Mock()
+        cancellable = Gio.Cancellable()
+        cancellable.cancel()
+        self.device.get_async("Alias", reply, error, cancellable=cancellable, cached=False)
+        self._iterate()
+        reply.assert_not_called()
+        error.assert_called_once()
+
+    def test_registry(self):
+        before = Device.instance_counters()
+        self.assertIs(Device(obj_path=PATH), self.device)
+        self.assertEqual(Device.instance_counters()["reused"], before["reused"] + 1)
+
+        del self.device
+        gc.collect()
+        after = Device.instance_counters()
+        self.assertEqual(after["live"], 0)
+        self.assertEqual(after["collected"], before["collected"] + 1)
+
+    def test_evict(self):
+        before = Device.instance_counters()
+        Device.evict(PATH)
+        after = Device.instance_counters()
+        self.assertEqual(after["evicted"], before["evicted"] + 1)
+        self.assertEqual(after["live"], 0)
+        self.assertIsNot(Device(obj_path=PATH), self.device)
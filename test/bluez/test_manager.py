@@ -1,9 +1,210 @@
+import time
 from unittest import TestCase
+from unittest.mock import patch, Mock, ANY
 
+from dbusmock import DBusTestCase
+from gi.repository import GLib, Gio
+
+from blueman.bluez.Device import Device
 from blueman.bluez.Manager import Manager
 from blueman.gobject import SingletonGObjectMeta
+from test.testhelpers.DBusMock import DBusMock
+
+
+def _device(path, address, adapter, **properties):
+    return path, {"org.bluez.Device1": {"Address": address, "Adapter": adapter, **properties}}
+
+
+def _adapter(path, address):
+    return path, {"org.bluez.Adapter1": {"Address": address}}
+
+
+def _proxy_class(interface_name):
+    cls = Mock(side_effect=lambda obj_path: obj_path)
+    cls._interface_name = interface_name
+    cls.from_properties.side_effect = lambda obj_path, _properties: obj_path
+    return cls
 
 
 class TestManager(TestCase):
     def test_metaclass(self):
         self.assertIsInstance(Manager, SingletonGObjectMeta)
+
+
+@patch("blueman.bluez.Manager.Device", _proxy_class("org.bluez.Device1"))
+@patch("blueman.bluez.Manager.Adapter", _proxy_class("org.bluez.Adapter1"))
+class TestManagerIndex(TestCase):
+    def setUp(self) -> None:
+        Manager._instance = None
+        self.addCleanup(setattr, Manager, "_instance", None)
+
+        objects = dict([
+            _adapter("/org/bluez/hci1", "00:00:5E:00:53:01"),
+            _adapter("/org/bluez/hci0", "00:00:5E:00:53:00"),
+            _device("/org/bluez/hci0/dev_00_00_5E_00_53_10", "00:00:5E:00:53:10", "/org/bluez/hci0"),
+            _device("/org/bluez/hci1/dev_00_00_5E_00_53_10", "00:00:5E:00:53:10", "/org/bluez/hci1"),
+            _device("/org/bluez/hci1/dev_00_00_5E_00_53_11", "00:00:5E:00:53:11", "/org/bluez/hci1"),
+        ])
+        with patch("blueman.bluez.Manager.ObjectManager") as object_manager:
+            object_manager.return_value.get_objects.return_value = objects
+            self.manager = Manager()
+
+    def test_adapters(self):
+        self.assertEqual(self.manager.get_adapters(), ["/org/bluez/hci0", "/org/bluez/hci1"])
+        self.assertEqual(self.manager.get_adapter(), "/org/bluez/hci0")
+        self.assertEqual(self.manager.get_adapter("hci1"), "/org/bluez/hci1")
+        self.assertEqual(self.manager.get_adapter("00:00:5E:00:53:01"), "/org/bluez/hci1")
+
+    def test_devices(self):
+        self.assertEqual(len(self.manager.get_devices()), 3)
+        self.assertEqual(self.manager.get_devices("/org/bluez/hci1"),
+                         ["/org/bluez/hci1/dev_00_00_5E_00_53_10", "/org/bluez/hci1/dev_00_00_5E_00_53_11"])
+
+    def test_seeded_proxies(self):
+        from blueman.bluez.Manager import Device
+        Device.reset_mock()
+        self.assertEqual(self.manager.get_device("/org/bluez/hci1/dev_00_00_5E_00_53_11"),
+                         "/org/bluez/hci1/dev_00_00_5E_00_53_11")
+        Device.from_properties.assert_called_once_with(
+            "/org/bluez/hci1/dev_00_00_5E_00_53_11",
+            {"Address": "00:00:5E:00:53:11", "Adapter": "/org/bluez/hci1"})
+        Device.assert_not_called()
+
+    def test_find_device(self):
+        self.assertEqual(self.manager.find_device("00:00:5E:00:53:11"), "/org/bluez/hci1/dev_00_00_5E_00_53_11")
+        self.assertEqual(self.manager.find_device("00:00:5E:00:53:10", "/org/bluez/hci1"),
+                         "/org/bluez/hci1/dev_00_00_5E_00_53_10")
+        self.assertIsNone(self.manager.find_device("00:00:5E:00:53:ff"))
+
+    def test_object_added_removed(self):
+        added = _device("/org/bluez/hci0/dev_00_00_5E_00_53_12", "00:00:5E:00:53:12", "/org/bluez/hci0")
+        self.manager._on_object_added(self.manager._object_manager, *added)
+        self.assertEqual(self.manager.find_device("00:00:5E:00:53:12"), "/org/bluez/hci0/dev_00_00_5E_00_53_12")
+
+        self.manager._on_object_removed(self.manager._object_manager, *added)
+        self.assertIsNone(self.manager.find_device("00:00:5E:00:53:12"))
+        self.assertEqual(self.manager.get_devices("/org/bluez/hci0"), ["/org/bluez/hci0/dev_00_00_5E_00_53_10"])
+
+    def test_async(self):
+        Manager._instance = None
+        with patch("blueman.bluez.Manager.ObjectManager") as object_manager:
+            object_manager.return_value.get_objects.return_value = {}
+            manager = Manager.create_async()
+
+        self.assertFalse(manager.is_ready())
+        object_manager.assert_called_once_with(Gio.BusType.SYSTEM, "org.bluez", ANY, load=False)
+        ready = Mock()
+        manager.connect_signal("ready", ready)
+
+        object_manager.return_value.load_async.call_args[0][0]()
+        self.assertTrue(manager.is_ready())
+        ready.assert_called_once_with(manager)
+        self.assertIs(Manager.create_async(), manager)
+
+    def _added_device(self, **properties):
+        path, interfaces = _device("/org/bluez/hci0/dev_00_00_5E_00_53_12", "00:00:5E:00:53:12", "/org/bluez/hci0",
+                                   **properties)
+        self.manager._object_manager.get_objects.return_value[path] = interfaces
+        return path, interfaces
+
+    def _change(self, path, interfaces, **changed):
+        interfaces["org.bluez.Device1"].update(changed)
+        self.manager._on_properties_changed(self.manager._object_manager, path, "org.bluez.Device1", changed, [])
+
+    def test_filter(self):
+        created, removed = Mock(), Mock()
+        self.manager.connect_signal("device-created", created)
+        self.manager.connect_signal("device-removed", removed)
+
+        # Smartphone
+        path, interfaces = self._added_device(Class=0x5a020c)
+        self.manager._on_object_added(self.manager._object_manager, path, interfaces)
+        self.manager._on_object_removed(self.manager._object_manager, path, interfaces)
+        created.assert_not_called()
+        removed.assert_not_called()
+
+        # Headset
+        path, interfaces = self._added_device(Class=0x240404)
+        self.manager._on_object_added(self.manager._object_manager, path, interfaces)
+        created.assert_called_once_with(self.manager, path)
+        self.manager._on_object_removed(self.manager._object_manager, path, interfaces)
+        removed.assert_called_once_with(self.manager, path)
+
+    def test_filter_reevaluated(self):
+        created, removed = Mock(), Mock()
+        self.manager.connect_signal("device-created", created)
+        self.manager.connect_signal("device-removed", removed)
+
+        path, interfaces = self._added_device()
+        self.manager._on_object_added(self.manager._object_manager, path, interfaces)
+        created.assert_not_called()
+
+        self._change(path, interfaces, RSSI=-60)
+        created.assert_not_called()
+
+        # Keyboard, discovered over GATT
+        self._change(path, interfaces, Appearance=0x03c2)
+        created.assert_called_once_with(self.manager, path)
+        self._change(path, interfaces, Appearance=0x03c2, Class=0)
+        created.assert_called_once()
+
+        self._change(path, interfaces, Appearance=0x0080)
+        removed.assert_called_once_with(self.manager, path)
+
+
+def _new_connection(bus_type, _cancellable=None):
+    return Gio.DBusConnection.new_for_address_sync(
+        Gio.dbus_address_get_for_bus_sync(bus_type),
+        Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION | Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT,
+    )
+
+
+def _new_proxy(bus_type, flags, info, name, object_path, interface_name, cancellable):
+    return Gio.DBusProxy.new_sync(_new_connection(bus_type), flags, info, name, object_path, interface_name,
+                                  cancellable)
+
+
+class TestManagerProxies(DBusTestCase):
+    DEVICE = "/org/bluez/hci0/dev_00_00_5E_00_53_10"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.start_system_bus()
+
+    def setUp(self) -> None:
+        for target, new in (("blueman.bluez.ObjectManager.Gio.bus_get_sync", _new_connection),
+                            ("blueman.bluez.Base.Gio.DBusProxy.new_for_bus_sync", _new_proxy)):
+            patcher = patch(target, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.mock = DBusMock("org.bluez", "/", True, object_manager=True)
+        self.addCleanup(self.mock.__exit__, None, None, None)
+        self.device = self.mock.add_object(self.DEVICE, "org.bluez.Device1", {
+            "Address": GLib.Variant("s", "00:00:5E:00:53:10"),
+            "Adapter": GLib.Variant("o", "/org/bluez/hci0"),
+            "Connected": GLib.Variant("b", False),
+        })
+
+        Manager._instance = None
+        self.addCleanup(setattr, Manager, "_instance", None)
+        self.manager = Manager()
+        self.addCleanup(self.manager._object_manager.destroy)
+        self.addCleanup(Device.evict, self.DEVICE)
+
+    def test_seeded_proxy_gets_changes(self):
+        device = self.manager.get_device(self.DEVICE)
+        self.assertFalse(device["Connected"])
+        changed = Mock()
+        device.connect_signal("property-changed", changed)
+
+        self.device.set_property("org.bluez.Device1", "Connected", GLib.Variant("b", True))
+        context = GLib.MainContext.default()
+        timeout = time.monotonic() + 5
+        while not changed.called and time.monotonic() < timeout:
+            context.iteration(True)
+
+        changed.assert_called_once_with(device, "Connected", True, self.DEVICE)
+        with patch.object(device, "_Base__proxy", Mock(wraps=device._Base__proxy)) as spy:
+            self.assertTrue(device["Connected"])
+            spy.call_sync.assert_not_called()
@@ -0,0 +1,161 @@
+import time
+from unittest.mock import patch, Mock
+
+from dbusmock import DBusTestCase
+from gi.repository import GLib, Gio
+
+from blueman.bluez.ObjectManager import ObjectManager
+from test.testhelpers.DBusMock import DBusMock
+
+
+ADAPTER = "/org/bluez/hci0"
+DEVICE = "/org/bluez/hci0/dev_00_00_5E_00_53_10"
+GATT_SERVICES = 50
+GATT_CHARACTERISTICS = 20
+
+
+def _new_connection(bus_type, _cancellable=None):
+    return Gio.DBusConnection.new_for_address_sync(
+        Gio.dbus_address_get_for_bus_sync(bus_type),
+        Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION | Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT,
+    )
+
+
+class TestObjectManager(DBusTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.start_system_bus()
+
+    def setUp(self) -> None:
+        patcher = patch("blueman.bluez.ObjectManager.Gio.bus_get_sync", _new_connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock = DBusMock("org.bluez", "/", True, object_manager=True)
+        self.addCleanup(self.mock.__exit__, None, None, None)
+
+        self.mock.add_object(ADAPTER, "org.bluez.Adapter1", {"Address": GLib.Variant("s", "00:00:5E:00:53:00")})
+        self.device = self.mock.add_object(DEVICE, "org.bluez.Device1", {
+            "Address": GLib.Variant("s", "00:00:5E:00:53:10"),
+            "Connected": GLib.Variant("b", False),
+        })
+        # A GATT heavy peripheral as exported by BlueZ
+        for service in range(GATT_SERVICES):
+            service_path = f"{DEVICE}/service{service:04x}"
+            self.mock.add_object(service_path, "org.bluez.GattService1", {"UUID": GLib.Variant("s", "180f")})
+            for characteristic in range(GATT_CHARACTERISTICS):
+                self.mock.add_object(f"{service_path}/char{characteristic:04x}", "org.bluez.GattCharacteristic1",
+                                     {"UUID": GLib.Variant("s", "2a19"), "Value": GLib.Variant("ay", b"\0" * 20)})
+
+        self.object_manager = ObjectManager(Gio.BusType.SYSTEM, "org.bluez",
+                                            ("org.bluez.Adapter1", "org.bluez.Device1"))
+        self.addCleanup(self.object_manager.destroy)
+
+    @staticmethod
+    def _iterate() -> None:
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration()
+
+    def test_scoped_objects(self):
+        self.assertEqual(set(self.object_manager.get_objects()), {ADAPTER, DEVICE})
+        self.assertEqual(self.object_manager.get_properties(DEVICE, "org.bluez.Device1")["Address"],
+                         "00:00:5E:00:53:10")
+        self.assertIsNone(self.object_manager.get_object(f"{DEVICE}/service0000"))
+
+    def test_against_gio_client(self):
+        start = time.perf_counter()
+        scoped = ObjectManager(Gio.BusType.SYSTEM, "org.bluez", ("org.bluez.Adapter1", "org.bluez.Device1"))
+        scoped_time = time.perf_counter() - start
+        self.addCleanup(scoped.destroy)
+
+        start = time.perf_counter()
+        client = Gio.DBusObjectManagerClient.new_sync(
+            _new_connection(Gio.BusType.SYSTEM), Gio.DBusObjectManagerClientFlags.DO_NOT_AUTO_START,
+            "org.bluez", "/", None, None, None)
+        client_time = time.perf_counter() - start
+
+        gatt_objects = GATT_SERVICES * (GATT_CHARACTERISTICS + 1)
+        self.assertEqual(len(scoped.get_objects()), 2)
+        self.assertEqual(len(client.get_objects()), 2 + gatt_objects,
+                         f"scoped: {scoped_time * 1000:.1f} ms, Gio client: {client_time * 1000:.1f} ms")
+
+    def test_objects_added_removed(self):
+        added, removed = Mock(), Mock()
+        self.object_manager.connect_signal("object-added", added)
+        self.object_manager.connect_signal("object-removed", removed)
+
+        path = "/org/bluez/hci0/dev_00_00_5E_00_53_11"
+        self.mock.add_object(path, "org.bluez.Device1", {"Address": GLib.Variant("s", "00:00:5E:00:53:11")})
+        self.mock.add_object(f"{path}/service0001", "org.bluez.GattService1", {})
+        self._iterate()
+        added.assert_called_once_with(self.object_manager, path,
+                                      {"org.bluez.Device1": {"Address": "00:00:5E:00:53:11"}})
+
+        self.mock.remove_object(f"{path}/service0001")
+        self.mock.remove_object(path)
+        self._iterate()
+        removed.assert_called_once()
+        self.assertEqual(removed.call_args[0][1], path)
+        self.assertNotIn(path, self.object_manager.get_objects())
+
+    def test_properties_changed(self):
+        changed = Mock()
+        self.object_manager.connect_signal("properties-changed", changed)
+
+        self.device.set_property("org.bluez.Device1", "Connected", GLib.Variant("b", True))
+        self._iterate()
+        self.assertTrue(self.object_manager.get_properties(DEVICE, "org.bluez.Device1")["Connected"])
+        changed.assert_called_once_with(self.object_manager, DEVICE, "org.bluez.Device1", {"Connected": True}, [])
+
+    def _load_async(self, before_ready=lambda object_manager: None):
+        object_manager = ObjectManager(Gio.BusType.SYSTEM, "org.bluez", ("org.bluez.Adapter1", "org.bluez.Device1"),
+                                       load=False)
+        self.addCleanup(object_manager.destroy)
+        added, ready = Mock(), Mock()
+        object_manager.connect_signal("object-added", added)
+
+        object_manager.load_async(ready, chunk_size=1)
+        self.assertEqual(object_manager.get_objects(), {})
+        self.assertFalse(object_manager.is_synced())
+        before_ready(object_manager)
+
+        context = GLib.MainContext.default()
+        timeout = time.monotonic() + 5
+        while not ready.called and time.monotonic() < timeout:
+            context.iteration(True)
+
+        ready.assert_called_once_with()
+        return object_manager, added
+
+    def test_load_async(self):
+        object_manager, added = self._load_async()
+        self.assertTrue(object_manager.is_synced())
+        self.assertEqual({call[0][1] for call in added.call_args_list}, {ADAPTER, DEVICE})
+
+    def test_signals_while_loading(self):
+        path = "/org/bluez/hci0/dev_00_00_5E_00_53_11"
+
+        def change(object_manager):
+            # Wait for the reply, the first chunk only holds the adapter
+            context = GLib.MainContext.default()
+            while not object_manager.get_objects():
+                context.iteration(True)
+            self.assertNotIn(DEVICE, object_manager.get_objects())
+
+            self.device.set_property("org.bluez.Device1", "Connected", GLib.Variant("b", True))
+            self.mock.add_object(path, "org.bluez.Device1", {"Address": GLib.Variant("s", "00:00:5E:00:53:11")})
+            self.mock.remove_object(ADAPTER)
+
+        object_manager, added = self._load_async(change)
+        self.assertTrue(object_manager.get_properties(DEVICE, "org.bluez.Device1")["Connected"])
+        self.assertEqual(set(object_manager.get_objects()), {DEVICE, path})
+        self.assertEqual(len(added.call_args_list), 3)
+
+    def test_name_vanished_while_loading(self):
+        def stop_bluez(_object_manager):
+            self.mock.__exit__(None, None, None)
+
+        object_manager, _added = self._load_async(stop_bluez)
+        self.assertFalse(object_manager.is_synced())
+        self.assertEqual(object_manager.get_objects(), {})
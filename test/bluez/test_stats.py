@@ -0,0 +1,64 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from gi.repository import GLib
+
+from blueman.bluez import stats
+
+
+class TestStats(TestCase):
+    def setUp(self) -> None:
+        stats.reset()
+        stats.enable()
+        self.addCleanup(stats.enable, False)
+        self.addCleanup(stats.reset)
+
+    @patch("blueman.bluez.stats.time.monotonic")
+    def test_calls(self, monotonic):
+        monotonic.return_value = 10.0
+        started = stats.start()
+        monotonic.return_value = 10.003
+        stats.record_call("org.bluez.Device1", "Connect", started)
+        monotonic.return_value = 13.0
+        stats.record_call("org.bluez.Device1", "Connect", started, blocking=True, error=True)
+
+        connect = stats.call_stats()["org.bluez.Device1.Connect"]
+        self.assertEqual(connect["count"], 2)
+        self.assertEqual(connect["blocking"], 1)
+        self.assertEqual(connect["errors"], 1)
+        self.assertAlmostEqual(connect["max-ms"], 3000)
+        self.assertAlmostEqual(connect["total-ms"], 3003)
+        # 3 ms goes into the <= 5 ms bucket, 3 s into <= 5000 ms
+        self.assertEqual(connect["histogram"][stats.BUCKETS.index(5)], 1)
+        self.assertEqual(connect["histogram"][stats.BUCKETS.index(5000)], 1)
+        self.assertEqual(sum(connect["histogram"]), 2)
+
+    def test_overflow_bucket(self):
+        with patch("blueman.bluez.stats.time.monotonic", return_value=100.0):
+            stats.record_call("org.bluez.Adapter1", "StartDiscovery", 0.0)
+        self.assertEqual(stats.call_stats()["org.bluez.Adapter1.StartDiscovery"]["histogram"][-1], 1)
+
+    def test_member_name(self):
+        self.assertEqual(stats.member_name("Connect", None), "Connect")
+        self.assertEqual(stats.member_name("org.freedesktop.DBus.Properties.Get",
+                                           GLib.Variant("(ss)", ("org.bluez.Device1", "Alias"))), "Get:Alias")
+        self.assertEqual(stats.member_name("org.freedesktop.DBus.Properties.GetAll",
+                                           GLib.Variant("(s)", ("org.bluez.Device1",))), "GetAll")
+
+    def test_signals(self):
+        stats.record_signal("org.bluez.Device1", "PropertiesChanged", ["RSSI", "Connected"])
+        stats.record_signal("org.bluez.Device1", "PropertiesChanged", ["RSSI"])
+
+        signals = stats.signal_stats()
+        self.assertEqual(signals["org.bluez.Device1.PropertiesChanged"]["count"], 2)
+        self.assertEqual(signals["org.bluez.Device1.PropertiesChanged:RSSI"]["count"], 2)
+        self.assertEqual(signals["org.bluez.Device1.PropertiesChanged:Connected"]["count"], 1)
+        self.assertGreater(signals["org.bluez.Device1.PropertiesChanged"]["rate"], 0)
+
+    def test_disabled(self):
+        stats.enable(False)
+        self.assertEqual(stats.start(), 0.0)
+        stats.record_call("org.bluez.Device1", "Connect", 0.0)
+        stats.record_signal("org.bluez.Device1", "PropertiesChanged")
+        self.assertEqual(stats.call_stats(), {})
+        self.assertEqual(stats.signal_stats(), {})
@@ -0,0 +1,35 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from blueman.gui.manager import LevelGlyphs
+
+
+@patch("blueman.gui.manager.LevelGlyphs.Gdk.cairo_surface_create_from_pixbuf", Mock(side_effect=lambda *_: object()))
+@patch("blueman.gui.manager.LevelGlyphs.GdkPixbuf.Pixbuf.new_from_file_at_scale")
+class TestLevelGlyphs(TestCase):
+    def setUp(self) -> None:
+        LevelGlyphs._surfaces.clear()
+
+    def test_bucket(self, _load):
+        self.assertEqual(LevelGlyphs.bucket(0), 10)
+        self.assertEqual(LevelGlyphs.bucket(44.9), 40)
+        self.assertEqual(LevelGlyphs.bucket(46), 50)
+        self.assertEqual(LevelGlyphs.bucket(100), 100)
+
+    def test_steady_state(self, load):
+        surface = LevelGlyphs.get_surface("rssi", 50, 1)
+        self.assertEqual(load.call_count, len(LevelGlyphs.LEVELS) * len(LevelGlyphs.BUCKETS))
+        load.reset_mock()
+
+        for level in LevelGlyphs.LEVELS:
+            for value in LevelGlyphs.BUCKETS:
+                LevelGlyphs.get_surface(level, value, 1)
+        self.assertIs(LevelGlyphs.get_surface("rssi", 50, 1), surface)
+        load.assert_not_called()
+
+    def test_scale(self, load):
+        LevelGlyphs.get_surface("battery", 100, 1)
+        load.reset_mock()
+        LevelGlyphs.get_surface("battery", 100, 2)
+        load.assert_any_call(LevelGlyphs.os.path.join(LevelGlyphs.PIXMAP_PATH, "blueman-battery-100.png"), 28, 96,
+                             True)
@@ -0,0 +1,77 @@
+from unittest import TestCase, skipIf
+from unittest.mock import patch, Mock, MagicMock
+
+import gi
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gdk
+
+from blueman.gui.DeviceList import DeviceList
+
+PATH = "/org/bluez/hci0/dev_00_00_5E_00_53_00"
+ADDRESS = "00:00:5E:00:53:00"
+
+
+def _device(object_path: str, address: str) -> Mock:
+    device = MagicMock(get_object_path=Mock(return_value=object_path))
+    device.__getitem__.side_effect = {"Address": address}.__getitem__
+    return device
+
+
+@skipIf(Gdk.Display.get_default() is None, "needs a display")
+@patch("blueman.gui.DeviceList.AnyAdapter", Mock())
+@patch("blueman.gui.DeviceList.AnyDevice", Mock())
+@patch("blueman.gui.DeviceList.Manager")
+class TestDeviceList(TestCase):
+    def _device_list(self, manager: Mock) -> DeviceList:
+        manager.return_value.get_adapters.return_value = []
+        device_list = DeviceList()
+        device_list.frame_updates = False
+        device_list.append(device=_device(PATH, ADDRESS), dbus_path=PATH)
+        return device_list
+
+    @patch("blueman.gui.DeviceList.GLib")
+    def test_coalesced(self, glib, manager):
+        device_list = self._device_list(manager)
+        row_update_event, property_changed = Mock(), Mock()
+        device_list.connect("device-property-changed", property_changed)
+
+        with patch.object(device_list, "row_update_event", row_update_event):
+            for rssi in range(-90, -40):
+                device_list._on_device_property_changed(device_list.any_device, "RSSI", rssi, PATH)
+                device_list._on_device_property_changed(device_list.any_device, "ManufacturerData", {76: [rssi]},
+                                                        PATH)
+            device_list._on_device_property_changed(device_list.any_device, "RSSI", -30, "/org/bluez/hci0/other")
+
+            glib.timeout_add.assert_called_once_with(DeviceList.update_interval, device_list._on_flush_timeout)
+            row_update_event.assert_not_called()
+
+            device_list._on_flush_timeout()
+
+        self.assertEqual([call[0][1:] for call in row_update_event.call_args_list],
+                         [("RSSI", -41), ("ManufacturerData", {76: [-41]})])
+        self.assertEqual(property_changed.call_count, 2)
+
+    @patch("blueman.gui.DeviceList.GLib")
+    def test_removed(self, _glib, manager):
+        device_list = self._device_list(manager)
+        with patch.object(device_list, "row_update_event") as row_update_event:
+            device_list._on_device_property_changed(device_list.any_device, "RSSI", -60, PATH)
+            device_list.clear()
+            device_list.flush_changes()
+        row_update_event.assert_not_called()
+
+    def test_find_device_by_address(self, manager):
+        device_list = self._device_list(manager)
+        other_path = "/org/bluez/hci0/dev_00_00_5E_00_53_01"
+        other = device_list.append(device=_device(other_path, "00:00:5E:00:53:01"), dbus_path=other_path)
+
+        self.assertTrue(device_list.compare(device_list.find_device_by_address(ADDRESS),
+                                            device_list.find_device_by_path(PATH)))
+        self.assertTrue(device_list.compare(device_list.find_device_by_address("00:00:5E:00:53:01"), other))
+
+        device_list.device_remove_event(PATH)
+        self.assertIsNone(device_list.find_device_by_address(ADDRESS))
+        self.assertIsNotNone(device_list.find_device_by_address("00:00:5E:00:53:01"))
+
+        device_list.clear()
+        self.assertIsNone(device_list.find_device_by_address("00:00:5E:00:53:01"))
@@ -0,0 +1,121 @@
+import time
+from unittest import TestCase, skipIf
+
+import gi
+gi.require_version("Gtk", "3.0")
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gtk, Gdk
+
+from blueman.gui.GenericList import GenericList
+
+DEVICES = 5000
+
+
+def _list() -> GenericList:
+    generic_list = GenericList([
+        {"id": "alias", "type": str, "renderer": Gtk.CellRendererText(), "render_attrs": {"text": 0}},
+        {"id": "address", "type": str},
+        {"id": "connected", "type": bool},
+        {"id": "timestamp", "type": float},
+    ])
+    generic_list.liststore.set_sort_column_id(0, Gtk.SortType.ASCENDING)
+    generic_list.filter.set_visible_func(lambda model, tree_iter, _data: not model[tree_iter][2], None)
+    return generic_list
+
+
+def _populate(generic_list: GenericList) -> None:
+    for i in range(DEVICES):
+        tree_iter = generic_list.append(alias=f"Device {(i * 7919) % DEVICES:04}",
+                                        address=f"00:00:5E:00:{i // 256:02X}:{i % 256:02X}")
+        generic_list.set(tree_iter, connected=i % 3 == 0, timestamp=float(i))
+
+
+@skipIf(Gdk.Display.get_default() is None, "needs a display")
+class TestGenericList(TestCase):
+    def test_batch(self):
+        generic_list = _list()
+        generic_list.append(alias="Selected", address="00:00:5E:00:53:00", connected=False)
+        generic_list.selection.select_path(Gtk.TreePath.new_first())
+
+        with generic_list.batch():
+            self.assertTrue(generic_list.is_batching())
+            self.assertIsNone(generic_list.get_model())
+            with generic_list.batch():
+                generic_list.append(alias="Added", address="00:00:5E:00:53:01", connected=False)
+            self.assertTrue(generic_list.is_batching())
+
+        self.assertFalse(generic_list.is_batching())
+        self.assertIs(generic_list.get_model(), generic_list.filter)
+        self.assertEqual(generic_list.liststore.get_sort_column_id(), (0, Gtk.SortType.ASCENDING))
+        self.assertEqual([row[0] for row in generic_list.liststore], ["Added", "Selected"])
+        self.assertEqual(generic_list.get(generic_list.selected(), "alias")["alias"], "Selected")
+
+    def test_benchmark(self):
+        window = Gtk.Window()
+        self.addCleanup(window.destroy)
+        single = _list()
+        window.add(single)
+        window.show_all()
+
+        start = time.perf_counter()
+        _populate(single)
+        single_time = time.perf_counter() - start
+        window.remove(single)
+
+        batched = _list()
+        window.add(batched)
+        window.show_all()
+
+        start = time.perf_counter()
+        with batched.batch():
+            _populate(batched)
+        batched_time = time.perf_counter() - start
+
+        self.assertEqual(len(batched.liststore), DEVICES)
+        self.assertEqual([row[0] for row in batched.filter][:2], ["Device 0002", "Device 0003"])
+        self.assertEqual([tuple(row) for row in batched.liststore], [tuple(row) for row in single.liststore])
+        # Timings depend on the machine, only a regression far beyond the noise fails
+        self.assertLess(batched_time, single_time * 2,
+                        f"{DEVICES} devices, one by one: {single_time * 1000:.0f} ms, "
+                        f"batched: {batched_time * 1000:.0f} ms")
+
+    def test_accessors(self):
+        generic_list = _list()
+        tree_iter = generic_list.append(alias="Headset", address="00:00:5E:00:53:00", connected=True)
+        self.assertEqual(generic_list.get_value(tree_iter, "alias"), "Headset")
+        self.assertEqual(generic_list.get_values(tree_iter, "connected", "alias"), (True, "Headset"))
+        self.assertEqual([values for _tree_iter, values in generic_list.iter_rows("address")],
+                         [("00:00:5E:00:53:00",)])
+
+    def test_accessor_benchmark(self):
+        rows = 10000
+        generic_list = _list()
+        with generic_list.batch():
+            for i in range(rows):
+                generic_list.append(alias=f"Device {i:05}", address=f"00:00:5E:00:{i // 256:02X}:{i % 256:02X}",
+                                    connected=i % 2 == 0, timestamp=float(i))
+        tree_iters = [tree_iter for tree_iter, _values in generic_list.iter_rows()]
+
+        def per_row(f):
+            start = time.perf_counter()
+            for tree_iter in tree_iters:
+                f(tree_iter)
+            return (time.perf_counter() - start) / rows * 1e6
+
+        get_time = per_row(lambda tree_iter: generic_list.get(tree_iter, "alias", "address", "connected"))
+        get_values_time = per_row(lambda tree_iter: generic_list.get_values(tree_iter, "alias", "address",
+                                                                            "connected"))
+        start = time.perf_counter()
+        self.assertEqual(sum(1 for _row in generic_list.iter_rows("alias", "address", "connected")), rows)
+        iter_rows_time = (time.perf_counter() - start) / rows * 1e6
+
+        row = generic_list.get(tree_iters[1], "alias", "address", "connected")
+        self.assertEqual(generic_list.get_values(tree_iters[1], "alias", "address", "connected"),
+                         (row["alias"], row["address"], row["connected"]))
+        self.assertEqual(row["alias"], "Device 00001")
+
+        # Timings depend on the machine, only a regression far beyond the noise fails
+        timings = (f"per row for {rows} rows, get: {get_time:.2f} µs, get_values: {get_values_time:.2f} µs, "
+                   f"iter_rows: {iter_rows_time:.2f} µs")
+        self.assertLess(get_values_time, get_time * 2, timings)
+        self.assertLess(iter_rows_time, get_time * 2, timings)
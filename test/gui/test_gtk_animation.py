@@ -0,0 +1,63 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from blueman.gui.GtkAnimation import AnimBase, _TimeoutScheduler
+
+
+class TestAnimBase(TestCase):
+    def setUp(self) -> None:
+        patcher = patch("blueman.gui.GtkAnimation.GLib.timeout_add", return_value=1)
+        self.timeout_add = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.scheduler = _TimeoutScheduler()
+        patcher = patch("blueman.gui.GtkAnimation._timeout_scheduler", self.scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_time_based(self):
+        anim = AnimBase(0.0)
+        finished = Mock()
+        anim.connect("animation-finished", finished)
+
+        anim.animate(start=0.0, end=1.0, duration=100)
+        self.assertTrue(anim.is_animating())
+        # The first tick marks the start, later ones follow the clock no matter how many frames were skipped
+        self.assertTrue(anim._advance(1000.0))
+        self.assertEqual(anim.get_state(), 0.0)
+        self.assertTrue(anim._advance(1075.0))
+        self.assertAlmostEqual(anim.get_state(), 0.75)
+        finished.assert_not_called()
+
+        self.assertFalse(anim._advance(1200.0))
+        self.assertEqual(anim.get_state(), 1.0)
+        self.assertFalse(anim.is_animating())
+        finished.assert_called_once_with(anim)
+
+    def test_shared_timeout(self):
+        animations = [AnimBase(1.0) for _ in range(50)]
+        for anim in animations:
+            anim.animate(start=1.0, end=0.0, duration=400)
+        self.timeout_add.assert_called_once()
+
+        with patch("blueman.gui.GtkAnimation.GLib.get_monotonic_time", return_value=1000000):
+            self.assertTrue(self.scheduler._on_timeout())
+        with patch("blueman.gui.GtkAnimation.GLib.get_monotonic_time", return_value=1500000):
+            # All finished, the timeout goes away
+            self.assertFalse(self.scheduler._on_timeout())
+        self.assertTrue(all(anim.get_state() == 0.0 and not anim.is_animating() for anim in animations))
+
+    def test_restart(self):
+        anim = AnimBase(1.0)
+        anim.animate(start=1.0, end=0.0, duration=400)
+        anim.animate(start=anim.get_state(), end=1.0, duration=400)
+        self.assertEqual(len(self.scheduler._animations), 1)
+
+    def test_frozen(self):
+        anim = AnimBase(1.0)
+        finished = Mock()
+        anim.connect("animation-finished", finished)
+        anim.freeze()
+        anim.animate(start=1.0, end=0.0, duration=400)
+        finished.assert_called_once_with(anim)
+        self.assertFalse(anim.is_animating())
@@ -0,0 +1,24 @@
+from unittest import TestCase
+
+from blueman.gui.gui_config import is_allowed_device
+
+
+class TestAllowedDevice(TestCase):
+    def test_class(self):
+        # Major class audio/video, minor class headphones, with service class bits
+        self.assertTrue(is_allowed_device({"Class": 0x240418}))
+        self.assertTrue(is_allowed_device({"Class": 0x002580, "Appearance": 0}))
+
+    def test_appearance(self):
+        self.assertTrue(is_allowed_device({"Appearance": 0x0941}))
+        self.assertTrue(is_allowed_device({"Class": 0x5a020c, "Appearance": 0x03c2}))
+
+    def test_denied(self):
+        # Smartphone
+        self.assertFalse(is_allowed_device({"Class": 0x5a020c}))
+        # Generic watch
+        self.assertFalse(is_allowed_device({"Appearance": 0x00c0}))
+
+    def test_missing_properties(self):
+        self.assertFalse(is_allowed_device({}))
+        self.assertFalse(is_allowed_device({"Address": "00:00:5E:00:53:10", "Alias": "Headset"}))
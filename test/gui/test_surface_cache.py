@@ -0,0 +1,36 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from blueman.gui.SurfaceCache import SurfaceCache
+
+
+class TestSurfaceCache(TestCase):
+    def test_warm(self):
+        cache: SurfaceCache[object] = SurfaceCache(8)
+        create = Mock(side_effect=lambda: object())
+        keys = [("blueman-headset", 1, emblem) for emblem in ("connected", "disconnected", None)]
+
+        first = [cache.get(key, create) for key in keys]
+        # Drawing the same rows again creates nothing
+        for _ in range(500):
+            self.assertEqual([cache.get(key, create) for key in keys], first)
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 1500)
+
+    def test_bounded(self):
+        cache: SurfaceCache[int] = SurfaceCache(2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        # Touch a so b is the least recently used
+        cache.get("a", lambda: 0)
+        cache.get("c", lambda: 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a", lambda: 0), 1)
+        self.assertEqual(cache.get("b", lambda: 0), 0)
+
+    def test_clear(self):
+        cache: SurfaceCache[int] = SurfaceCache(2)
+        cache.get("a", lambda: 1)
+        cache.clear()
+        self.assertEqual(cache.get("a", lambda: 2), 2)
@@ -0,0 +1,104 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from blueman.main.ConnectionQualityPoller import ConnectionQualityPoller, Sample
+from blueman.main.SignalHistory import SignalHistory
+from _blueman import ConnInfoReadError, ACL_LINK, LE_LINK
+
+
+def _connections(addresses):
+    # The tpl can not be read, the LE links have no link quality
+    return [(address, LE_LINK if i % 2 else ACL_LINK, int(address[-2:]), None, None if i % 2 else 255)
+            for i, address in enumerate(addresses)]
+
+
+@patch("blueman.main.ConnectionQualityPoller.conn_quality")
+@patch("blueman.main.ConnectionQualityPoller.GLib")
+class TestConnectionQualityPoller(TestCase):
+    addresses = [f"00:00:5E:00:53:{i:02}" for i in range(20)]
+
+    def test_one_read(self, glib, conn_quality):
+        conn_quality.return_value.read.return_value = _connections(self.addresses)
+        poller = ConnectionQualityPoller("hci0")
+        callback = Mock(return_value=True)
+        for address in self.addresses:
+            poller.subscribe(address, callback)
+
+        glib.timeout_add.assert_called_once_with(ConnectionQualityPoller.VISIBLE_INTERVAL, poller._poll)
+        # Subscribing does not read
+        conn_quality.assert_not_called()
+
+        self.assertTrue(poller._poll())
+        self.assertEqual(callback.call_count, 20)
+        callback.assert_any_call(self.addresses[2], Sample(2, None, link_quality=255))
+        callback.assert_any_call(self.addresses[3], Sample(3, None))
+        # All devices from one read through one socket
+        conn_quality.return_value.read.assert_called_once_with()
+        conn_quality.assert_called_once_with("hci0")
+
+    def test_shared_device(self, _glib, conn_quality):
+        conn_quality.return_value.read.return_value = _connections(self.addresses[:1])
+        poller = ConnectionQualityPoller("hci0")
+        first, second = Mock(return_value=True), Mock(return_value=False)
+        poller.subscribe(self.addresses[0], first)
+        poller.subscribe(self.addresses[0], second)
+
+        self.assertTrue(poller._poll())
+        self.assertTrue(poller.is_subscribed(self.addresses[0]))
+        conn_quality.return_value.close.assert_not_called()
+
+        poller.unsubscribe(self.addresses[0], first)
+        self.assertFalse(poller.is_subscribed(self.addresses[0]))
+        conn_quality.return_value.close.assert_called_once_with()
+        self.assertFalse(poller._poll())
+
+    def test_unsubscribe(self, _glib, conn_quality):
+        poller = ConnectionQualityPoller("hci0")
+        callback = Mock(return_value=False)
+        poller.subscribe(self.addresses[0], callback)
+
+        self.assertFalse(poller._poll())
+        conn_quality.return_value.close.assert_called_once_with()
+        self.assertFalse(poller.is_subscribed(self.addresses[0]))
+
+    def test_last_sample(self, _glib, conn_quality):
+        conn_quality.return_value.read.return_value = _connections(self.addresses[1:3])
+        poller = ConnectionQualityPoller("hci0")
+        # Not polled yet
+        self.assertIsNone(poller.subscribe(self.addresses[1], Mock(return_value=True)))
+        poller.subscribe(self.addresses[0], Mock(return_value=True))
+        poller._poll()
+
+        conn_quality.return_value.read.reset_mock()
+        self.assertEqual(poller.subscribe(self.addresses[1], Mock()), Sample(1, None, link_quality=255))
+        # Not connected
+        self.assertEqual(poller.subscribe(self.addresses[0], Mock()), Sample(None, None, failed=True))
+        conn_quality.return_value.read.assert_not_called()
+
+    def test_read_failed(self, _glib, conn_quality):
+        conn_quality.return_value.read.side_effect = ConnInfoReadError("HCI device open failed")
+        poller = ConnectionQualityPoller("hci0")
+        callback = Mock(return_value=True)
+        self.assertIsNone(poller.subscribe(self.addresses[0], callback))
+        self.assertTrue(poller._poll())
+        callback.assert_called_once_with(self.addresses[0], Sample(None, None, failed=True))
+        self.assertEqual(poller.subscribe(self.addresses[0], Mock()), Sample(None, None, failed=True))
+
+    def test_visibility(self, glib, _conn_quality):
+        poller = ConnectionQualityPoller("hci0")
+        poller.subscribe(self.addresses[0], Mock(return_value=True))
+        poller.set_visible(False)
+        glib.source_remove.assert_called_once_with(glib.timeout_add.return_value)
+        glib.timeout_add.assert_called_with(ConnectionQualityPoller.HIDDEN_INTERVAL, poller._poll)
+
+    def test_history(self, _glib, conn_quality):
+        address = "00:00:5E:00:53:42"
+        conn_quality.return_value.read.return_value = _connections([address])
+        poller = ConnectionQualityPoller("hci0")
+        poller.subscribe(address, Mock(return_value=True))
+        poller._poll()
+
+        history = SignalHistory.for_device(address)
+        self.assertEqual(history.rssi.values(), [42])
+        self.assertEqual(history.link_quality.values(), [255])
+        self.assertEqual(len(history.tpl), 0)
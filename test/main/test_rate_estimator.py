@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from blueman.main.RateEstimator import RateEstimator
+
+
+class TestRateEstimator(TestCase):
+    def test_steady(self):
+        estimator = RateEstimator()
+        for second in range(10):
+            rate = estimator.update(second * 1000, now=second)
+        self.assertAlmostEqual(rate, 1000)
+        self.assertAlmostEqual(estimator.eta(5000), 5)
+
+    def test_bursty(self):
+        estimator = RateEstimator(window=3, smoothing=0.5)
+        total = 0
+        rates = []
+        # 4000 units every other second, 2000 per second on average
+        for second in range(1, 21):
+            if second % 2 == 0:
+                total += 4000
+            rates.append(estimator.update(total, now=second))
+
+        for rate in rates[5:]:
+            self.assertGreater(rate, 1000)
+            self.assertLess(rate, 3000)
+
+    def test_stalled(self):
+        estimator = RateEstimator(window=3)
+        for second in range(5):
+            estimator.update(second * 1000, now=second)
+        self.assertGreater(estimator.rate, 0)
+
+        for second in range(5, 10):
+            rate = estimator.update(4000, now=second)
+        self.assertEqual(rate, 0)
+        self.assertIsNone(estimator.eta(1000))
+
+    def test_window(self):
+        estimator = RateEstimator(window=2, smoothing=0)
+        for second in range(5):
+            estimator.update(0, now=second)
+        # Only the last two seconds count
+        self.assertEqual(estimator.update(6000, now=5), 3000)
+        self.assertLessEqual(len(estimator._samples), 4)
+
+    def test_bounded(self):
+        estimator = RateEstimator(window=1000, max_samples=8)
+        for i in range(100):
+            estimator.update(i, now=i)
+        self.assertEqual(len(estimator._samples), 8)
+        self.assertAlmostEqual(estimator.rate, 1)
+
+    def test_counter_reset(self):
+        estimator = RateEstimator()
+        for second in range(5):
+            estimator.update(second * 1000, now=second)
+
+        self.assertEqual(estimator.update(0, now=5), 0)
+        self.assertAlmostEqual(estimator.update(500, now=6), 500)
+
+    def test_reset(self):
+        estimator = RateEstimator()
+        estimator.update(0, now=0)
+        estimator.update(1000, now=1)
+        estimator.reset()
+        self.assertEqual(estimator.rate, 0)
+        self.assertIsNone(estimator.eta(1000))
+
+    def test_clock(self):
+        now = [0.0]
+        estimator = RateEstimator(clock=lambda: now[0])
+        estimator.update(0)
+        now[0] = 2
+        self.assertEqual(estimator.update(100), 50)
+
+    def test_invalid_smoothing(self):
+        self.assertRaises(ValueError, RateEstimator, smoothing=1)
+        self.assertRaises(ValueError, RateEstimator, smoothing=-0.1)
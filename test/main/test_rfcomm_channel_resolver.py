@@ -0,0 +1,101 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock, MagicMock
+
+from blueman.main.RFCOMMChannelResolver import RFCOMMChannelResolver
+
+
+def _device(address="00:00:5E:00:53:00"):
+    device = MagicMock()
+    device.__getitem__.side_effect = {"Address": address}.__getitem__
+    device.connect_signal.return_value = 42
+    return device
+
+
+class _Thread:
+    started = []
+
+    def __init__(self, target, **_kwargs):
+        self.target = target
+
+    def start(self):
+        self.started.append(self.target)
+
+
+@patch.dict(RFCOMMChannelResolver._pending)
+@patch.dict(RFCOMMChannelResolver._cache)
+@patch("blueman.main.RFCOMMChannelResolver.threading.Thread", _Thread)
+@patch("blueman.main.RFCOMMChannelResolver.GLib.idle_add", lambda func, *args: func(*args))
+@patch("blueman.main.RFCOMMChannelResolver.get_rfcomm_channel", return_value=3)
+class TestRFCOMMChannelResolver(TestCase):
+    def setUp(self):
+        _Thread.started = []
+
+    def _run_queries(self):
+        while _Thread.started:
+            _Thread.started.pop(0)()
+
+    def test_cached(self, get_rfcomm_channel):
+        device = _device()
+        callback = Mock()
+        RFCOMMChannelResolver.resolve(device, 0x1101, callback)
+        callback.assert_not_called()
+        self._run_queries()
+        callback.assert_called_once_with(3)
+
+        RFCOMMChannelResolver.resolve(device, 0x1101, callback)
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(_Thread.started, [])
+        get_rfcomm_channel.assert_called_once_with(0x1101, "00:00:5E:00:53:00")
+
+    def test_coalesced(self, get_rfcomm_channel):
+        device = _device()
+        first, second = Mock(), Mock()
+        RFCOMMChannelResolver.resolve(device, 0x1101, first)
+        RFCOMMChannelResolver.resolve(device, 0x1101, second)
+        self._run_queries()
+        first.assert_called_once_with(3)
+        second.assert_called_once_with(3)
+        get_rfcomm_channel.assert_called_once()
+
+    def test_no_channel(self, get_rfcomm_channel):
+        get_rfcomm_channel.return_value = 0
+        device = _device()
+        callback = Mock()
+        RFCOMMChannelResolver.resolve(device, 0x1103, callback)
+        self._run_queries()
+        callback.assert_called_once_with(None)
+
+        RFCOMMChannelResolver.resolve(device, 0x1103, callback)
+        self.assertEqual(len(_Thread.started), 1)
+
+    def test_query_failed(self, get_rfcomm_channel):
+        get_rfcomm_channel.side_effect = OSError("Host is down")
+        device = _device()
+        callback = Mock()
+        RFCOMMChannelResolver.resolve(device, 0x1101, callback)
+        with self.assertRaises(OSError):
+            self._run_queries()
+        callback.assert_called_once_with(None)
+        self.assertEqual(RFCOMMChannelResolver._pending, {})
+
+    def test_invalidated(self, get_rfcomm_channel):
+        device = _device()
+        RFCOMMChannelResolver.resolve(device, 0x1101, Mock())
+        self._run_queries()
+        handler = device.connect_signal.call_args[0][1]
+
+        handler(device, "RSSI", -40, "/org/bluez/hci0/dev_00_00_5E_00_53_00")
+        RFCOMMChannelResolver.resolve(device, 0x1101, Mock())
+        self.assertEqual(_Thread.started, [])
+
+        handler(device, "Connected", False, "/org/bluez/hci0/dev_00_00_5E_00_53_00")
+        device.disconnect_signal.assert_called_once_with(42)
+        RFCOMMChannelResolver.resolve(device, 0x1101, Mock())
+        self.assertEqual(len(_Thread.started), 1)
+
+    def test_new_proxy(self, _get_rfcomm_channel):
+        RFCOMMChannelResolver.resolve(_device(), 0x1101, Mock())
+        self._run_queries()
+
+        RFCOMMChannelResolver.resolve(_device(), 0x1101, Mock())
+        self.assertEqual(len(_Thread.started), 1)
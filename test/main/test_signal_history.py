@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from blueman.main.SignalHistory import SampleBuffer, SignalHistory, Summary
+
+
+class TestSampleBuffer(TestCase):
+    def test_empty(self):
+        samples = SampleBuffer()
+        self.assertIsNone(samples.summary())
+        self.assertIsNone(samples.percentile(50))
+
+    def test_summary(self):
+        samples = SampleBuffer()
+        for value in (-60, -50, -70, -40, -80):
+            samples.append(value)
+
+        self.assertEqual(samples.summary(), Summary(5, -80, -40, -60, -76, -60, -44))
+        self.assertEqual(samples.percentile(0), -80)
+        self.assertEqual(samples.percentile(100), -40)
+        self.assertEqual(samples.percentile(25), -70)
+
+    def test_ring(self):
+        samples = SampleBuffer(capacity=3)
+        for value in range(10):
+            samples.append(value)
+
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(samples.values(), [7, 8, 9])
+        summary = samples.summary()
+        assert summary is not None
+        self.assertEqual((summary.minimum, summary.maximum, summary.mean), (7, 9, 8))
+
+    def test_clear(self):
+        samples = SampleBuffer(capacity=2)
+        for value in range(3):
+            samples.append(value)
+        samples.clear()
+        samples.append(5)
+        self.assertEqual(samples.values(), [5])
+        self.assertEqual(samples.summary(), Summary(1, 5, 5, 5, 5, 5, 5))
+
+    def test_describe(self):
+        self.assertEqual(Summary(2, -2, 2, 0, -1.6, 0, 1.6).describe("dB"),
+                         "-2 to 2 dB, mean 0.0, median 0.0, 80% between -1.6 and 1.6 (2 samples)")
+
+
+class TestSignalHistory(TestCase):
+    def test_for_device(self):
+        history = SignalHistory.for_device("00:00:5E:00:53:FF")
+        self.assertIs(SignalHistory.for_device("00:00:5E:00:53:FF"), history)
+        self.assertIs(SignalHistory.get("00:00:5E:00:53:FF"), history)
+        self.assertIsNone(SignalHistory.get("00:00:5E:00:53:FE"))
+
+    def test_forget(self):
+        history = SignalHistory.for_device("00:00:5E:00:53:FD")
+        SignalHistory.forget("00:00:5E:00:53:FD")
+        self.assertIsNone(SignalHistory.get("00:00:5E:00:53:FD"))
+        self.assertIsNot(SignalHistory.for_device("00:00:5E:00:53:FD"), history)
+        # Unknown addresses are ignored
+        SignalHistory.forget("00:00:5E:00:53:FC")
@@ -0,0 +1,59 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from blueman.main.TrafficHistory import TrafficHistory
+
+
+class TestTrafficHistory(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "blueman", "traffic")
+
+    def _open(self, capacity=4):
+        history = TrafficHistory(self.path, capacity)
+        self.addCleanup(history.close)
+        return history
+
+    def test_empty(self):
+        history = self._open()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.query(), [])
+
+    def test_query(self):
+        history = self._open()
+        for i in range(3):
+            history.append(i, i * 10, i * 20)
+
+        self.assertEqual(history.query(), [(0, 0, 0), (1, 10, 20), (2, 20, 40)])
+        self.assertEqual(history.query(1, 1), [(1, 10, 20)])
+        self.assertEqual(history.query(start=1.5), [(2, 20, 40)])
+
+    def test_wrap(self):
+        history = self._open()
+        for i in range(10):
+            history.append(i, i, i)
+
+        self.assertEqual(len(history), 4)
+        self.assertEqual([record[0] for record in history.query()], [6, 7, 8, 9])
+        self.assertEqual(os.path.getsize(self.path), 16 + 4 * 24)
+
+    def test_persistent(self):
+        history = self._open()
+        for i in range(6):
+            history.append(i, i, i)
+        history.close()
+
+        history = self._open()
+        self.assertEqual([record[0] for record in history.query()], [2, 3, 4, 5])
+        history.append(6, 6, 6)
+        self.assertEqual([record[0] for record in history.query()], [3, 4, 5, 6])
+
+    def test_capacity_changed(self):
+        history = self._open()
+        history.append(0, 0, 0)
+        history.close()
+
+        history = self._open(capacity=8)
+        self.assertEqual(history.query(), [])
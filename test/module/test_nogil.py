@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from unittest import TestCase, skipUnless
+
+from gi.repository import GLib
+
+from _blueman import ConnInfoReadError, conn_info, get_rfcomm_channel
+
+# Both tests need a Bluetooth adapter, hci0, and have to be asked for explicitly
+HARDWARE = os.environ.get("BLUEMAN_TEST_HARDWARE") == "1"
+# Address of a device that is connected to hci0
+CONNECTED_DEVICE = os.environ.get("BLUEMAN_TEST_CONNECTED_DEVICE")
+
+
+class TestNoGil(TestCase):
+    # Paging an address nobody uses stalls the SDP connect until the page timeout
+    address = "00:00:5E:00:53:00"
+
+    @skipUnless(HARDWARE, "set BLUEMAN_TEST_HARDWARE=1 to page a device with hci0")
+    def test_main_loop_runs_during_sdp_query(self):
+        workers = [threading.Thread(target=get_rfcomm_channel, args=(0x1101, self.address)) for _ in range(4)]
+        ticks = 0
+        loop = GLib.MainLoop()
+
+        def tick() -> bool:
+            nonlocal ticks
+            ticks += 1
+            if any(worker.is_alive() for worker in workers):
+                return True
+            loop.quit()
+            return False
+
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        GLib.timeout_add(10, tick)
+        GLib.timeout_add_seconds(30, loop.quit)
+        loop.run()
+        elapsed = time.monotonic() - started
+
+        for worker in workers:
+            worker.join()
+
+        self.assertGreater(elapsed, 0.2, "the SDP query did not stall, is hci0 up?")
+        # A tick every 10ms, leave plenty of room for a busy machine
+        self.assertGreater(ticks, elapsed / 0.01 / 4)
+
+    @skipUnless(CONNECTED_DEVICE, "set BLUEMAN_TEST_CONNECTED_DEVICE to the address of a device connected to hci0")
+    def test_concurrent_use(self):
+        cinfo = conn_info(CONNECTED_DEVICE, "hci0")
+        cinfo.init()
+        self.addCleanup(cinfo.deinit)
+        reads = 0
+        errors = []
+
+        def use(reopen: bool) -> None:
+            nonlocal reads
+            for i in range(200):
+                try:
+                    cinfo.get_rssi()
+                    cinfo.get_tpl()
+                    reads += 1
+                except ConnInfoReadError:
+                    # Another worker closed the handle in between
+                    pass
+                except Exception as e:
+                    errors.append(e)
+
+                if reopen and i % 10 == 0:
+                    cinfo.deinit()
+                    cinfo.init()
+
+        workers = [threading.Thread(target=use, args=(i == 0,)) for i in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertGreater(reads, 0)
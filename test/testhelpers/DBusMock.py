@@ -1,3 +1,7 @@
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
 from dbusmock import DBusTestCase
 from gi.repository import Gio, GLib
 
@@ -26,9 +30,19 @@ class DBusMockObject:
 
 
 class DBusMock(DBusMockObject):
-    def __init__(self, name: str, path: str, system_bus: bool) -> None:
+    def __init__(self, name: str, path: str, system_bus: bool, interface: str = "org.freedesktop.DBus.Mock",
+                 object_manager: bool = False) -> None:
         self._system_bus = system_bus
-        self._process = DBusTestCase.spawn_server(name, path, "org.freedesktop.DBus.Mock", system_bus=system_bus)
+        self._object_manager = object_manager
+        self._interfaces: Dict[str, str] = {}
+        if object_manager:
+            # spawn_server has no way to pass --is-object-manager
+            self._process = subprocess.Popen([sys.executable, "-m", "dbusmock",
+                                              "--system" if system_bus else "--session", "--is-object-manager",
+                                              name, path, interface])
+            DBusTestCase.wait_for_bus_object(name, path, system_bus=bool(system_bus))
+        else:
+            self._process = DBusTestCase.spawn_server(name, path, interface, system_bus=system_bus)
         super().__init__(name, path, system_bus)
 
     def __enter__(self):
@@ -38,8 +52,29 @@ class DBusMock(DBusMockObject):
         self._process.terminate()
         self._process.wait()
 
-    def add_object(self, path: str) -> DBusMockObject:
+    def add_object(self, path: str, interface: str = "org.freedesktop.DBus.Mock",
+                   properties: Optional[Dict[str, GLib.Variant]] = None) -> DBusMockObject:
         self._proxy.call_sync(
-            "AddObject", GLib.Variant("(ssa{sv}a(ssss))", (path, "org.freedesktop.DBus.Mock", {}, [])),
+            "AddObject", GLib.Variant("(ssa{sv}a(ssss))", (path, interface, properties or {}, [])),
             Gio.DBusCallFlags.NONE, GLib.MAXINT)
+        self._interfaces[path] = interface
+        # dbusmock leaves emitting InterfacesAdded and InterfacesRemoved to its user
+        self._emit_object_manager_signal("InterfacesAdded", "oa{sa{sv}}", [
+            GLib.Variant("o", path),
+            GLib.Variant("a{sa{sv}}", {interface: properties or {}}),
+        ])
         return DBusMockObject(self._proxy.props.g_name, path, self._system_bus)
+
+    def remove_object(self, path: str) -> None:
+        self._proxy.call_sync("RemoveObject", GLib.Variant("(o)", (path,)), Gio.DBusCallFlags.NONE, GLib.MAXINT)
+        self._emit_object_manager_signal("InterfacesRemoved", "oas", [
+            GLib.Variant("o", path),
+            GLib.Variant("as", [self._interfaces.pop(path)]),
+        ])
+
+    def _emit_object_manager_signal(self, name: str, signature: str, args: List[GLib.Variant]) -> None:
+        if not self._object_manager:
+            return
+        self._proxy.call_sync(
+            "EmitSignal", GLib.Variant("(sssav)", ("org.freedesktop.DBus.ObjectManager", name, signature, args)),
+            Gio.DBusCallFlags.NONE, GLib.MAXINT)